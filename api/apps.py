@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):  # Noqa D101
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
@@ -0,0 +1,202 @@
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from api.views import SyncApiView, TaskListApiView
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from labels.models import Label
+from pagination import FORWARD, decode_cursor, encode_cursor
+from statuses.models import Status
+from tasks.models import Task
+from users.models import User
+
+
+def task_queries(queries):
+    """Return queries which read tasks or their labels.
+
+    Args:
+        queries: Captured queries.
+
+    Returns:
+        List of SQL.
+    """
+    return [query['sql'] for query in queries if '"tasks_task' in query['sql']]
+
+
+class ApiTests(TestCase):
+    """Test read-only JSON API."""
+
+    fixtures = ['tasks.json', 'statuses.json', 'labels.json', 'users.json']
+
+    def setUp(self):
+        """Prepare data for tests."""
+        self.user = User.objects.get(pk=1)
+        self.client.force_login(self.user)
+        self.task = Task.objects.get(pk=2)
+        self.task.labels.add(Label.objects.get(pk=1))
+
+    def test_tasks(self):
+        """Checking of the list of tasks."""
+        response = self.client.get(reverse('api:tasks'), {'status': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                'results': [{
+                    'id': 2,
+                    'name': 'Имя2',
+                    'description': 'Описание2',
+                    'status': 2,
+                    'author': 2,
+                    'executor': 1,
+                    'created_at': '2021-12-29T20:50:24.350Z',
+                    'label_ids': [1],
+                }],
+                'next': None,
+                'previous': None,
+            },
+        )
+        self.assertEqual(self.client.get(reverse('api:tasks'), {'status': 100}).status_code, 400)
+        tampered = encode_cursor(['2021-12-29T20:50:24.350Z', 'abc'], FORWARD)
+        response = self.client.get(reverse('api:tasks'), {'cursor': tampered})
+        self.assertEqual(response.status_code, 400)
+
+    def test_task(self):
+        """Checking of one task."""
+        response = self.client.get(reverse('api:task', args=(2,)))
+        self.assertEqual(response.json()['label_ids'], [1])
+        self.assertEqual(self.client.get(reverse('api:task', args=(100,))).status_code, 404)
+
+    def test_reference_lists(self):
+        """Checking of lists of statuses, labels and users."""
+        statuses = self.client.get(reverse('api:statuses')).json()['results']
+        self.assertEqual(
+            [status['name'] for status in statuses], ['завершён', 'в работе'],
+        )
+        labels = self.client.get(reverse('api:labels')).json()['results']
+        self.assertEqual([label['name'] for label in labels], ['Баг'])
+        users = self.client.get(reverse('api:users')).json()['results']
+        self.assertEqual(set(users[0]), {'id', 'username', 'first_name', 'last_name'})
+
+    def test_authentication_is_required(self):
+        """Checking that anonymous requests are rejected."""
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('api:tasks')).status_code, 401)
+
+    def test_pages_load_labels_by_the_same_query(self):
+        """Checking keyset pages, their rows and the number of queries per page."""
+        status = Status.objects.get(pk=1)
+        Task.objects.bulk_create([
+            Task(name='Task {0}'.format(number), author=self.user, status=status)
+            for number in range(150)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            first_page = self.client.get(reverse('api:tasks')).json()
+        self.assertEqual(len(first_page['results']), 100)
+        self.assertEqual(len(task_queries(queries)), 1)
+        last_row = first_page['results'][-1]
+        self.assertEqual(list(last_row), [*TaskListApiView.fields, 'label_ids'])
+        self.assertEqual(last_row['label_ids'], [])
+        next_cursor = parse_qs(urlsplit(first_page['next']).query)['cursor'][0]
+        _, cursor_values = decode_cursor(next_cursor)
+        self.assertEqual(cursor_values[1], last_row['id'])
+        self.assertTrue(cursor_values[0].startswith(last_row['created_at'].rstrip('Z')))
+        second_page = self.client.get(first_page['next']).json()
+        self.assertEqual(len(second_page['results']), 52)
+        self.assertIsNone(second_page['next'])
+        self.assertEqual(self.client.get(second_page['previous']).json(), first_page)
+
+    def test_conditional_get(self):
+        """Checking that an unchanged list is answered by 304 without reading tasks."""
+        response = self.client.get(reverse('api:tasks'))
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api:tasks'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(task_queries(queries), [])
+        other_filter = self.client.get(reverse('api:tasks'), {'status': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_filter.status_code, 200)
+
+        self.task.labels.clear()
+        response = self.client.get(reverse('api:tasks'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.client.post(
+            reverse('tasks:bulk'), {'action': 'status', 'task_ids': [1, 2], 'status': 2},
+        )
+        response = self.client.get(reverse('api:tasks'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_sync(self):
+        """Checking the snapshot and changes since its token."""
+        snapshot = self.client.get(reverse('api:sync')).json()
+        self.assertEqual([task['id'] for task in snapshot['tasks']['changed']], [1, 2])
+        self.assertEqual(snapshot['tasks']['changed'][1]['label_ids'], [1])
+        self.assertEqual(len(snapshot['statuses']['changed']), 2)
+        self.assertFalse(snapshot['more'])
+
+        label = Label.objects.create(name='Срочно')
+        status = Status.objects.get(pk=1)
+        status.name = 'готово'
+        status.save()
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'add_label', 'task_ids': [1], 'label': label.pk,
+        })
+        Task.objects.get(pk=2).delete()
+        with CaptureQueriesContext(connection) as queries:
+            changes = self.client.get(reverse('api:sync'), {'token': snapshot['token']}).json()
+        self.assertEqual(len(task_queries(queries)), 1)
+        self.assertEqual(changes['tasks']['changed'][0]['id'], 1)
+        self.assertEqual(changes['tasks']['changed'][0]['label_ids'], [label.pk])
+        self.assertEqual(changes['tasks']['deleted'], [2])
+        changed_statuses = changes['statuses']['changed']
+        self.assertEqual(changed_statuses, [
+            {'id': 1, 'name': 'готово', 'created_at': changed_statuses[0]['created_at']},
+        ])
+        self.assertEqual([row['id'] for row in changes['labels']['changed']], [label.pk])
+
+        unchanged = self.client.get(reverse('api:sync'), {'token': changes['token']}).json()
+        self.assertEqual(unchanged['token'], changes['token'])
+        self.assertEqual(unchanged['tasks'], {'changed': [], 'deleted': []})
+        self.assertEqual(self.client.get(reverse('api:sync'), {'token': 'x'}).status_code, 400)
+
+    def test_sync_is_split_by_limit(self):
+        """Checking that long lists of changes are sent in parts."""
+        snapshot = self.client.get(reverse('api:sync')).json()
+        for number in range(3):
+            Label.objects.create(name='Label {0}'.format(number))
+        with mock.patch.object(SyncApiView, 'limit', 2):
+            first_part = self.client.get(reverse('api:sync'), {'token': snapshot['token']})
+            first_part = first_part.json()
+            second_part = self.client.get(reverse('api:sync'), {'token': first_part['token']})
+            second_part = second_part.json()
+        self.assertTrue(first_part['more'])
+        self.assertEqual(len(first_part['labels']['changed']), 2)
+        self.assertFalse(second_part['more'])
+        self.assertEqual(len(second_part['labels']['changed']), 1)
+
+    def test_snapshot_is_split_by_limit(self):
+        """Checking that the snapshot is sent in parts and followed by changes."""
+        rows = {'tasks': [], 'statuses': [], 'labels': []}
+        parts = 0
+        more, query = True, {}
+        with mock.patch.object(SyncApiView, 'limit', 2):
+            while more:
+                part = self.client.get(reverse('api:sync'), query).json()
+                for key, section in rows.items():
+                    section.extend(part[key]['changed'])
+                more, query = part['more'], {'token': part['token']}
+                parts += 1
+        self.assertEqual(parts, 3)
+        self.assertEqual([row['id'] for row in rows['tasks']], [1, 2])
+        self.assertEqual(rows['tasks'][1]['label_ids'], [1])
+        self.assertEqual([row['id'] for row in rows['statuses']], [1, 2])
+        self.assertEqual([row['id'] for row in rows['labels']], [1])
+
+        label = Label.objects.create(name='Срочно')
+        changes = self.client.get(reverse('api:sync'), query).json()
+        self.assertEqual([row['id'] for row in changes['labels']['changed']], [label.pk])
+        self.assertEqual(changes['tasks']['changed'], [])
@@ -0,0 +1,12 @@
+from api import views
+from django.urls import path
+
+app_name = 'api'
+urlpatterns = [
+    path('tasks/', views.TaskListApiView.as_view(), name='tasks'),
+    path('tasks/<int:pk>/', views.TaskDetailApiView.as_view(), name='task'),
+    path('statuses/', views.StatusListApiView.as_view(), name='statuses'),
+    path('labels/', views.LabelListApiView.as_view(), name='labels'),
+    path('users/', views.UserListApiView.as_view(), name='users'),
+    path('sync/', views.SyncApiView.as_view(), name='sync'),
+]
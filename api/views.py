@@ -0,0 +1,480 @@
+"""Read-only JSON API.
+
+Rows are read by one values() query, ids of labels of tasks included, and go
+to JSON as they are, without model instances or a second pass. Every
+response has a strong ETag made of versions of the tables it is built from,
+so a repeated request with If-None-Match is answered by 304 before the data
+tables are queried.
+"""
+import hashlib
+from http import HTTPStatus
+
+from caching import versions
+from changes import log
+from changes.models import Change
+from django.core import signing
+from django.db.models import Aggregate, JSONField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.http import JsonResponse
+from django.views.decorators.http import condition
+from django.views.generic import View
+from labels.models import Label
+from pagination import InvalidCursor, KeysetPaginator, page_url
+from statuses.models import Status
+from tasks.filters import TaskFilter
+from tasks.models import Task
+from tasks.search import RANK_FIELD, is_searched, ranked_ordering
+from users.models import User
+
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}  # Noqa: WPS407
+
+
+class InvalidParameters(Exception):
+    """GET parameters of a request are invalid."""
+
+    def __init__(self, errors):
+        """Save errors.
+
+        Args:
+            errors: Errors of parameters.
+        """
+        super().__init__(errors)
+        self.errors = errors
+
+
+def error_response(detail, status):
+    """Return an error as JSON.
+
+    Args:
+        detail: Message or dict of errors.
+        status(int): HTTP status.
+
+    Returns:
+        JsonResponse.
+    """
+    return JsonResponse({'detail': detail}, status=status, json_dumps_params=JSON_PARAMS)
+
+
+class JSONArray(Aggregate):
+    """Values of a group as a JSON array, which the database builds."""
+
+    function = 'JSON_GROUP_ARRAY'
+    output_field = JSONField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        """Aggregate values in their order by JSONB_AGG.
+
+        Args:
+            compiler: SQL compiler.
+            connection: Database connection.
+            **extra_context: Template context.
+
+        Returns:
+            Tuple of SQL and params.
+        """
+        return self.as_sql(
+            compiler,
+            connection,
+            function='JSONB_AGG',
+            template='%(function)s(%(expressions)s ORDER BY %(expressions)s)',  # Noqa: WPS323
+            **extra_context,
+        )
+
+
+def task_label_ids():
+    """Return the expression of ids of labels of a task.
+
+    It's a subquery of the same SELECT, so rows of tasks come with their
+    labels and aren't changed after the query. SQLite aggregates links in the
+    order of their unique index, that is by label id.
+
+    Returns:
+        Expression.
+    """
+    links = Task.labels.through.objects.filter(task_id=OuterRef('pk')).order_by()
+    grouped = links.values('task_id').annotate(ids=JSONArray('label_id'))
+    label_ids = grouped.values('ids')
+    return Coalesce(Subquery(label_ids), Value('[]'), output_field=JSONField())
+
+
+def task_rows(queryset):
+    """Return values of tasks with ids of their labels.
+
+    Found tasks have their search rank too.
+
+    Args:
+        queryset: Queryset of tasks.
+
+    Returns:
+        Queryset of dicts.
+    """
+    fields = TaskListApiView.fields
+    if is_searched(queryset):
+        fields += (RANK_FIELD,)
+    return queryset.values(*fields, label_ids=task_label_ids())
+
+
+class ApiView(View):
+    """Base view of the API which requires a signed in user."""
+
+    http_method_names = ['get', 'head', 'options']
+    models = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        """Check authentication and answer conditional requests.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            HttpResponse.
+        """
+        if not request.user.is_authenticated:
+            return error_response(
+                'Authentication credentials were not provided.', HTTPStatus.UNAUTHORIZED,
+            )
+        conditional_dispatch = condition(etag_func=self.get_etag)(super().dispatch)
+        return conditional_dispatch(request, *args, **kwargs)
+
+    def get_etag(self, request, *args, **kwargs):
+        """Return the ETag of the response.
+
+        It changes when any table of the response changes. The URL and the
+        user are included because filters may depend on them.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            str.
+        """
+        parts = [request.get_full_path(), str(request.user.pk)]
+        for model in self.models:
+            parts.append(versions.get_version(versions.table_name(model)))
+        return hashlib.md5('\n'.join(parts).encode()).hexdigest()  # Noqa: S303
+
+    def render(self, payload):
+        """Return the payload as compact JSON.
+
+        Args:
+            payload(dict): Data of the response.
+
+        Returns:
+            JsonResponse.
+        """
+        return JsonResponse(payload, json_dumps_params=JSON_PARAMS)
+
+
+class ApiListView(ApiView):
+    """Page of rows selected by a keyset cursor."""
+
+    queryset = None
+    fields = ()
+    ordering = ('id',)
+    page_size = 100
+
+    def get_queryset(self):  # Noqa: WPS615
+        """Return the queryset of the list.
+
+        Returns:
+            Queryset.
+        """
+        return self.queryset.all()
+
+    def get_rows(self, queryset):
+        """Return rows of the queryset which are sent as they are.
+
+        Args:
+            queryset: Queryset of the list.
+
+        Returns:
+            Queryset of dicts.
+        """
+        return queryset.values(*self.fields)
+
+    def get_ordering(self, queryset):  # Noqa: WPS615
+        """Return the keyset ordering of the list.
+
+        Args:
+            queryset: Queryset of the list.
+
+        Returns:
+            tuple.
+        """
+        return self.ordering
+
+    def get(self, request, *args, **kwargs):
+        """Return a page of rows and URLs of neighbouring pages.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            JsonResponse.
+        """
+        try:
+            queryset = self.get_rows(self.get_queryset())
+        except InvalidParameters as error:
+            return error_response(error.errors, HTTPStatus.BAD_REQUEST)
+        paginator = KeysetPaginator(queryset, self.get_ordering(queryset), self.page_size)
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+        except InvalidCursor:
+            return error_response('Invalid cursor.', HTTPStatus.BAD_REQUEST)
+        return self.render({
+            'results': page.object_list,
+            'next': self._absolute_page_url(page.next_cursor),
+            'previous': self._absolute_page_url(page.previous_cursor),
+        })
+
+    def _absolute_page_url(self, cursor):
+        query = page_url(self.request, cursor)
+        if query is None:
+            return None
+        return self.request.build_absolute_uri(self.request.path + query)
+
+
+class TaskListApiView(ApiListView):
+    """Tasks filtered by TaskFilter parameters."""
+
+    models = (Task,)
+    fields = ('id', 'name', 'description', 'status', 'author', 'executor', 'created_at')
+    ordering = ('created_at', 'id')
+
+    def get_queryset(self):
+        """Return filtered tasks.
+
+        Returns:
+            Queryset.
+
+        Raises:
+            InvalidParameters: if filter parameters are invalid.
+        """
+        filterset = TaskFilter(
+            self.request.GET, queryset=Task.objects.all(), request=self.request,
+        )
+        if not filterset.is_valid():
+            raise InvalidParameters(filterset.errors)
+        return filterset.qs
+
+    def get_rows(self, queryset):
+        """Return values of tasks with ids of their labels.
+
+        Args:
+            queryset: Queryset of tasks.
+
+        Returns:
+            Queryset of dicts.
+        """
+        return task_rows(queryset)
+
+    def get_ordering(self, queryset):  # Noqa: WPS615
+        """Return the ordering of tasks, found tasks are ordered by rank.
+
+        Args:
+            queryset: Queryset of tasks.
+
+        Returns:
+            tuple.
+        """
+        return ranked_ordering(queryset, self.ordering)
+
+
+class TaskDetailApiView(ApiView):
+    """One task."""
+
+    models = (Task,)
+
+    def get(self, request, *args, **kwargs):
+        """Return the task.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            JsonResponse.
+        """
+        task_row = task_rows(Task.objects.filter(pk=kwargs['pk'])).first()
+        if task_row is None:
+            return error_response('Not found.', HTTPStatus.NOT_FOUND)
+        return self.render(task_row)
+
+
+class StatusListApiView(ApiListView):
+    """Statuses."""
+
+    models = (Status,)
+    queryset = Status.objects.all()
+    fields = ('id', 'name', 'created_at')
+
+
+class LabelListApiView(ApiListView):
+    """Labels."""
+
+    models = (Label,)
+    queryset = Label.objects.all()
+    fields = ('id', 'name', 'created_at')
+
+
+class SyncApiView(ApiView):
+    """Tasks, statuses and labels changed since a token.
+
+    Without a token the response starts a snapshot of all rows, sent in parts
+    of `limit` rows in order of sections and ids. Later responses have only
+    rows which were changed and ids of deleted ones. Links of tasks to labels
+    are sent as label ids of tasks, every change of links is logged as a change
+    of its task. The token of a response points to the next part of the
+    snapshot or to the last change it includes, so clients ask again with it
+    while `more` is true.
+    """
+
+    models = (Task, Status, Label)
+    limit = 1000
+    token_salt = 'api.sync'  # Noqa: S105
+
+    def get(self, request, *args, **kwargs):
+        """Return a part of the snapshot or the changes after the `token` parameter.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            JsonResponse.
+        """
+        token = request.GET.get('token')
+        if token is None:
+            return self.render(self.get_snapshot(log.last_id()))
+        try:
+            position = signing.loads(token, salt=self.token_salt)
+        except signing.BadSignature:
+            return error_response('Invalid token.', HTTPStatus.BAD_REQUEST)
+        if isinstance(position, dict):
+            return self.render(self.get_snapshot(**position))
+        return self.render(self.get_changes(position))
+
+    def get_sections(self):
+        """Return synced tables.
+
+        Returns:
+            Tuples of the key of the response, the model and its fields.
+        """
+        return (
+            ('tasks', Task, TaskListApiView.fields),
+            ('statuses', Status, StatusListApiView.fields),
+            ('labels', Label, LabelListApiView.fields),
+        )
+
+    def get_snapshot(self, change_id, section=None, after_id=0):  # Noqa: WPS210
+        """Return the part of all rows which follows the position.
+
+        The change id is read before the first part: changes committed while
+        parts are read come again with the sync after the snapshot, and
+        applying them twice is harmless.
+
+        Args:
+            change_id(int): Id of the last change when the snapshot started.
+            section(str): Key of the section of the part, None for the first.
+            after_id(int): Id of the last row of the section which was sent.
+
+        Returns:
+            dict.
+        """
+        sections = self.get_sections()
+        keys = [key for key, _, _ in sections]
+        payload = {key: {'changed': [], 'deleted': []} for key in keys}
+        start = keys.index(section) if section in keys else 0
+        remaining = self.limit
+        position = None
+        for key, model, fields in sections[start:]:
+            rows = self._load_rows(model, fields, after_id=after_id, limit=remaining + 1)
+            payload[key]['changed'] = rows[:remaining]
+            if len(rows) > remaining:
+                after_id = rows[remaining - 1]['id'] if remaining else after_id
+                position = {'change_id': change_id, 'section': key, 'after_id': after_id}
+                break
+            remaining -= len(rows)
+            after_id = 0
+        payload['token'] = self._make_token(change_id if position is None else position)
+        payload['more'] = position is not None
+        return payload
+
+    def get_changes(self, after_id):  # Noqa: WPS210
+        """Return rows changed after the change id and ids of deleted rows.
+
+        Only the latest change of each row matters. A changed row which is
+        gone was deleted by a change of the next response.
+
+        Args:
+            after_id(int): Id of the last change the client has.
+
+        Returns:
+            dict.
+        """
+        sections = self.get_sections()
+        changes = log.changes_of_models(
+            [model for _, model, _ in sections], after_id, self.limit + 1,
+        )
+        more = len(changes) > self.limit
+        changes = changes[:self.limit]
+        latest_actions = {(table, object_id): action for _, table, object_id, action in changes}
+        payload = {
+            'token': self._make_token(changes[-1][0] if changes else after_id),
+            'more': more,
+        }
+        for key, model, fields in sections:
+            changed_ids, deleted_ids = _split_ids(latest_actions, versions.table_name(model))
+            rows = self._load_rows(model, fields, changed_ids) if changed_ids else []
+            found_ids = {row['id'] for row in rows}
+            deleted_ids.extend(set(changed_ids) - found_ids)
+            payload[key] = {'changed': rows, 'deleted': sorted(deleted_ids)}
+        return payload
+
+    def _make_token(self, position):
+        return signing.dumps(position, salt=self.token_salt)
+
+    def _load_rows(  # Noqa: WPS211
+        self, model, fields, object_ids=None, after_id=None, limit=None,
+    ):
+        queryset = model.objects.order_by('id')
+        if object_ids is not None:
+            queryset = queryset.filter(pk__in=object_ids)
+        if after_id is not None:
+            queryset = queryset.filter(pk__gt=after_id)
+        rows = task_rows(queryset) if model is Task else queryset.values(*fields)
+        return list(rows if limit is None else rows[:limit])
+
+
+def _split_ids(latest_actions, table):  # Noqa: WPS210
+    """Return ids of changed and deleted rows of the table.
+
+    Args:
+        latest_actions(dict): Actions of changes by pairs of table and object id.
+        table(str): Name of the table.
+
+    Returns:
+        Tuple of lists.
+    """
+    changed_ids, deleted_ids = [], []
+    for (changed_table, object_id), action in latest_actions.items():
+        if changed_table == table:
+            target = deleted_ids if action == Change.DELETE else changed_ids
+            target.append(object_id)
+    return changed_ids, deleted_ids
+
+
+class UserListApiView(ApiListView):
+    """Users without private fields."""
+
+    models = (User,)
+    queryset = User.objects.all()
+    fields = ('id', 'username', 'first_name', 'last_name')
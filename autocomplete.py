@@ -0,0 +1,182 @@
+"""Autocomplete of related objects by prefixes of their names.
+
+Forms render only selected options and load the rest from JSON endpoints,
+so the size of a page doesn't depend on the size of a table. Prefix searches
+are served by case-insensitive indexes which migrations create for the
+database in use.
+"""
+import copy
+import operator
+from functools import reduce
+
+from django import forms
+from django.db.models import Q  # Noqa: WPS347
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.generic import View
+from mixins import CustomLoginRequiredMixin
+
+# SQLite's LIKE ignores case of ASCII letters and can use a NOCASE index,
+# PostgreSQL's UPPER(...) LIKE UPPER(...) needs an expression index with
+# text_pattern_ops. SQLite rebuilds a table when a migration alters it and
+# loses these indexes, such migrations should create them again.
+PREFIX_INDEX_SQL = {  # Noqa: WPS407
+    'sqlite': 'CREATE INDEX {index} ON {table} ({column} COLLATE NOCASE)',
+    'postgresql': 'CREATE INDEX {index} ON {table} (UPPER({column}::text) text_pattern_ops)',
+}
+
+
+def create_prefix_indexes(schema_editor, table, columns):
+    """Create indexes which serve istartswith lookups of the columns.
+
+    Args:
+        schema_editor: Schema editor of a migration.
+        table(str): Table name.
+        columns: Column names.
+    """
+    statement = PREFIX_INDEX_SQL.get(schema_editor.connection.vendor)
+    if statement is None:
+        return
+    for column in columns:
+        schema_editor.execute(statement.format(
+            index=_prefix_index_name(table, column), table=table, column=column,
+        ))
+
+
+def drop_prefix_indexes(schema_editor, table, columns):
+    """Drop indexes made by create_prefix_indexes.
+
+    Args:
+        schema_editor: Schema editor of a migration.
+        table(str): Table name.
+        columns: Column names.
+    """
+    if schema_editor.connection.vendor not in PREFIX_INDEX_SQL:
+        return
+    for column in columns:
+        schema_editor.execute('DROP INDEX IF EXISTS {0}'.format(_prefix_index_name(table, column)))
+
+
+def _prefix_index_name(table, column):
+    return '{0}_{1}_prefix_idx'.format(table, column)
+
+
+def prefix_search(queryset, search_fields, query):
+    """Return objects which have a field starting with the query.
+
+    Objects whose fields start with separate words of the query are found too,
+    for example a user by the first letters of the first and the last name.
+
+    Args:
+        queryset: Queryset to search in.
+        search_fields: Names of fields which are compared.
+        query(str): Text entered by a user.
+
+    Returns:
+        Queryset.
+    """
+    words = query.split()
+    if not words:
+        return queryset
+    # Both kinds of matches start with the first word, so the first condition
+    # alone selects rows by indexes and the rest only checks them.
+    condition = _starts_with(search_fields, words[0])
+    if len(words) > 1:
+        other_words = [_starts_with(search_fields, word) for word in words[1:]]
+        whole_query = _starts_with(search_fields, ' '.join(words))
+        condition &= whole_query | reduce(operator.and_, other_words)
+    return queryset.filter(condition)
+
+
+def _starts_with(search_fields, prefix):
+    conditions = [Q(**{'{0}__istartswith'.format(field): prefix}) for field in search_fields]
+    return reduce(operator.or_, conditions)
+
+
+class AutocompleteView(CustomLoginRequiredMixin, View):
+    """Return JSON list of objects whose names start with the `q` parameter."""
+
+    queryset = None
+    search_fields = ()
+    ordering = ()
+    limit = 20
+
+    def get(self, request, *args, **kwargs):
+        """Return found objects as id and text pairs.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            JsonResponse.
+        """
+        search = request.GET.get('q', '')
+        found = prefix_search(self.queryset.all(), self.search_fields, search)
+        found = found.order_by(*self.ordering)[:self.limit]
+        return JsonResponse({
+            'results': [
+                {'id': found_object.pk, 'text': str(found_object)} for found_object in found
+            ],
+        })
+
+
+class AutocompleteMixin(object):
+    """Select widget which renders only selected options.
+
+    Other options are requested from the autocomplete endpoint while a user
+    types. The widget must be used by ModelChoiceField or its subclasses.
+    """
+
+    class Media(object):  # Noqa: D106, WPS431
+        js = ('task_manager/autocomplete.js',)
+
+    def __init__(self, url_name, attrs=None):
+        """Save the endpoint.
+
+        Args:
+            url_name(str): Name of the URL of an AutocompleteView.
+            attrs(dict): HTML attributes.
+        """
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        """Add the endpoint to attributes.
+
+        Args:
+            base_attrs(dict): Attributes of the widget.
+            extra_attrs(dict): Attributes of the field.
+
+        Returns:
+            dict.
+        """
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(self.url_name)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):  # Noqa: WPS110
+        """Limit choices to the selected objects.
+
+        Args:
+            name(str): Field name.
+            value: Selected ids.
+            attrs(dict): HTML attributes.
+
+        Returns:
+            List of option groups.
+        """
+        selected_ids = [object_id for object_id in value if str(object_id).isdigit()]
+        choices = copy.copy(self.choices)
+        choices.queryset = choices.queryset.filter(pk__in=selected_ids)
+        self.choices = choices
+        return super().optgroups(name, value, attrs)
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    """Select of one object which loads options on demand."""
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    """Select of many objects which loads options on demand."""
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class CachingConfig(AppConfig):  # Noqa D101
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'caching'
+
+    def ready(self):
+        """Connect signals which invalidate cached data."""
+        from caching import signals  # Noqa: WPS433
+        post_migrate.connect(signals.clear_auth_cache, sender=self, dispatch_uid='caching.auth')
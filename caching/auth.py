@@ -0,0 +1,79 @@
+"""Users of sessions loaded from the shared auth cache.
+
+AuthenticationMiddleware loads the session's user by every request. The
+backend keeps users in the cache which also holds cached_db sessions, so an
+authenticated request usually reads neither django_session nor users_user.
+
+Counters of tasks change by bulk updates without signals, so they are
+deferred and read from the database only where they are used. Users loaded
+inside a transaction aren't cached, because the transaction may be rolled
+back after the user is changed in it.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import connection, transaction
+from users.models import User
+
+DEFERRED_FIELDS = ('created_tasks_count', 'assigned_tasks_count')
+
+
+def user_key(user_id):
+    """Return the cache key of the user.
+
+    Args:
+        user_id: Primary key of the user.
+
+    Returns:
+        str.
+    """
+    return 'auth:user:{0}'.format(user_id)
+
+
+def get_auth_cache():
+    """Return the cache of sessions and users.
+
+    Returns:
+        Cache.
+    """
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+def forget_user(user_id):
+    """Drop the cached user now and after the current transaction commits.
+
+    The second delete removes a copy which another process could cache from
+    the committed old row while the change was in progress.
+
+    Args:
+        user_id: Primary key of the user.
+    """
+    key = user_key(user_id)
+    get_auth_cache().delete(key)
+    transaction.on_commit(lambda: get_auth_cache().delete(key))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend which reads users of sessions from the auth cache."""
+
+    timeout = 300
+
+    def get_user(self, user_id):
+        """Return the active user from the cache or the database.
+
+        Args:
+            user_id: Primary key from the session.
+
+        Returns:
+            User or None.
+        """
+        key = user_key(user_id)
+        user = get_auth_cache().get(key)
+        if user is None:
+            try:
+                user = User.objects.defer(*DEFERRED_FIELDS).get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            if not connection.in_atomic_block:
+                get_auth_cache().set(key, user, self.timeout)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,45 @@
+from caching.reference import get_cached_objects
+from django import forms
+from django.forms.models import ModelChoiceIterator
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """Iterate choices from the reference data cache instead of the database."""
+
+    def __iter__(self):
+        """Yield the empty choice and choices of cached objects.
+
+        Yields:
+            Tuples of value and label.
+        """
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from map(self.choice, get_cached_objects(self.queryset))
+
+    def __len__(self):
+        """Return the number of choices.
+
+        Returns:
+            int.
+        """
+        return len(get_cached_objects(self.queryset)) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        """Return True if there are choices.
+
+        Returns:
+            bool.
+        """
+        return self.field.empty_label is not None or bool(get_cached_objects(self.queryset))
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField which renders cached choices."""
+
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """ModelMultipleChoiceField which renders cached choices."""
+
+    iterator = CachedModelChoiceIterator
@@ -0,0 +1,85 @@
+import time
+
+from caching import auth
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from users.models import User
+
+MODES = (
+    (
+        'database sessions',
+        'django.contrib.sessions.backends.db',
+        'django.contrib.auth.backends.ModelBackend',
+    ),
+    (
+        'cached sessions and users',
+        'django.contrib.sessions.backends.cached_db',
+        'caching.auth.CachedModelBackend',
+    ),
+)
+
+
+class Command(BaseCommand):
+    """Compare queries per request with database and cached sessions.
+
+    Each mode signs in by its own client, makes one request to warm caches
+    and then counts queries of the following requests.
+    """
+
+    help = 'Compare queries per request with database and cached sessions'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument('--path', default='/statuses/', help='Page of a signed in user')
+        parser.add_argument('--username', help='User who requests the page, the first if omitted')
+        parser.add_argument('--requests', type=int, default=100, help='Number of requests')
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Request the page in both modes and report queries per request.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if the user doesn't exist.
+        """
+        users = User.objects.order_by('pk')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError('User not found')
+        for name, session_engine, backend in MODES:
+            mode_settings = override_settings(
+                SESSION_ENGINE=session_engine, AUTHENTICATION_BACKENDS=[backend],
+            )
+            with mode_settings:
+                self._measure(name, user, options['path'], options['requests'])
+
+    def _measure(self, name, user, path, requests):  # Noqa: WPS210
+        auth.forget_user(user.pk)
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        client.get(path)
+        started = time.monotonic()
+        captured = CaptureQueriesContext(connection)
+        with captured:
+            for _ in range(requests):
+                client.get(path)
+        elapsed_ms = (time.monotonic() - started) * 1000
+        auth_queries = [
+            query for query in captured
+            if '"django_session"' in query['sql'] or 'FROM "users_user"' in query['sql']
+        ]
+        report = '{0}: {1:.1f} queries, {2:.1f} of sessions and users, {3:.1f} ms'
+        self.stdout.write(report.format(
+            name, len(captured) / requests, len(auth_queries) / requests, elapsed_ms / requests,
+        ))
+        client.logout()
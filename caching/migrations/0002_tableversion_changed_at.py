@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caching', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tableversion',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
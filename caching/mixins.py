@@ -0,0 +1,74 @@
+import hashlib
+
+from caching import versions
+from django.contrib import messages
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+class ConditionalPageMixin(object):
+    """Answer GET by 304 if tables which the page is built from are unchanged.
+
+    The ETag combines versions of versioned_models with the URL including
+    filter parameters, the user, the language and the CSRF secret of the page's
+    forms. Pages with pending messages are always rendered, so messages
+    aren't lost.
+    """
+
+    versioned_models = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        """Check validators of GET requests before the view reads its data.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            HttpResponse.
+        """
+        if request.method not in {'GET', 'HEAD'}:
+            return super().dispatch(request, *args, **kwargs)
+        conditional_dispatch = condition(
+            etag_func=self._get_etag, last_modified_func=self._get_last_modified,
+        )(super().dispatch)
+        response = conditional_dispatch(request, *args, **kwargs)
+        if response.has_header('ETag'):
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_version_stamps(self):  # Noqa: WPS615
+        """Return versions and change times of data which the page shows.
+
+        Returns:
+            List of pairs of version and datetime, None to skip validation.
+        """
+        names = [versions.table_name(model) for model in self.versioned_models]
+        return [(versions.get_version(name), versions.get_changed_at(name)) for name in names]
+
+    def _get_etag(self, request, *args, **kwargs):
+        stamps = self._get_stamps(request)
+        if stamps is None:
+            return None
+        parts = [
+            request.get_full_path(),
+            str(request.user.pk),
+            getattr(request, 'LANGUAGE_CODE', ''),
+            request.META.get('CSRF_COOKIE', ''),
+        ]
+        parts.extend(version for version, _ in stamps)
+        return hashlib.md5('\n'.join(parts).encode()).hexdigest()  # Noqa: S303
+
+    def _get_last_modified(self, request, *args, **kwargs):
+        stamps = self._get_stamps(request)
+        if not stamps:
+            return None
+        return max(changed_at for _, changed_at in stamps)
+
+    def _get_stamps(self, request):
+        if messages.get_messages(request):
+            return None
+        if not hasattr(self, '_version_stamps'):  # Noqa: WPS421
+            self._version_stamps = self.get_version_stamps()  # Noqa: WPS601
+        return self._version_stamps
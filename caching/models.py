@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Current version of a table's content shared by all worker processes."""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.CharField(max_length=32)  # Noqa: WPS432
+    changed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return '{0}@{1}'.format(self.name, self.version)
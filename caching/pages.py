@@ -0,0 +1,93 @@
+"""Cache of whole pages which are shown to anonymous visitors.
+
+A page is stored per URL, language and versions of tables which it shows,
+so a change of such a table makes the next request render the page again.
+Forms of a cached page get a placeholder instead of the CSRF token, which is
+replaced by the token of each request when the page is served.
+"""
+import hashlib
+
+from caching import versions
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import translation
+
+CSRF_PLACEHOLDER = 'csrf-token-of-cached-page'
+
+
+class AnonymousPageCacheMixin(object):
+    """Serve GET requests of anonymous visitors from the page cache.
+
+    Pages with pending messages are always rendered, so messages aren't lost.
+    """
+
+    page_versioned_models = ()
+    page_timeout = 600
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return the cached page or render and store it.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            HttpResponse.
+        """
+        self.page_is_cached = self._is_cacheable(request)  # Noqa: WPS601
+        if not self.page_is_cached:
+            return super().dispatch(request, *args, **kwargs)
+        key = self._get_page_key(request)
+        page = cache.get(key)
+        if page is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):  # Noqa: WPS421
+                response.render()
+            if response.status_code != 200 or response.streaming:  # Noqa: WPS432
+                return response
+            page = (response.content, [
+                (header, header_value)
+                for header, header_value in response.items()
+                if header != 'Content-Length'
+            ])
+            cache.set(key, page, self.page_timeout)
+        return self._serve(request, page)
+
+    def get_context_data(self, **kwargs):
+        """Put the placeholder of the CSRF token into pages which are cached.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        if getattr(self, 'page_is_cached', False):
+            context['csrf_token'] = CSRF_PLACEHOLDER
+        return context
+
+    def _is_cacheable(self, request):
+        if request.method not in {'GET', 'HEAD'} or request.user.is_authenticated:
+            return False
+        return not messages.get_messages(request)
+
+    def _get_page_key(self, request):
+        names = [versions.table_name(model) for model in self.page_versioned_models]
+        parts = [request.get_full_path(), translation.get_language()]
+        parts.extend(versions.get_version(name) for name in names)
+        digest = hashlib.md5('\n'.join(parts).encode()).hexdigest()  # Noqa: S303
+        return 'page:{0}'.format(digest)
+
+    def _serve(self, request, page):  # Noqa: WPS210
+        body, headers = page
+        placeholder = CSRF_PLACEHOLDER.encode()
+        if placeholder in body:
+            body = body.replace(placeholder, get_token(request).encode())
+        response = HttpResponse(body)
+        for header, header_value in headers:
+            response[header] = header_value
+        return response
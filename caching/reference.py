@@ -0,0 +1,24 @@
+"""Cache of reference data: statuses, labels and users shown in choices."""
+import hashlib
+
+from caching.versions import get_version, table_name
+from django.core.cache import cache
+
+
+def get_cached_objects(queryset):
+    """Return objects of the queryset from the cache of the current table version.
+
+    Args:
+        queryset: Queryset of a tracked model.
+
+    Returns:
+        List of objects.
+    """
+    name = table_name(queryset.model)
+    query_hash = hashlib.md5(str(queryset.query).encode()).hexdigest()  # Noqa: S303
+    key = 'reference:{0}:{1}:{2}'.format(name, get_version(name), query_hash)
+    cached = cache.get(key)
+    if cached is None:
+        cached = list(queryset)
+        cache.set(key, cached)
+    return cached
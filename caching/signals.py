@@ -0,0 +1,85 @@
+from caching import auth, versions
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from labels.models import Label
+from statuses.models import Status
+from tasks import counters
+from tasks.models import Task
+from users.models import User
+
+REFERENCE_MODELS = (Status, Label, User)
+
+
+def bump_table_version(sender, update_fields=None, **kwargs):
+    """Store a new version of the changed model's table.
+
+    Args:
+        sender: Model class.
+        update_fields: Saved fields or None.
+        **kwargs: Signal's kwargs.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    versions.bump(versions.table_name(sender))
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(bump_table_version, sender=model, dispatch_uid='caching.save')
+    post_delete.connect(bump_table_version, sender=model, dispatch_uid='caching.delete')
+
+
+def bump_task_version(sender, **kwargs):
+    """Store a new version of tasks when a task is saved or deleted.
+
+    Bulk operations store one version themselves.
+
+    Args:
+        sender: Task.
+        **kwargs: Signal's kwargs.
+    """
+    if not counters.is_handled_in_bulk():
+        versions.bump(versions.table_name(Task))
+
+
+def bump_task_version_by_labels(sender, action, **kwargs):
+    """Store a new version of tasks when labels of a task are changed.
+
+    Args:
+        sender: Through model of Task.labels.
+        action(str): Kind of change.
+        **kwargs: Signal's kwargs.
+    """
+    if action.startswith('post_'):
+        bump_task_version(sender, **kwargs)
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    """Drop the changed or deleted user from the auth cache.
+
+    Args:
+        sender: User.
+        instance: Saved or deleted user.
+        **kwargs: Signal's kwargs.
+    """
+    auth.forget_user(instance.pk)
+
+
+def clear_auth_cache(sender, **kwargs):
+    """Drop cached sessions and users after migrations.
+
+    Cached users are pickled instances which may not match the migrated
+    model. Sessions are read from the database again when they are missed.
+
+    Args:
+        sender: AppConfig.
+        **kwargs: Signal's kwargs.
+    """
+    auth.get_auth_cache().clear()
+
+
+post_save.connect(forget_cached_user, sender=User, dispatch_uid='caching.user_save')
+post_delete.connect(forget_cached_user, sender=User, dispatch_uid='caching.user_delete')
+post_save.connect(bump_task_version, sender=Task, dispatch_uid='caching.task_save')
+post_delete.connect(bump_task_version, sender=Task, dispatch_uid='caching.task_delete')
+m2m_changed.connect(
+    bump_task_version_by_labels, sender=Task.labels.through, dispatch_uid='caching.task_labels',
+)
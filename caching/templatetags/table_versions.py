@@ -0,0 +1,26 @@
+"""Versions of tables for keys of cached template fragments.
+
+A fragment which shows related objects is keyed by versions of their tables,
+so renaming a status or a user renders the fragment again::
+
+    {% load cache table_versions %}
+    {% table_versions 'statuses.status' 'users.user' as versions %}
+    {% cache 600 task_row task.pk task.updated_at versions %}...{% endcache %}
+"""
+from caching import versions
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag
+def table_versions(*names):
+    """Return current versions of the tables joined into one string.
+
+    Args:
+        *names: Table names made by caching.versions.table_name().
+
+    Returns:
+        str.
+    """
+    return '-'.join(versions.get_version(name) for name in names)
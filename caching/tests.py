@@ -0,0 +1,201 @@
+import re
+import uuid
+
+from caching import auth
+from caching.models import TableVersion
+from caching.pages import CSRF_PLACEHOLDER
+from caching.versions import get_version, reset
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from labels.models import Label
+from statuses.models import Status
+from users.models import User
+
+REFERENCE_TABLES = ('"statuses_status"', '"labels_label"', '"users_user"')
+
+
+def reference_queries(queries):
+    """Return queries which load whole reference tables.
+
+    Args:
+        queries: Captured queries.
+
+    Returns:
+        List of SQL.
+    """
+    unfiltered = [
+        query['sql']
+        for query in queries
+        if query['sql'].startswith('SELECT') and ' WHERE ' not in query['sql']
+    ]
+    return [
+        sql
+        for sql in unfiltered
+        if any('FROM {0}'.format(table) in sql for table in REFERENCE_TABLES)
+    ]
+
+
+class ReferenceCacheTests(TestCase):
+    """Test cache of reference data."""
+
+    fixtures = ['tasks.json', 'statuses.json', 'labels.json', 'users.json']
+
+    def setUp(self):
+        """Prepare data for tests."""
+        self.user = User.objects.get(pk=1)
+        self.client.force_login(self.user)
+        cache.clear()
+        caches['template_fragments'].clear()
+
+    def test_choices_are_loaded_once(self):
+        """Checking that filter choices are read from the cache by the second request."""
+        with CaptureQueriesContext(connection) as first_queries:
+            self.client.get(reverse('tasks:list'))
+        self.assertEqual(len(reference_queries(first_queries)), 3)
+        for url in (reverse('tasks:list'),):
+            with CaptureQueriesContext(connection) as next_queries:
+                response = self.client.get(url)
+            self.assertEqual(reference_queries(next_queries), [])
+            self.assertContains(response, 'Баг')
+            self.assertContains(response, 'Aleksey Navalniy')
+
+    def test_changes_invalidate_choices(self):
+        """Checking that created, changed and deleted objects change choices."""
+        self.client.get(reverse('tasks:list'))
+        Status.objects.create(name='Новый')
+        label = Label.objects.get(pk=1)
+        label.name = 'Фича'
+        label.save()
+        User.objects.filter(pk=2).update(first_name='Игорь')
+        User.objects.get(pk=2).save()
+        response = self.client.get(reverse('tasks:list'))
+        self.assertContains(response, 'Новый')
+        self.assertContains(response, 'Фича')
+        self.assertNotContains(response, 'Баг')
+        self.assertContains(response, 'Игорь')
+        Status.objects.get(name='Новый').delete()
+        response = self.client.get(reverse('tasks:list'))
+        self.assertNotContains(response, 'Новый')
+
+    def test_version_changed_by_another_process(self):
+        """Checking that a version stored by another worker is noticed by the next request."""
+        self.client.get(reverse('tasks:list'))
+        Status.objects.filter(pk=1).update(name='Архив')
+        TableVersion.objects.filter(name='statuses.status').update(version=uuid.uuid4().hex)
+        response = self.client.get(reverse('tasks:list'))
+        self.assertContains(response, 'Архив')
+
+    def test_login_does_not_change_version(self):
+        """Checking that updating of last_login keeps cached users."""
+        reset()
+        version = get_version('users.user')
+        self.client.post(reverse('login'), {'username': 'FBK', 'password': 'svoboda'})
+        reset()
+        self.assertEqual(get_version('users.user'), version)
+
+
+class CachedAuthTests(TransactionTestCase):
+    """Test sessions and users read from the auth cache.
+
+    Users aren't cached inside transactions, so these tests run without the
+    transaction of TestCase.
+    """
+
+    fixtures = ['statuses.json', 'users.json']
+
+    def setUp(self):
+        """Prepare data for tests."""
+        auth.get_auth_cache().clear()
+        self.user = User.objects.get(pk=1)
+        self.client.force_login(self.user)
+
+    def test_authenticated_request_reads_cache(self):
+        """Checking that a warm request reads neither the session nor the user."""
+        self.client.get(reverse('statuses:list'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('statuses:list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'], self.user)
+        auth_queries = [
+            query['sql'] for query in queries
+            if '"django_session"' in query['sql'] or 'FROM "users_user"' in query['sql']
+        ]
+        self.assertEqual(auth_queries, [])
+
+    def test_changed_user_is_reloaded(self):
+        """Checking that updating the user drops its cached copy."""
+        self.client.get(reverse('statuses:list'))
+        self.client.post(reverse('users:update', args=(self.user.pk,)), {
+            'first_name': 'Новое',
+            'last_name': self.user.last_name,
+            'username': self.user.username,
+            'password1': 'svoboda',
+            'password2': 'svoboda',
+        })
+        self.client.force_login(User.objects.get(pk=self.user.pk))
+        response = self.client.get(reverse('statuses:list'))
+        self.assertEqual(response.context['user'].first_name, 'Новое')
+
+    def test_deleted_user_is_logged_out(self):
+        """Checking that a deleted user isn't served from the cache."""
+        user = User.objects.create_user(username='temporary', password='svoboda')  # Noqa: S106
+        self.client.force_login(user)
+        self.client.get(reverse('statuses:list'))
+        self.client.post(reverse('users:delete', args=(user.pk,)))
+        self.assertFalse(User.objects.filter(pk=user.pk).exists())
+        self.assertIsNone(auth.get_auth_cache().get(auth.user_key(user.pk)))
+        response = self.client.get(reverse('statuses:list'))
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+
+
+class AnonymousPageCacheTests(TestCase):
+    """Test the cache of pages shown to anonymous visitors."""
+
+    fixtures = ['users.json']
+
+    def setUp(self):
+        """Prepare data for tests."""
+        cache.clear()
+
+    def test_cached_login_page_has_valid_token(self):
+        """Checking that a cached form gets the CSRF token of its request."""
+        self.client.get(reverse('login'))
+        csrf_client = Client(enforce_csrf_checks=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = csrf_client.get(reverse('login'))
+        self.assertEqual(len(queries), 0)
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        token = re.search(r'name="csrfmiddlewaretoken" value="(\w+)"', response.content.decode())
+        response = csrf_client.post(reverse('login'), {
+            'csrfmiddlewaretoken': token.group(1), 'username': 'nope', 'password': 'nope',
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_vary_on_language(self):
+        """Checking that each language has its own cached page."""
+        russian = self.client.get(reverse('home'), HTTP_ACCEPT_LANGUAGE='ru')
+        english = self.client.get(reverse('home'), HTTP_ACCEPT_LANGUAGE='en')
+        self.assertContains(russian, 'Менеджер задач')
+        self.assertContains(english, 'Task manager')
+        russian = self.client.get(reverse('home'), HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertContains(russian, 'Менеджер задач')
+
+    def test_user_changes_invalidate_list(self):
+        """Checking that the cached list of users is rendered again after changes."""
+        self.client.get(reverse('users:list'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('users:list'))
+        self.assertFalse([query for query in queries if 'FROM "users_user"' in query['sql']])
+        User.objects.create_user(  # Noqa: S106
+            username='newcomer', first_name='Новичок', password='svoboda',
+        )
+        self.assertContains(self.client.get(reverse('users:list')), 'Новичок')
+
+    def test_signed_in_pages_are_not_cached(self):
+        """Checking that pages of signed in users are rendered for them."""
+        self.client.get(reverse('home'))
+        self.client.force_login(User.objects.get(pk=1))
+        self.assertIn('dashboard', self.client.get(reverse('home')).context)
@@ -0,0 +1,87 @@
+"""Versions of tables which are changed rarely and read often.
+
+Every change of a tracked table stores a new random version token in the
+database, so each worker process notices the change by its next request and
+data cached under the old version is never read again. Tokens are never reused,
+so data cached inside a rolled back transaction can't match a later version.
+"""
+import uuid
+
+from asgiref.local import Local
+from caching.models import TableVersion
+from django.core.signals import request_started
+
+_memo = Local()
+
+
+def table_name(model):
+    """Return the name which versions of the model's table are stored by.
+
+    Args:
+        model: Model class or instance.
+
+    Returns:
+        str.
+    """
+    return model._meta.label_lower  # Noqa: WPS437
+
+
+def get_version(name):
+    """Return the current version of the table.
+
+    Versions of all tables are loaded by one query once per request. A table
+    which has no version yet gets one, so its data is never cached unversioned.
+
+    Args:
+        name(str): Table name made by table_name().
+
+    Returns:
+        str.
+    """
+    return _get_stamp(name)[0]
+
+
+def get_changed_at(name):
+    """Return the time when the current version of the table was stored.
+
+    Args:
+        name(str): Table name made by table_name().
+
+    Returns:
+        datetime.
+    """
+    return _get_stamp(name)[1]
+
+
+def _get_stamp(name):
+    stamps = getattr(_memo, 'stamps', None)
+    if stamps is None:
+        rows = TableVersion.objects.values_list('name', 'version', 'changed_at')
+        stamps = {table: (version, changed_at) for table, version, changed_at in rows}
+        _memo.stamps = stamps
+    if name not in stamps:
+        bump(name)
+        return _get_stamp(name)
+    return stamps[name]
+
+
+def bump(name):
+    """Store a new version of the table.
+
+    Args:
+        name(str): Table name made by table_name().
+    """
+    TableVersion.objects.update_or_create(name=name, defaults={'version': uuid.uuid4().hex})
+    reset()
+
+
+def reset(**kwargs):
+    """Forget versions which were loaded by this process for the current request.
+
+    Args:
+        **kwargs: Signal's kwargs.
+    """
+    _memo.stamps = None
+
+
+request_started.connect(reset, dispatch_uid='caching.versions.reset')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangesConfig(AppConfig):  # Noqa D101
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'changes'
+
+    def ready(self):
+        """Connect signals which record changes of tasks."""
+        from changes import signals  # Noqa: F401, WPS433
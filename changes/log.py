@@ -0,0 +1,80 @@
+"""Append-only log of changes which live pages follow.
+
+Changes are recorded in the transaction which makes them. PostgreSQL gives
+out ids before commit, so concurrent writers are serialized by a table lock
+until they commit. Otherwise a reader could pass a committed id while a lower
+one is still invisible and lose that change.
+"""
+from caching.versions import table_name
+from changes.models import Change
+from django.db import connection, transaction
+
+LOCK_SQL = {  # Noqa: WPS407
+    'postgresql': 'LOCK TABLE {0} IN EXCLUSIVE MODE',
+}
+
+
+def record(model, object_ids, action):
+    """Append changes of objects to the log.
+
+    Args:
+        model: Model class of the objects.
+        object_ids: Ids of changed objects.
+        action(str): Change.CREATE, Change.UPDATE or Change.DELETE.
+    """
+    object_ids = [object_id for object_id in object_ids if object_id is not None]
+    if not object_ids:
+        return
+    name = table_name(model)
+    with transaction.atomic():
+        lock = LOCK_SQL.get(connection.vendor)
+        if lock is not None:
+            table = connection.ops.quote_name(Change._meta.db_table)  # Noqa: WPS437
+            with connection.cursor() as cursor:
+                cursor.execute(lock.format(table))
+        Change.objects.bulk_create([
+            Change(table=name, object_id=object_id, action=action) for object_id in object_ids
+        ])
+
+
+def last_id():
+    """Return the id of the latest change, 0 if the log is empty.
+
+    Returns:
+        int.
+    """
+    change_ids = Change.objects.order_by('-id').values_list('id', flat=True)
+    return change_ids.first() or 0
+
+
+def changes_after(model, after_id, limit):
+    """Return the oldest changes of the model's table which follow the id.
+
+    Args:
+        model: Model class.
+        after_id(int): Id of the last change a reader has seen.
+        limit(int): Maximal number of changes.
+
+    Returns:
+        List of tuples of change id, object id and action.
+    """
+    changes = Change.objects.filter(table=table_name(model), id__gt=after_id)
+    rows = changes.order_by('id').values_list('id', 'object_id', 'action')
+    return list(rows[:limit])
+
+
+def changes_of_models(models, after_id, limit):
+    """Return the oldest changes of tables of the models which follow the id.
+
+    Args:
+        models: Model classes.
+        after_id(int): Id of the last change a reader has seen.
+        limit(int): Maximal number of changes.
+
+    Returns:
+        List of tuples of change id, table name, object id and action.
+    """
+    changes = Change.objects.filter(
+        table__in=[table_name(model) for model in models], id__gt=after_id,
+    ).order_by('id')
+    return list(changes.values_list('id', 'table', 'object_id', 'action')[:limit])
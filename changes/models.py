@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class Change(models.Model):
+    """Row of the append-only log of changes of tracked tables.
+
+    Ids grow in the order changes are committed, so a reader follows the log
+    by remembering the last id it has seen.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTIONS = (
+        (CREATE, CREATE),
+        (UPDATE, UPDATE),
+        (DELETE, DELETE),
+    )
+
+    table = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTIONS)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta(object):  # Noqa: D106
+        indexes = [models.Index(fields=['table', 'id'], name='changes_table_id_idx')]
+
+    def __str__(self):
+        return '{0} {1} {2}'.format(self.action, self.table, self.object_id)
@@ -0,0 +1,75 @@
+from changes import log
+from changes.models import Change
+from django.db.models.signals import post_delete, post_save
+from labels.models import Label
+from statuses.models import Status
+from tasks import counters
+from tasks.models import Task
+
+REFERENCE_MODELS = (Status, Label)
+
+
+def record_saved_object(sender, instance, created, raw, **kwargs):
+    """Log a created or changed status or label.
+
+    Counters are changed by updates without signals and aren't logged.
+
+    Args:
+        sender: Model class.
+        instance: Saved object.
+        created(bool): True if the object was created.
+        raw(bool): True if the object is loaded from a fixture.
+        **kwargs: Signal's kwargs.
+    """
+    if not raw:
+        log.record(sender, [instance.pk], Change.CREATE if created else Change.UPDATE)
+
+
+def record_deleted_object(sender, instance, **kwargs):
+    """Log a deleted status or label.
+
+    Args:
+        sender: Model class.
+        instance: Deleted object.
+        **kwargs: Signal's kwargs.
+    """
+    log.record(sender, [instance.pk], Change.DELETE)
+
+
+for model in REFERENCE_MODELS:
+    post_save.connect(record_saved_object, sender=model, dispatch_uid='changes.save')
+    post_delete.connect(record_deleted_object, sender=model, dispatch_uid='changes.delete')
+
+
+def record_saved_task(sender, instance, created, raw, **kwargs):
+    """Log a created or changed task.
+
+    Changes of its links to labels are logged by Task.touch.
+
+    Args:
+        sender: Task.
+        instance: Saved task.
+        created(bool): True if the task was created.
+        raw(bool): True if the task is loaded from a fixture.
+        **kwargs: Signal's kwargs.
+    """
+    if not raw:
+        log.record(Task, [instance.pk], Change.CREATE if created else Change.UPDATE)
+
+
+def record_deleted_task(sender, instance, **kwargs):
+    """Log a deleted task.
+
+    Bulk deletions log all tasks themselves.
+
+    Args:
+        sender: Task.
+        instance: Deleted task.
+        **kwargs: Signal's kwargs.
+    """
+    if not counters.is_handled_in_bulk():
+        log.record(Task, [instance.pk], Change.DELETE)
+
+
+post_save.connect(record_saved_task, sender=Task, dispatch_uid='changes.task_save')
+post_delete.connect(record_deleted_task, sender=Task, dispatch_uid='changes.task_delete')
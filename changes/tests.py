@@ -0,0 +1,45 @@
+from changes import log
+from changes.models import Change
+from django.test import TestCase
+from labels.models import Label
+from tasks import bulk
+from tasks.models import Task
+from users.models import User
+
+
+class ChangeLogTests(TestCase):
+    """Test the log of task changes."""
+
+    fixtures = ['tasks.json', 'statuses.json', 'labels.json', 'users.json']
+
+    def setUp(self):
+        """Prepare data for tests."""
+        self.user = User.objects.get(pk=1)
+        self.task = Task.objects.get(pk=1)
+        self.after_id = log.last_id()
+
+    def logged(self):
+        """Return task changes which follow the start of the test.
+
+        Returns:
+            List of pairs of task id and action.
+        """
+        changes = log.changes_after(Task, self.after_id, 100)
+        return [(task_id, action) for _, task_id, action in changes]
+
+    def test_saves_and_labels_are_logged(self):
+        """Checking that saving a task and changing its labels are logged."""
+        self.task.name = 'Changed'
+        self.task.save()
+        Label.objects.get(pk=1).tasks.add(self.task)
+        self.task.delete()
+        self.assertEqual(
+            self.logged(),
+            [(1, Change.UPDATE), (1, Change.UPDATE), (1, Change.DELETE)],
+        )
+
+    def test_bulk_actions_are_logged(self):
+        """Checking that bulk actions log only changed tasks."""
+        bulk.apply_action(bulk.CHANGE_EXECUTOR, [1, 2], self.user, self.user)
+        bulk.apply_action(bulk.DELETE, [1, 100], self.user)
+        self.assertEqual(self.logged(), [(1, Change.UPDATE), (1, Change.DELETE)])
@@ -0,0 +1,23 @@
+from autocomplete import create_prefix_indexes, drop_prefix_indexes
+from django.db import migrations
+
+COLUMNS = ['name']
+
+
+def create_indexes(apps, schema_editor):
+    create_prefix_indexes(schema_editor, 'labels_label', COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    drop_prefix_indexes(schema_editor, 'labels_label', COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_tasks_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0003_label_name_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='label',
+            index=models.Index(fields=['tasks_count', 'id'], name='label_tasks_count_idx'),
+        ),
+    ]
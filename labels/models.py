@@ -5,10 +5,15 @@ from django.utils.translation import gettext_lazy as _
 class Label(models.Model):
     name = models.CharField(max_length=100, unique=True, blank=False, verbose_name=_('Name'))
     created_at = models.DateTimeField(auto_now_add=True)
+    tasks_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta(object):
         verbose_name = _('Label')
         verbose_name_plural = _('Labels')
+        # Lists are sorted by usage and paginated by keyset.
+        indexes = [
+            models.Index(fields=['tasks_count', 'id'], name='label_tasks_count_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -1,6 +1,10 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from labels.models import Label
+from labels.views import LabelListView
+from pagination import KeysetPaginator
 from tasks.models import Task
 from users.models import User
 
@@ -77,6 +81,18 @@ class LabelsTests(TestCase):
         self.assertContains(response, 'Метка успешно изменена')
         self.assertEqual(Label.objects.get(pk=self.label_bug.id).name, 'Релиз')
 
+    def test_updating_keeps_counter(self):
+        """Checking that saving the form doesn't write the counter of tasks."""
+        self.client.force_login(self.user)
+        update_url = reverse('labels:update', args=(self.label_bug.id, ))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(update_url, {'name': 'Релиз'})
+        updates = [
+            query['sql'] for query in queries if query['sql'].startswith('UPDATE "labels_label"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('tasks_count', updates[0])
+
     def test_label_updating_without_login(self):
         """Checking of permissions to update."""
         update_url = reverse('labels:update', args=(self.label_bug.id, ))
@@ -140,3 +156,70 @@ class LabelsTests(TestCase):
             fetch_redirect_response=True,
         )
         self.assertContains(response, 'Невозможно удалить метку, потому что она используется')
+
+    def test_deletion_loads_label_once(self):
+        """Checking that the restriction check and deletion share the label."""
+        self.client.force_login(self.user)
+        delete_url = reverse('labels:delete', args=(self.label_bug.id, ))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(delete_url)
+        label_queries = [
+            query for query in queries
+            if query['sql'].startswith('SELECT') and 'FROM "labels_label"' in query['sql']
+        ]
+        self.assertEqual(len(label_queries), 1)
+        self.assertFalse(Label.objects.filter(pk=self.label_bug.id).exists())
+
+    def test_autocomplete(self):
+        """Checking of search of labels by a prefix of the name."""
+        self.client.force_login(self.user)
+        Label.objects.create(name='Срочно')
+        response = self.client.get(reverse('labels:autocomplete'), {'q': 'Ср'})
+        label_id = Label.objects.get(name='Срочно').id
+        self.assertEqual(
+            response.json(), {'results': [{'id': label_id, 'text': 'Срочно'}]},
+        )
+
+    def test_conditional_list_follows_counters(self):
+        """Checking that the list of labels is rendered again when counters change."""
+        self.client.force_login(self.user)
+        etag = self.client.get(reverse('labels:list'))['ETag']
+        response = self.client.get(reverse('labels:list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Task.objects.get(pk=1).labels.add(self.label_bug)
+        response = self.client.get(reverse('labels:list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_sorted_by_usage_by_pages(self):
+        """Checking that labels are sorted by counters and loaded by pages."""
+        self.client.force_login(self.user)
+        Label.objects.bulk_create([
+            Label(name='Label {0}'.format(number), tasks_count=number % 7)
+            for number in range(60)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('labels:list'), {'sort': '-tasks'})
+        self.assertEqual(len([query for query in queries if 'labels_label' in query['sql']]), 1)
+        shown = list(response.context['labels'])
+        self.assertEqual(len(shown), 50)
+        self.assertEqual([label.tasks_count for label in shown[:2]], [6, 6])
+        self.assertEqual(response.context['sort_urls']['tasks'], '?sort=tasks')
+        self.assertContains(response, '&darr;')
+
+        response = self.client.get(
+            reverse('labels:list') + response.context['next_page_url'],
+        )
+        shown += list(response.context['labels'])
+        self.assertEqual(len(shown), 61)
+        expected = Label.objects.order_by('-tasks_count', '-id')
+        self.assertEqual(shown, list(expected))
+        response = self.client.get(reverse('labels:list'), {'sort': 'unknown'})
+        self.assertEqual(response.context['current_sort'], LabelListView.default_sort)
+
+    def test_list_sorting_uses_indexes(self):
+        """Checking that pages of every ordering are read from an index."""
+        if connection.vendor != 'sqlite':
+            return
+        for ordering in LabelListView.sort_orderings.values():
+            paginator = KeysetPaginator(Label.objects.all(), ordering, 50)
+            self.assertNotIn('TEMP B-TREE', paginator.get_page_queryset().explain())
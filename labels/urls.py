@@ -1,10 +1,12 @@
 from django.urls import path
 from labels import views
+from mixins import as_read_view
 
 app_name = 'labels'
 urlpatterns = [
-    path('', views.LabelListView.as_view(), name='list'),
+    path('', as_read_view(views.LabelListView, views.AsyncLabelListView), name='list'),
     path('create/', views.CreateLabelView.as_view(), name='create'),
     path('<int:pk>/update/', views.UpdateLabelView.as_view(), name='update'),
     path('<int:pk>/delete/', views.DeleteLabelView.as_view(), name='delete'),
+    path('autocomplete/', views.LabelAutocompleteView.as_view(), name='autocomplete'),
 ]
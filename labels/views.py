@@ -1,18 +1,49 @@
+from autocomplete import AutocompleteView
+from caching.mixins import ConditionalPageMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.edit import CreateView, UpdateView
 from django.views.generic.list import ListView
 from labels.models import Label
-from mixins import CustomLoginRequiredMixin, DeleteViewWithRestrictions
-
-
-class LabelListView(CustomLoginRequiredMixin, ListView):
+from mixins import (
+    AsyncViewMixin,
+    CustomLoginRequiredMixin,
+    DeleteViewWithRestrictions,
+    RequestObjectCacheMixin,
+)
+from pagination import SortedKeysetPaginationMixin
+from tasks.models import Task
+
+
+class LabelListView(  # Noqa: WPS215
+    CustomLoginRequiredMixin,
+    ConditionalPageMixin,
+    SortedKeysetPaginationMixin,
+    ListView,
+):
     """ListView of Labels."""
 
     model = Label
+    # Counters of labels change with tasks.
+    versioned_models = (Label, Task)
     template_name = 'labels/list.html'
     context_object_name = 'labels'
+    # Each ordering follows an index: the primary key, the unique name or
+    # label_tasks_count_idx, so a page costs the same for any number of labels.
+    sort_orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'name': ('name', 'id'),
+        '-name': ('-name', '-id'),
+        'tasks': ('tasks_count', 'id'),
+        '-tasks': ('-tasks_count', '-id'),
+    }
+    default_sort = 'id'
+
+
+class AsyncLabelListView(AsyncViewMixin, LabelListView):
+    """ListView of Labels served by a coroutine."""
 
 
 class CreateLabelView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
@@ -25,10 +56,15 @@ class CreateLabelView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView)
     fields = ['name']
 
 
-class UpdateLabelView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class UpdateLabelView(  # Noqa: WPS215
+    CustomLoginRequiredMixin, RequestObjectCacheMixin, SuccessMessageMixin, UpdateView,
+):
     """UpdateView of Label."""
 
     model = Label
+    # The counter is changed by tasks concurrently, saving a deferred field
+    # leaves it out of the UPDATE.
+    queryset = Label.objects.defer('tasks_count')
     template_name = 'labels/update.html'
     success_url = reverse_lazy('labels:list')
     success_message = _('Label changed successfully')
@@ -56,4 +92,12 @@ class DeleteLabelView(CustomLoginRequiredMixin, DeleteViewWithRestrictions):
         """
         self.restriction_message = _('Impossible to delete a label because it is in use')
         self.redirect_url_while_restricted = self.success_url
-        return bool(Label.objects.get(pk=kwargs['pk']).tasks.all())
+        return self.get_object().tasks_count > 0
+
+
+class LabelAutocompleteView(AutocompleteView):
+    """Find labels by prefixes of their names for task forms."""
+
+    queryset = Label.objects.only('name')
+    search_fields = ('name',)
+    ordering = ('name',)
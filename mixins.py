@@ -1,6 +1,11 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
+from django.utils.decorators import classonlymethod
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import DeleteView
 
@@ -28,6 +33,48 @@ class CustomLoginRequiredMixin(HandleNoPermissionMixin, LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
+class RequestObjectCacheMixin(object):
+    """Load each object at most once per request.
+
+    Objects are kept in an identity map which lives on the request, so permission
+    mixins and the view itself share one instance. The map starts with the
+    authenticated user, who is already loaded by AuthenticationMiddleware.
+    """
+
+    def get_object(self, queryset=None):
+        """Return the object from the request's identity map or load it.
+
+        Args:
+            queryset: Queryset to load the object from.
+
+        Returns:
+            Model instance.
+        """
+        model = self.model if queryset is None else queryset.model
+        key = (model._meta.label_lower, self.kwargs.get(self.pk_url_kwarg))  # Noqa: WPS437
+        identity_map = get_identity_map(self.request)
+        if key not in identity_map:
+            identity_map[key] = super().get_object(queryset)
+        return identity_map[key]
+
+
+def get_identity_map(request):
+    """Return the request's identity map.
+
+    Args:
+        request: HTTP request.
+
+    Returns:
+        Dict of (model label, pk) -> instance.
+    """
+    if not hasattr(request, 'identity_map'):  # Noqa: WPS421
+        request.identity_map = {}
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            request.identity_map[(user._meta.label_lower, user.pk)] = user  # Noqa: WPS437
+    return request.identity_map
+
+
 class DeleteSuccessMessageMixin(object):
     """Custom LoginRequiredMixin."""
 
@@ -37,7 +84,7 @@ class DeleteSuccessMessageMixin(object):
         return super().delete(request, *args, **kwargs)
 
 
-class DeleteViewWithRestrictions(DeleteSuccessMessageMixin, DeleteView):
+class DeleteViewWithRestrictions(RequestObjectCacheMixin, DeleteSuccessMessageMixin, DeleteView):
     """DeleteView with checking permissions to delete."""
 
     def delete(self, request, *args, **kwargs):
@@ -45,3 +92,66 @@ class DeleteViewWithRestrictions(DeleteSuccessMessageMixin, DeleteView):
         if self.check_permissions_to_delete(request, **kwargs):
             return self.handle_no_permission()
         return super().delete(request, *args, **kwargs)
+
+
+class AsyncViewMixin(object):
+    """Serve a read-only view by a coroutine under ASGI.
+
+    Django 3.2 has no async ORM, so permission checks, queries and rendering
+    run by sync_to_async in the thread of the request, while the event loop
+    keeps serving other connections.
+    """
+
+    http_method_names = ['get', 'head']
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):  # Noqa: N805
+        """Return a coroutine function, so handlers await the view.
+
+        Django 3.2 recognizes async views only by their view function.
+
+        Args:
+            **initkwargs: Attributes of the view.
+
+        Returns:
+            Async view function.
+        """
+        sync_view = super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):  # Noqa: WPS430
+            return await sync_view(request, *args, **kwargs)
+        return update_wrapper(view, sync_view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Run the synchronous view in a worker thread.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            Rendered response.
+        """
+        return await sync_to_async(self._dispatch_and_render)(request, *args, **kwargs)
+
+    def _dispatch_and_render(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)  # Noqa: WPS613
+        if hasattr(response, 'render') and not response.is_rendered:  # Noqa: WPS421
+            response.render()
+        return response
+
+
+def as_read_view(view_class, async_view_class):
+    """Return the view function of a read-only page for the current deployment.
+
+    Args:
+        view_class: Synchronous view class served under WSGI.
+        async_view_class: Its variant for ASYNC_VIEWS mode under ASGI.
+
+    Returns:
+        View function.
+    """
+    if settings.ASYNC_VIEWS:
+        return async_view_class.as_view()
+    return view_class.as_view()
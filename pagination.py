@@ -0,0 +1,374 @@
+"""Keyset (cursor) pagination.
+
+Pages are selected by the values of ordering fields of the nearest row instead
+of OFFSET, and the total number of rows is never counted.
+"""
+import base64
+import datetime
+import json
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q  # Noqa: WPS347
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+DESCENDING = '-'
+FORWARD = 'n'
+BACKWARD = 'p'
+CURSOR_VALUE_TYPES = (str, int, float)
+
+
+class InvalidCursor(Exception):
+    """Cursor can't be decoded or doesn't match ordering."""
+
+
+def encode_cursor(row_values, direction):
+    """Pack ordering values of a row into an opaque token.
+
+    Args:
+        row_values(list): Values of ordering fields.
+        direction(str): FORWARD or BACKWARD.
+
+    Returns:
+        str.
+    """
+    payload = json.dumps([direction, [_dump_value(row_value) for row_value in row_values]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Unpack a token made by encode_cursor.
+
+    Args:
+        cursor(str): Token.
+
+    Returns:
+        Tuple of direction and list of values.
+
+    Raises:
+        InvalidCursor: if the token is malformed.
+    """
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        direction, row_values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if direction not in {FORWARD, BACKWARD} or not isinstance(row_values, list):
+        raise InvalidCursor(cursor)
+    return direction, row_values
+
+
+def _dump_value(row_value):
+    if isinstance(row_value, (datetime.datetime, datetime.date)):
+        return row_value.isoformat()
+    if isinstance(row_value, Decimal):
+        return str(row_value)
+    return row_value
+
+
+class KeysetPage(object):
+    """Page of rows with cursors of neighbouring pages."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        """Save page rows and cursors.
+
+        Args:
+            object_list(list): Rows of the page.
+            next_cursor(str): Cursor of the next page or None.
+            previous_cursor(str): Cursor of the previous page or None.
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        """Iterate over rows of the page.
+
+        Returns:
+            Iterator.
+        """
+        return iter(self.object_list)
+
+    def __len__(self):
+        """Return the number of rows of the page.
+
+        Returns:
+            int.
+        """
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        """Return True if there is a next page.
+
+        Returns:
+            bool.
+        """
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        """Return True if there is a previous page.
+
+        Returns:
+            bool.
+        """
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator(object):  # Noqa: WPS214
+    """Paginate a queryset by unique ordering without OFFSET and COUNT."""
+
+    def __init__(self, queryset, ordering, per_page):
+        """Save queryset and ordering.
+
+        Args:
+            queryset: Queryset to paginate.
+            ordering(tuple): Field names, '-' prefix for descending order.
+                The last field must be unique, for example 'id'.
+            per_page(int): Maximum number of rows in a page.
+        """
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip(DESCENDING) for field in self.ordering]
+        self.per_page = per_page
+
+    def page(self, cursor=None):  # Noqa: WPS210
+        """Return the page which is pointed by the cursor.
+
+        Args:
+            cursor(str): Token from a previous page or None for the first page.
+
+        Returns:
+            KeysetPage.
+        """
+        direction, row_values = self._decode(cursor)
+        rows = list(self.get_page_queryset(cursor))
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == BACKWARD:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, row_values is not None
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1], FORWARD) if has_next and rows else None,
+            previous_cursor=self._cursor(rows[0], BACKWARD) if has_previous and rows else None,
+        )
+
+    def get_page_queryset(self, cursor=None):
+        """Return the query which loads rows of the page and one row more.
+
+        Args:
+            cursor(str): Token from a previous page or None for the first page.
+
+        Returns:
+            Sliced queryset.
+        """
+        direction, row_values = self._decode(cursor)
+        queryset = self.queryset
+        ordering = self.ordering
+        if row_values is not None:
+            queryset = queryset.filter(self._seek(row_values, reverse=direction == BACKWARD))
+        if direction == BACKWARD:
+            ordering = [_reverse(field) for field in ordering]
+        return queryset.order_by(*ordering)[:self.per_page + 1]
+
+    def _decode(self, cursor):
+        """Decode the cursor and check that it matches the ordering.
+
+        Values are converted by ordering fields, so a forged cursor is rejected
+        here instead of failing in the query.
+
+        Args:
+            cursor(str): Token or None.
+
+        Returns:
+            Tuple of direction and list of values or None.
+
+        Raises:
+            InvalidCursor: if the cursor doesn't match the ordering.
+        """
+        if not cursor:
+            return FORWARD, None
+        direction, row_values = decode_cursor(cursor)
+        if len(row_values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            return direction, [
+                self._to_python(name, row_value)
+                for name, row_value in zip(self.fields, row_values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor(cursor)
+
+    def _to_python(self, name, row_value):
+        if row_value is None or not isinstance(row_value, CURSOR_VALUE_TYPES):
+            raise ValueError(row_value)
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field.to_python(row_value)
+        return self.queryset.model._meta.get_field(name).to_python(row_value)  # Noqa: WPS437
+
+    def _cursor(self, row, direction):
+        return encode_cursor([_get_value(row, field) for field in self.fields], direction)
+
+    def _seek(self, row_values, reverse):  # Noqa: WPS210
+        """Build condition `(a, b, ...) > (x, y, ...)` respecting field directions.
+
+        The expanded condition is prefixed by a plain range on the first field,
+        so the database can seek an index instead of checking every row.
+
+        Args:
+            row_values(list): Values of ordering fields of the nearest row.
+            reverse(bool): Seek rows before the nearest row instead of after.
+
+        Returns:
+            Q.
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for field, row_value in zip(self.ordering, row_values):
+            name = field.lstrip(DESCENDING)
+            lookup = '{0}__{1}'.format(name, 'gt' if self._is_after(field, reverse) else 'lt')
+            condition |= equal_prefix & Q(**{lookup: row_value})
+            equal_prefix &= Q(**{name: row_value})
+        first_field = self.ordering[0]
+        range_lookup = '{0}__{1}'.format(
+            self.fields[0], 'gte' if self._is_after(first_field, reverse) else 'lte',
+        )
+        return Q(**{range_lookup: row_values[0]}) & condition
+
+    def _is_after(self, field, reverse):
+        return field.startswith(DESCENDING) == reverse
+
+
+def _reverse(field):
+    if field.startswith(DESCENDING):
+        return field[1:]
+    return '{0}{1}'.format(DESCENDING, field)
+
+
+def _get_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+class KeysetPaginationMixin(object):
+    """Paginate ListView's object_list with KeysetPaginator."""
+
+    keyset_ordering = ('created_at', 'id')
+    page_size = 50
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_ordering(self):  # Noqa: WPS615
+        """Return ordering which pages are built by.
+
+        Returns:
+            tuple.
+        """
+        return self.keyset_ordering
+
+    def get_context_data(self, **kwargs):
+        """Replace object_list by the requested page.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+
+        Raises:
+            Http404: if the cursor is invalid.
+        """
+        queryset = kwargs.pop('object_list', self.object_list)
+        paginator = KeysetPaginator(queryset, self.get_keyset_ordering(), self.page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid page'))
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context.update({
+            'keyset_page': page,
+            'next_page_url': self._page_url(page.next_cursor),
+            'previous_page_url': self._page_url(page.previous_cursor),
+        })
+        return context
+
+    def _page_url(self, cursor):
+        return page_url(self.request, cursor, self.cursor_kwarg)
+
+
+def page_url(request, cursor, cursor_kwarg='cursor'):
+    """Return the query string of the current URL which points to another page.
+
+    Args:
+        request: HTTP request.
+        cursor(str): Cursor of the page or None.
+        cursor_kwarg(str): GET parameter of the cursor.
+
+    Returns:
+        str or None if there is no page.
+    """
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query[cursor_kwarg] = cursor
+    return '?{0}'.format(query.urlencode())
+
+
+class SortedKeysetPaginationMixin(KeysetPaginationMixin):
+    """Paginate ListView's object_list in the order chosen by a GET parameter.
+
+    Orderings are declared per sort key, a key prefixed by '-' is the reversed
+    ordering. Unknown keys fall back to default_sort.
+    """
+
+    sort_orderings = {}
+    default_sort = None
+    sort_kwarg = 'sort'
+
+    def get_sort(self):
+        """Return the requested sort key.
+
+        Returns:
+            str.
+        """
+        sort = self.request.GET.get(self.sort_kwarg)
+        return sort if sort in self.sort_orderings else self.default_sort
+
+    def get_keyset_ordering(self):
+        """Return ordering of the requested sort key.
+
+        Returns:
+            tuple.
+        """
+        return self.sort_orderings[self.get_sort()]
+
+    def get_context_data(self, **kwargs):
+        """Add links which sort the list by each key.
+
+        A link of the current key reverses the order. Links start from the
+        first page, because cursors belong to an ordering.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        current_sort = self.get_sort()
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        sort_urls = {}
+        for sort in self.sort_orderings:
+            if sort.startswith(DESCENDING):
+                continue
+            query[self.sort_kwarg] = _reverse(sort) if sort == current_sort else sort
+            sort_urls[sort] = '?{0}'.format(query.urlencode())
+        context.update({'current_sort': current_sort, 'sort_urls': sort_urls})
+        return context
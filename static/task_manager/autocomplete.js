@@ -0,0 +1,29 @@
+// Load options of selects with data-autocomplete-url while a user types.
+$(function () {
+    $('select[data-autocomplete-url]').each(function () {
+        var select = $(this);
+        var search = $('<input type="search" class="form-control mb-1">');
+        var timer = null;
+        search.attr('placeholder', select.attr('title') || '');
+        select.before(search);
+
+        function load() {
+            $.getJSON(select.data('autocomplete-url'), {q: search.val()}, function (data) {
+                select.find('option:not(:selected)').filter(function () {
+                    return this.value !== '';
+                }).remove();
+                $.each(data.results, function (index, result) {
+                    if (!select.find('option[value="' + result.id + '"]').length) {
+                        select.append($('<option>').val(result.id).text(result.text));
+                    }
+                });
+            });
+        }
+
+        search.on('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(load, 250);
+        });
+        select.one('focus', load);
+    });
+});
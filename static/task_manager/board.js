@@ -0,0 +1,10 @@
+// Append the next part of a board column in place of its "load more" link.
+$(function () {
+    $(document).on('click', 'a[data-board-more]', function (event) {
+        event.preventDefault();
+        var link = $(this);
+        $.get(link.attr('href'), function (cards) {
+            link.replaceWith(cards);
+        });
+    });
+});
@@ -0,0 +1,22 @@
+// Patch rows of the task list by events of the feed in data-events-url.
+$(function () {
+    var rows = $('tbody[data-events-url]');
+    if (!rows.length || !window.EventSource) {
+        return;
+    }
+    var source = new EventSource(rows.data('events-url'));
+    source.addEventListener('task', function (event) {
+        var task = JSON.parse(event.data);
+        var row = rows.children('tr[data-task-id="' + task.id + '"]');
+        if (task.html === null) {
+            row.remove();
+        } else if (row.length) {
+            var checked = row.find('input[type="checkbox"]').prop('checked');
+            var newRow = $(task.html);
+            newRow.find('input[type="checkbox"]').prop('checked', checked);
+            row.replaceWith(newRow);
+        } else if (task.created && rows.data('append-created')) {
+            rows.append(task.html);
+        }
+    });
+});
@@ -0,0 +1,23 @@
+from autocomplete import create_prefix_indexes, drop_prefix_indexes
+from django.db import migrations
+
+COLUMNS = ['name']
+
+
+def create_indexes(apps, schema_editor):
+    create_prefix_indexes(schema_editor, 'statuses_status', COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    drop_prefix_indexes(schema_editor, 'statuses_status', COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0002_status_tasks_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
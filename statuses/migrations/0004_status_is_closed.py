@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:05
+
+from autocomplete import create_prefix_indexes, drop_prefix_indexes
+from django.db import migrations, models
+
+COLUMNS = ['name']
+
+
+def restore_indexes(apps, schema_editor):
+    drop_prefix_indexes(schema_editor, 'statuses_status', COLUMNS)
+    create_prefix_indexes(schema_editor, 'statuses_status', COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0003_status_name_prefix_indexes'),
+    ]
+
+    # SQLite rebuilds statuses_status to add the column and drops its prefix index.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_indexes),
+        migrations.AddField(
+            model_name='status',
+            name='is_closed',
+            field=models.BooleanField(default=False, help_text='Tasks in this status are not counted as open.', verbose_name='Closes tasks'),
+        ),
+        migrations.RunPython(restore_indexes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0004_status_is_closed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='status',
+            index=models.Index(fields=['tasks_count', 'id'], name='status_tasks_count_idx'),
+        ),
+    ]
@@ -5,10 +5,20 @@ from django.utils.translation import gettext_lazy as _
 class Status(models.Model):
     name = models.CharField(max_length=100, unique=True, blank=False, verbose_name=_('Name'))
     created_at = models.DateTimeField(auto_now_add=True)
+    tasks_count = models.PositiveIntegerField(default=0, editable=False)
+    is_closed = models.BooleanField(
+        default=False,
+        verbose_name=_('Closes tasks'),
+        help_text=_('Tasks in this status are not counted as open.'),
+    )
 
     class Meta(object):
         verbose_name = _('Status')
         verbose_name_plural = _('Statuses')
+        # Lists are sorted by usage and paginated by keyset.
+        indexes = [
+            models.Index(fields=['tasks_count', 'id'], name='status_tasks_count_idx'),
+        ]
 
     def __str__(self):
         return self.name
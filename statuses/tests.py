@@ -1,6 +1,10 @@
+from autocomplete import prefix_search
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from statuses.models import Status
+from statuses.views import StatusAutocompleteView
 from tasks.models import Task
 from users.models import User
 
@@ -79,6 +83,18 @@ class StatusesTests(TestCase):
         self.assertContains(response, 'Статус успешно изменён')
         self.assertEqual(Status.objects.get(pk=self.status_completed.id), self.status_completed)
 
+    def test_updating_keeps_counter(self):
+        """Checking that saving the form doesn't write the counter of tasks."""
+        self.client.force_login(self.user)
+        update_url = reverse('statuses:update', args=(self.status_completed.id, ))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(update_url, {'name': 'Готово', 'is_closed': True})
+        updates = [
+            query['sql'] for query in queries if query['sql'].startswith('UPDATE "statuses_status"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('tasks_count', updates[0])
+
     def test_status_updating_without_login(self):
         """Checking of permissions to update."""
         update_url = reverse('statuses:update', args=(self.status_completed.id, ))
@@ -141,3 +157,37 @@ class StatusesTests(TestCase):
             fetch_redirect_response=True,
         )
         self.assertContains(response, 'Невозможно удалить статус, потому что он используется')
+
+    def test_autocomplete(self):
+        """Checking of search of statuses by a prefix of the name."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('statuses:autocomplete'), {'q': 'в раб'})
+        self.assertEqual(
+            response.json(),
+            {'results': [{'id': self.status_in_progress.id, 'text': 'в работе'}]},
+        )
+
+    def test_list_sorted_by_name_and_usage(self):
+        """Checking that statuses are sorted by the chosen column."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('statuses:list'), {'sort': '-name'})
+        self.assertEqual(
+            list(response.context['statuses']), [self.status_completed, self.status_in_progress],
+        )
+        self.assertEqual(response.context['sort_urls']['name'], '?sort=name')
+        Status.objects.filter(pk=self.status_in_progress.pk).update(tasks_count=5)
+        response = self.client.get(reverse('statuses:list'), {'sort': '-tasks'})
+        self.assertEqual(
+            list(response.context['statuses']), [self.status_in_progress, self.status_completed],
+        )
+
+    def test_autocomplete_uses_indexes(self):
+        """Checking that the prefix index survives migrations which rebuild the table."""
+        Status.objects.bulk_create([
+            Status(name='Status {0}'.format(number)) for number in range(500)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        statuses = prefix_search(Status.objects.all(), StatusAutocompleteView.search_fields, 'st')
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('SCAN', statuses.explain())
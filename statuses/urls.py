@@ -1,10 +1,12 @@
 from django.urls import path
+from mixins import as_read_view
 from statuses import views
 
 app_name = 'statuses'
 urlpatterns = [
-    path('', views.StatusListView.as_view(), name='list'),
+    path('', as_read_view(views.StatusListView, views.AsyncStatusListView), name='list'),
     path('create/', views.CreateStatusView.as_view(), name='create'),
     path('<int:pk>/update/', views.UpdateStatusView.as_view(), name='update'),
     path('<int:pk>/delete/', views.DeleteStatusView.as_view(), name='delete'),
+    path('autocomplete/', views.StatusAutocompleteView.as_view(), name='autocomplete'),
 ]
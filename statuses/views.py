@@ -1,18 +1,49 @@
+from autocomplete import AutocompleteView
+from caching.mixins import ConditionalPageMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.edit import CreateView, UpdateView
 from django.views.generic.list import ListView
-from mixins import CustomLoginRequiredMixin, DeleteViewWithRestrictions
+from mixins import (
+    AsyncViewMixin,
+    CustomLoginRequiredMixin,
+    DeleteViewWithRestrictions,
+    RequestObjectCacheMixin,
+)
+from pagination import SortedKeysetPaginationMixin
 from statuses.models import Status
+from tasks.models import Task
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(  # Noqa: WPS215
+    CustomLoginRequiredMixin,
+    ConditionalPageMixin,
+    SortedKeysetPaginationMixin,
+    ListView,
+):
     """List view of Statuses."""
 
     model = Status
+    # Counters of statuses change with tasks.
+    versioned_models = (Status, Task)
     template_name = 'statuses/list.html'
     context_object_name = 'statuses'
+    # Each ordering follows an index: the primary key, the unique name or
+    # status_tasks_count_idx, so a page costs the same for any number of statuses.
+    sort_orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'name': ('name', 'id'),
+        '-name': ('-name', '-id'),
+        'tasks': ('tasks_count', 'id'),
+        '-tasks': ('-tasks_count', '-id'),
+    }
+    default_sort = 'id'
+
+
+class AsyncStatusListView(AsyncViewMixin, StatusListView):
+    """List view of Statuses served by a coroutine."""
 
 
 class CreateStatusView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
@@ -22,17 +53,22 @@ class CreateStatusView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView
     template_name = 'statuses/create.html'
     success_url = reverse_lazy('statuses:list')
     success_message = _('Status created successfully')
-    fields = ['name']
+    fields = ['name', 'is_closed']
 
 
-class UpdateStatusView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class UpdateStatusView(  # Noqa: WPS215
+    CustomLoginRequiredMixin, RequestObjectCacheMixin, SuccessMessageMixin, UpdateView,
+):
     """Update status view."""
 
     model = Status
+    # The counter is changed by tasks concurrently, saving a deferred field
+    # leaves it out of the UPDATE.
+    queryset = Status.objects.defer('tasks_count')
     template_name = 'statuses/update.html'
     success_url = reverse_lazy('statuses:list')
     success_message = _('Status changed successfully')
-    fields = ['name']
+    fields = ['name', 'is_closed']
 
 
 class DeleteStatusView(CustomLoginRequiredMixin, DeleteViewWithRestrictions):
@@ -55,4 +91,12 @@ class DeleteStatusView(CustomLoginRequiredMixin, DeleteViewWithRestrictions):
         """
         self.restriction_message = _('Impossible to delete a status because it is in use')
         self.redirect_url_while_restricted = self.success_url
-        return bool(Status.objects.get(pk=kwargs['pk']).tasks.all())
+        return self.get_object().tasks_count > 0
+
+
+class StatusAutocompleteView(AutocompleteView):
+    """Find statuses by prefixes of their names for task forms."""
+
+    queryset = Status.objects.only('name')
+    search_fields = ('name',)
+    ordering = ('name',)
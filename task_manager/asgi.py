@@ -9,8 +9,24 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from asgiref.sync import ThreadSensitiveContext
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """Handle each request with its own thread for synchronous code.
+
+    Django 3.2 runs synchronous middleware and views of all requests in one
+    shared thread, so concurrent requests wait for each other.
+
+    Args:
+        scope: ASGI connection scope.
+        receive: ASGI receive callable.
+        send: ASGI send callable.
+    """
+    async with ThreadSensitiveContext():
+        await django_application(scope, receive, send)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 
 import ast
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
@@ -39,6 +40,19 @@ DEBUG = ast.literal_eval(os.environ.get('DEBUG'))
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0', '.herokuapp.com']
 
+# Route read-only pages to their async variants, for ASGI deployments. Off by
+# default and not used by the Procfile: the variants run the same sync views by
+# sync_to_async, and benchmark_views measures them slower than WSGI. An ASGI
+# server isn't a dependency of the project and is installed separately.
+ASYNC_VIEWS = ast.literal_eval(os.environ.get('ASYNC_VIEWS', 'False'))
+
+# Seconds a feed of task events stays open. An open feed occupies a sync
+# worker, so by default the feed answers with pending events at once and
+# browsers poll it. Hold feeds only where workers serve many connections, such
+# as gunicorn's gevent workers. Django 3.2 iterates streaming responses inside
+# the event loop under ASGI, so feeds are never held there.
+TASK_EVENTS_HOLD = 0 if ASYNC_VIEWS else int(os.environ.get('TASK_EVENTS_HOLD', '0'))
+
 
 # Application definition
 
@@ -47,6 +61,9 @@ INSTALLED_APPS = [
     'tasks.apps.TasksConfig',
     'statuses.apps.StatusesConfig',
     'users.apps.UsersConfig',
+    'caching.apps.CachingConfig',
+    'changes.apps.ChangesConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -72,12 +89,20 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'task_manager.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Compiled templates are kept in memory unless templates are edited in development.
+if not DEBUG:
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -102,6 +127,39 @@ DATABASES = {
 DATABASES['default']['OPTIONS'].pop('sslmode')
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # {% cache %} fragments are keyed by versions and never go stale, the own
+    # alias keeps rows of long lists from evicting reference data.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # Sessions and users of sessions are shared by all processes of the site,
+    # so they need a cache which all of them read, the file-based one by default.
+    'auth': {
+        'BACKEND': os.environ.get(
+            'AUTH_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'AUTH_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'task_manager_auth'),
+        ),
+    },
+}
+
+# Sessions and users are read from the auth cache and written through to the database.
+CACHED_AUTH = ast.literal_eval(os.environ.get('CACHED_AUTH', 'True'))
+SESSION_CACHE_ALIAS = 'auth'
+if CACHED_AUTH:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTHENTICATION_BACKENDS = ['caching.auth.CachedModelBackend']
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -144,6 +202,9 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Covering indexes of tasks are used by PostgreSQL and ignored by SQLite.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
 
@@ -1,7 +1,23 @@
+from caching.pages import AnonymousPageCacheMixin
 from django.views.generic import TemplateView
+from tasks import dashboard
 
 
-class HomeView(TemplateView):
-    """Home page view."""
+class HomeView(AnonymousPageCacheMixin, TemplateView):
+    """Home page view with the dashboard of open tasks for signed in users."""
 
     template_name = 'task_manager/home.html'
+
+    def get_context_data(self, **kwargs):
+        """Add numbers of open tasks read from the rollup.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = dashboard.load_dashboard()
+        return context
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):  # Noqa D101
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        """Connect signals which keep usage counters."""
+        from tasks import signals  # Noqa: F401, WPS433
@@ -0,0 +1,143 @@
+"""Board of tasks in columns by status.
+
+The first tasks of every column are selected by one ROW_NUMBER() query,
+numbers of tasks per column by one grouped query. Each column loads further
+tasks by its own keyset pages in the same order.
+"""
+from django.db.models import Count, F, Window  # Noqa: WPS347
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+from pagination import FORWARD, KeysetPaginator, encode_cursor
+from statuses.models import Status
+from tasks.loading import TASK_LIST
+
+COLUMN_SIZE = 20
+ORDERING = ('created_at', 'id')
+# Value of the column parameter for tasks without a status.
+NO_STATUS = 'none'
+FIRST_IDS_SQL = 'SELECT task_id FROM ({0}) ranked WHERE position <= %s'  # Noqa: WPS323
+
+
+def build_columns(tasks, limit=COLUMN_SIZE):  # Noqa: WPS210
+    """Return columns of all statuses with their first tasks.
+
+    The column of tasks without a status is shown only if there are such tasks.
+
+    Args:
+        tasks: Queryset of filtered tasks.
+        limit(int): Number of tasks which are loaded into each column.
+
+    Returns:
+        List of dicts with status, key, tasks_count, tasks and cursor, the
+        cursor of the next part of the column or None.
+    """
+    status_counts = tasks.order_by().values_list('status_id').annotate(Count('pk'))
+    counts = dict(status_counts)
+    tasks_by_status = {}
+    for task in top_tasks(tasks, limit):
+        tasks_by_status.setdefault(task.status_id, []).append(task)
+    statuses = list(Status.objects.order_by('pk'))
+    if counts.get(None):
+        statuses.append(None)
+    columns = []
+    for status in statuses:
+        status_id = getattr(status, 'pk', None)
+        column_tasks = tasks_by_status.get(status_id, [])
+        tasks_count = counts.get(status_id, 0)
+        has_more = len(column_tasks) < tasks_count
+        columns.append({
+            'status': status,
+            'key': NO_STATUS if status is None else status_id,
+            'tasks_count': tasks_count,
+            'tasks': column_tasks,
+            'cursor': _next_cursor(column_tasks[-1]) if has_more and column_tasks else None,
+        })
+    return columns
+
+
+def top_tasks(tasks, limit):
+    """Return the first tasks of each status by one query.
+
+    Rows are numbered inside each status by ROW_NUMBER() in a subquery, the
+    outer query loads rows with small numbers and their relations.
+
+    Args:
+        tasks: Queryset of filtered tasks.
+        limit(int): Number of tasks per status.
+
+    Returns:
+        Queryset ordered by status and ORDERING.
+    """
+    ranked = tasks.order_by().annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('status_id')],
+            order_by=[F(field).asc() for field in ORDERING],
+        ),
+    ).values('position', task_id=F('pk'))
+    ranked_sql, ranked_params = ranked.query.sql_with_params()
+    # The subquery is compiled by Django, values go as parameters.
+    first_ids = RawSQL(  # Noqa: S611
+        FIRST_IDS_SQL.format(ranked_sql), (*ranked_params, limit),
+    )
+    first_tasks = tasks.model.objects.filter(pk__in=first_ids)
+    return TASK_LIST.apply(first_tasks).order_by('status_id', *ORDERING)
+
+
+def column_tasks(tasks, column):
+    """Return tasks of one column.
+
+    Args:
+        tasks: Queryset of filtered tasks.
+        column(str): Status id or NO_STATUS.
+
+    Returns:
+        Queryset.
+
+    Raises:
+        ValueError: if the column isn't a status id.
+    """
+    if column == NO_STATUS:
+        return tasks.filter(status__isnull=True)
+    if not column.isdigit():
+        raise ValueError(column)
+    return tasks.filter(status_id=int(column))
+
+
+def column_paginator(tasks, limit=COLUMN_SIZE):
+    """Return the paginator of further parts of a column.
+
+    Args:
+        tasks: Queryset made by column_tasks.
+        limit(int): Number of tasks per part.
+
+    Returns:
+        KeysetPaginator.
+    """
+    return KeysetPaginator(TASK_LIST.apply(tasks), ORDERING, limit)
+
+
+def column_url(request, path, column, cursor):
+    """Return the URL of the next part of a board column.
+
+    Filter parameters of the request are kept.
+
+    Args:
+        request: HTTP request.
+        path(str): Path of TaskBoardColumnView.
+        column: Key of the column.
+        cursor(str): Cursor of the part or None.
+
+    Returns:
+        str or None if there are no more tasks.
+    """
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['column'] = column
+    query['cursor'] = cursor
+    return '{0}?{1}'.format(path, query.urlencode())
+
+
+def _next_cursor(task):
+    return encode_cursor([getattr(task, field) for field in ORDERING], FORWARD)
@@ -0,0 +1,193 @@
+"""Changes of many tasks by a constant number of queries."""
+from caching import versions
+from changes import log
+from changes.models import Change
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
+from labels.models import Label
+from statuses.models import Status
+from tasks import counters, dashboard, history
+from tasks.models import StatusTransition, Task
+from users.models import User
+
+TaskLabels = Task.labels.through
+
+CHANGE_STATUS = 'status'
+CHANGE_EXECUTOR = 'executor'
+ADD_LABEL = 'add_label'
+REMOVE_LABEL = 'remove_label'
+DELETE = 'delete'
+
+
+def change_status(task_ids, status):  # Noqa: WPS210
+    """Move tasks to the status.
+
+    Args:
+        task_ids: Ids of tasks.
+        status: New Status.
+
+    Returns:
+        Number of changed tasks.
+    """
+    tasks = Task.objects.filter(pk__in=task_ids).exclude(status=status)
+    with transaction.atomic():
+        groups = counters.count_groups(tasks, 'status_id')
+        previous_statuses = list(tasks.values_list('pk', 'status_id'))
+        changed_ids = [task_id for task_id, _ in previous_statuses]
+        changed_at = timezone.now()
+        dashboard.shift_tasks(Task.objects.filter(pk__in=changed_ids), -1)  # Noqa: WPS204
+        changed = Task.objects.filter(pk__in=changed_ids).update(
+            status=status, updated_at=changed_at,
+        )
+        dashboard.shift_tasks(Task.objects.filter(pk__in=changed_ids), 1)
+        StatusTransition.objects.bulk_create([
+            StatusTransition(
+                task_id=task_id,
+                from_status_id=from_status_id,
+                to_status=status,
+                created_at=changed_at,
+            )
+            for task_id, from_status_id in previous_statuses
+        ])
+        log.record(Task, changed_ids, Change.UPDATE)
+        counters.shift_groups(Status, 'tasks_count', groups, -1)
+        counters.shift(Status, 'tasks_count', [status.pk], changed)
+    return changed
+
+
+def change_executor(task_ids, executor):
+    """Assign tasks to the executor.
+
+    Args:
+        task_ids: Ids of tasks.
+        executor: New executor, None to unassign.
+
+    Returns:
+        Number of changed tasks.
+    """
+    tasks = Task.objects.filter(pk__in=task_ids)
+    if executor is None:
+        tasks = tasks.exclude(executor__isnull=True)
+    else:
+        tasks = tasks.exclude(executor=executor)
+    with transaction.atomic():
+        groups = counters.count_groups(tasks, 'executor_id')
+        changed_ids = list(tasks.values_list('pk', flat=True))
+        dashboard.shift_tasks(Task.objects.filter(pk__in=changed_ids), -1)
+        changed = Task.objects.filter(pk__in=changed_ids).update(
+            executor=executor, updated_at=timezone.now(),
+        )
+        dashboard.shift_tasks(Task.objects.filter(pk__in=changed_ids), 1)
+        log.record(Task, changed_ids, Change.UPDATE)
+        counters.shift_groups(User, 'assigned_tasks_count', groups, -1)
+        counters.shift(User, 'assigned_tasks_count', [getattr(executor, 'pk', None)], changed)
+    return changed
+
+
+def add_label(task_ids, label):
+    """Mark tasks by the label.
+
+    Args:
+        task_ids: Ids of tasks.
+        label: Label.
+
+    Returns:
+        Number of changed tasks.
+    """
+    with transaction.atomic():
+        existing_ids = TaskLabels.objects.filter(
+            label=label, task_id__in=task_ids,
+        ).values_list('task_id', flat=True)
+        missing_ids = Task.objects.filter(pk__in=task_ids).exclude(pk__in=existing_ids)
+        links = TaskLabels.objects.bulk_create([
+            TaskLabels(task_id=task_id, label=label)
+            for task_id in missing_ids.values_list('pk', flat=True)
+        ])
+        counters.shift(Label, 'tasks_count', [label.pk], len(links))
+        added_ids = [link.task_id for link in links]
+        dashboard.shift_links(TaskLabels.objects.filter(label=label, task_id__in=added_ids), 1)
+        Task.touch(added_ids)
+    return len(links)
+
+
+def remove_label(task_ids, label):
+    """Remove the label from tasks.
+
+    Args:
+        task_ids: Ids of tasks.
+        label: Label.
+
+    Returns:
+        Number of changed tasks.
+    """
+    links = TaskLabels.objects.filter(label=label, task_id__in=task_ids)
+    with transaction.atomic():
+        Task.touch(list(links.values_list('task_id', flat=True)))
+        dashboard.shift_links(links, -1)
+        removed, _ = links.delete()
+        counters.shift(Label, 'tasks_count', [label.pk], -removed)
+    return removed
+
+
+def delete_tasks(task_ids, user):  # Noqa: WPS210
+    """Delete tasks if the user is the author of all of them.
+
+    Args:
+        task_ids: Ids of tasks.
+        user: User who deletes tasks.
+
+    Returns:
+        Number of deleted tasks.
+
+    Raises:
+        PermissionDenied: if any task has another author.
+    """
+    tasks = Task.objects.filter(pk__in=task_ids)
+    with transaction.atomic():
+        if tasks.exclude(author=user).exists():
+            raise PermissionDenied
+        for attname, (model, counter) in counters.FOREIGN_KEY_COUNTERS.items():
+            counters.shift_groups(model, counter, counters.count_groups(tasks, attname), -1)
+        label_groups = counters.count_groups(
+            TaskLabels.objects.filter(task_id__in=task_ids), 'label_id',
+        )
+        counters.shift_groups(Label, 'tasks_count', label_groups, -1)
+        dashboard.shift_tasks(tasks, -1)
+        deleted_ids = list(tasks.values_list('pk', flat=True))
+        log.record(Task, deleted_ids, Change.DELETE)
+        with counters.handled_in_bulk():
+            _, deleted = tasks.delete()
+    return deleted.get(Task._meta.label, 0)  # Noqa: WPS437
+
+
+def apply_action(action, task_ids, user, argument=None):
+    """Apply the action to tasks.
+
+    Changed tasks get revisions of their history, like changes made by the form.
+
+    Args:
+        action(str): One of the actions.
+        task_ids: Ids of tasks.
+        user: User who applies the action.
+        argument: Status, executor or label which the action needs.
+
+    Returns:
+        Number of changed tasks.
+    """
+    handlers = {
+        CHANGE_STATUS: change_status,
+        CHANGE_EXECUTOR: change_executor,
+        ADD_LABEL: add_label,
+        REMOVE_LABEL: remove_label,
+    }
+    with transaction.atomic():
+        if action == DELETE:
+            changed = delete_tasks(task_ids, user)
+        else:
+            previous_values = history.load_values(task_ids)
+            changed = handlers[action](task_ids, argument)
+            history.record_bulk_changes(previous_values, user)
+        if changed:
+            versions.bump(versions.table_name(Task))
+    return changed
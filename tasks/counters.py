@@ -0,0 +1,154 @@
+"""Usage counters of statuses, labels and users which are kept by task changes."""
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value  # Noqa: WPS347
+from django.db.models.functions import Coalesce
+from labels.models import Label
+from statuses.models import Status
+from tasks.models import Task
+from users.models import User
+
+# Task's foreign key attname -> model and its counter field.
+FOREIGN_KEY_COUNTERS = {  # Noqa: WPS407
+    'status_id': (Status, 'tasks_count'),
+    'author_id': (User, 'created_tasks_count'),
+    'executor_id': (User, 'assigned_tasks_count'),
+}
+
+_state = Local()
+
+
+@contextmanager
+def handled_in_bulk():
+    """Make task signals skip counters while a bulk operation counts them itself.
+
+    Yields:
+        None.
+    """
+    previous = is_handled_in_bulk()
+    _state.in_bulk = True
+    try:
+        yield
+    finally:
+        _state.in_bulk = previous
+
+
+def is_handled_in_bulk():
+    """Return True inside handled_in_bulk().
+
+    Returns:
+        bool.
+    """
+    return getattr(_state, 'in_bulk', False)
+
+
+def shift(model, counter, pks, delta):
+    """Add delta to the counter of every object.
+
+    Args:
+        model: Model class.
+        counter(str): Counter field.
+        pks: Primary keys of objects, may contain None.
+        delta(int): Value to add.
+    """
+    pks = [pk for pk in pks if pk is not None]
+    if pks and delta:
+        shifted = {counter: F(counter) + delta}
+        model.objects.filter(pk__in=pks).update(**shifted)
+
+
+def shift_groups(model, counter, groups, sign):
+    """Add grouped numbers of tasks to counters.
+
+    Args:
+        model: Model class.
+        counter(str): Counter field.
+        groups: Pairs of primary key and number of tasks.
+        sign(int): 1 to increase counters, -1 to decrease.
+    """
+    for pk, tasks_count in groups:
+        shift(model, counter, [pk], sign * tasks_count)
+
+
+def count_groups(queryset, attname):
+    """Return numbers of rows grouped by the column.
+
+    Args:
+        queryset: Queryset of tasks or their labels.
+        attname(str): Column to group by.
+
+    Returns:
+        List of pairs of value and number of rows.
+    """
+    return list(queryset.order_by().values_list(attname).annotate(Count('pk')))
+
+
+def count_saved_task(task, previous_values):
+    """Move foreign key counters from previous values of the task to current ones.
+
+    Args:
+        task: Saved Task.
+        previous_values(dict): Foreign key attnames and their values before saving,
+            empty for a created task.
+    """
+    for attname, (model, counter) in FOREIGN_KEY_COUNTERS.items():
+        current = getattr(task, attname)
+        previous = previous_values.get(attname)
+        if current != previous:
+            shift(model, counter, [previous], -1)
+            shift(model, counter, [current], 1)
+
+
+def count_deleted_task(task, label_ids):
+    """Decrease counters of objects which the deleted task referenced.
+
+    Args:
+        task: Deleted Task.
+        label_ids: Labels of the task.
+    """
+    for attname, (model, counter) in FOREIGN_KEY_COUNTERS.items():
+        shift(model, counter, [getattr(task, attname)], -1)
+    shift(Label, 'tasks_count', label_ids, -1)
+
+
+def _count_subquery(lookup):
+    tasks = Task.objects.filter(**{lookup: OuterRef('pk')}).order_by()
+    grouped = tasks.values(lookup).annotate(tasks_count=Count('id'))
+    counted = grouped.values('tasks_count')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def _recounted(model, pks):
+    recounted = model.objects.all()
+    return recounted if pks is None else recounted.filter(pk__in=pks)
+
+
+def recount_statuses(pks=None):
+    """Recalculate counters of statuses by tasks.
+
+    Args:
+        pks: Primary keys of statuses, None for all.
+    """
+    _recounted(Status, pks).update(tasks_count=_count_subquery('status'))
+
+
+def recount_labels(pks=None):
+    """Recalculate counters of labels by tasks.
+
+    Args:
+        pks: Primary keys of labels, None for all.
+    """
+    _recounted(Label, pks).update(tasks_count=_count_subquery('labels'))
+
+
+def recount_users(pks=None):
+    """Recalculate counters of users by tasks.
+
+    Args:
+        pks: Primary keys of users, None for all.
+    """
+    _recounted(User, pks).update(
+        created_tasks_count=_count_subquery('author'),
+        assigned_tasks_count=_count_subquery('executor'),
+    )
@@ -0,0 +1,201 @@
+"""Open tasks per status, executor and label served from TaskRollup.
+
+Task changes add +1/-1 deltas to rollup rows instead of grouping the task
+table on every read. A delta is applied by an upsert, so concurrent changes
+of one row are summed by the database.
+"""
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+from labels.models import Label
+from statuses.models import Status
+from tasks.models import Task, TaskRollup
+from users.models import User
+
+TaskLabels = Task.labels.through
+NOT_SET = TaskRollup.NOT_SET
+
+UPSERT_SQL = """
+    INSERT INTO tasks_taskrollup (dimension, object_id, status_id, tasks_count)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (dimension, object_id, status_id)
+    DO UPDATE SET tasks_count = tasks_taskrollup.tasks_count + excluded.tasks_count
+"""  # Noqa: WPS323
+
+
+def task_keys(status_id, executor_id, label_ids):
+    """Return keys of rollup rows which a task is counted in.
+
+    Args:
+        status_id: Status of the task or None.
+        executor_id: Executor of the task or None.
+        label_ids: Labels of the task.
+
+    Returns:
+        List of tuples of dimension, object id and status id.
+    """
+    status_id = status_id or NOT_SET
+    keys = [(TaskRollup.EXECUTOR, executor_id or NOT_SET, status_id)]
+    keys.extend((TaskRollup.LABEL, label_id, status_id) for label_id in label_ids)
+    return keys
+
+
+def apply_deltas(deltas):
+    """Add deltas to rollup rows by one statement.
+
+    Args:
+        deltas(Counter): Keys made by task_keys and numbers of tasks.
+    """
+    changed = sorted(deltas.items())
+    rows = [(*key, delta) for key, delta in changed if delta]
+    if rows:
+        with connection.cursor() as cursor:
+            cursor.executemany(UPSERT_SQL, rows)
+
+
+def count_task(status_id, executor_id, label_ids, sign):
+    """Add or remove one task.
+
+    Args:
+        status_id: Status of the task or None.
+        executor_id: Executor of the task or None.
+        label_ids: Labels of the task.
+        sign(int): 1 to add the task, -1 to remove it.
+    """
+    apply_deltas(Counter(dict.fromkeys(task_keys(status_id, executor_id, label_ids), sign)))
+
+
+def count_saved_task(task, previous_values):
+    """Move a changed task from rows of its previous status and executor.
+
+    Labels are counted by their own changes. They are moved here only when
+    the status changes, which costs one query of the task's labels.
+
+    Args:
+        task: Saved Task.
+        previous_values(dict): Foreign key attnames and their values before
+            saving, empty for a created task.
+    """
+    label_ids = []
+    previous_status_id = previous_values.get('status_id')
+    if previous_values and previous_status_id != task.status_id:
+        links = TaskLabels.objects.filter(task=task)
+        label_ids = list(links.values_list('label_id', flat=True))
+    current_keys = task_keys(task.status_id, task.executor_id, label_ids)
+    deltas = Counter(dict.fromkeys(current_keys, 1))
+    if previous_values:
+        deltas.subtract(dict.fromkeys(
+            task_keys(previous_status_id, previous_values.get('executor_id'), label_ids), 1,
+        ))
+    apply_deltas(deltas)
+
+
+def shift_tasks(tasks, sign):
+    """Add or remove tasks of the queryset by two grouped queries.
+
+    Args:
+        tasks: Queryset of tasks.
+        sign(int): 1 to add tasks, -1 to remove them.
+    """
+    apply_deltas(_count_tasks(tasks, sign))
+
+
+def shift_links(links, sign):
+    """Add or remove links of tasks to labels by one grouped query.
+
+    Args:
+        links: Queryset of the through model of Task.labels.
+        sign(int): 1 to add links, -1 to remove them.
+    """
+    apply_deltas(_count_links(links, sign))
+
+
+def rebuild():
+    """Recalculate the rollup from tasks.
+
+    Returns:
+        Number of rollup rows.
+    """
+    with transaction.atomic():
+        TaskRollup.objects.all().delete()
+        shift_tasks(Task.objects.all(), 1)
+    return TaskRollup.objects.count()
+
+
+def find_mismatches():
+    """Compare the rollup with numbers of tasks grouped in the task table.
+
+    Returns:
+        List of tuples of a key, the stored and the expected number of tasks.
+    """
+    expected = _count_tasks(Task.objects.all(), 1)
+    stored = Counter(dict(_stored_counts()))
+    return [
+        (key, stored[key], expected[key])
+        for key in sorted(set(expected) | set(stored))
+        if stored[key] != expected[key]
+    ]
+
+
+def load_dashboard():  # Noqa: WPS210
+    """Return open tasks per status, executor and label.
+
+    Reads only the rollup, whose size depends on the numbers of statuses,
+    users and labels, but not tasks.
+
+    Returns:
+        Dict of lists of pairs of a name and a number of tasks, the largest first.
+    """
+    closed = Status.objects.filter(is_closed=True)
+    closed_ids = set(closed.values_list('pk', flat=True))
+    totals = {TaskRollup.EXECUTOR: Counter(), TaskRollup.LABEL: Counter()}
+    per_status = Counter()
+    for (dimension, object_id, status_id), tasks_count in _stored_counts():
+        if status_id in closed_ids:
+            continue
+        totals[dimension][object_id] += tasks_count
+        if dimension == TaskRollup.EXECUTOR:
+            per_status[status_id] += tasks_count
+    return {
+        'statuses': _name_counts(Status, per_status),
+        'executors': _name_counts(User, totals[TaskRollup.EXECUTOR]),
+        'labels': _name_counts(Label, totals[TaskRollup.LABEL]),
+    }
+
+
+def _count_tasks(tasks, sign):
+    executor_groups = tasks.order_by().values_list('status_id', 'executor_id').annotate(Count('pk'))
+    deltas = Counter()
+    for status_id, executor_id, tasks_count in executor_groups:
+        deltas[task_keys(status_id, executor_id, [])[0]] += sign * tasks_count
+    deltas.update(_count_links(TaskLabels.objects.filter(task__in=tasks), sign))
+    return deltas
+
+
+def _count_links(links, sign):
+    label_groups = links.order_by().values_list('task__status_id', 'label_id').annotate(
+        Count('pk'),
+    )
+    deltas = Counter()
+    for status_id, label_id, links_count in label_groups:
+        deltas[(TaskRollup.LABEL, label_id, status_id or NOT_SET)] += sign * links_count
+    return deltas
+
+
+def _stored_counts():
+    rows = TaskRollup.objects.exclude(tasks_count=0).values_list(
+        'dimension', 'object_id', 'status_id', 'tasks_count',
+    )
+    return [(tuple(key), tasks_count) for *key, tasks_count in rows]
+
+
+def _name_counts(model, counts):
+    counts = {object_id: count for object_id, count in counts.items() if count}
+    found = model.objects.in_bulk([object_id for object_id in counts if object_id != NOT_SET])
+    named = [
+        (found.get(object_id, _('Not set')), count)
+        for object_id, count in counts.items()
+    ]
+    return sorted(named, key=lambda pair: (-pair[1], str(pair[0])))  # Noqa: WPS221
@@ -0,0 +1,98 @@
+"""Server-Sent Events about changes of tasks which match a TaskFilter.
+
+The feed follows the change log instead of re-running the list query: each
+poll reads only new changes by the log index, and only changed tasks are
+loaded and rendered. Event ids are ids of the log, so a browser which
+reconnects continues from its Last-Event-ID.
+"""
+import json
+import time
+
+from changes import log
+from changes.models import Change
+from django.template.loader import render_to_string
+from django.utils import translation
+from tasks.loading import TASK_LIST
+from tasks.models import Task
+
+BATCH_SIZE = 100
+POLL_INTERVAL = 1
+RETRY_MS = 3000
+
+
+def format_event(event_id, event_type, payload):
+    """Return an event in the text/event-stream format.
+
+    Args:
+        event_id(int): Id which the browser sends back after reconnecting.
+        event_type(str): Name of the event.
+        payload(dict): Data of the event.
+
+    Returns:
+        str.
+    """
+    return 'id: {0}\nevent: {1}\ndata: {2}\n\n'.format(
+        event_id, event_type, json.dumps(payload, ensure_ascii=False, separators=(',', ':')),
+    )
+
+
+def render_changes(changes, tasks):  # Noqa: WPS210
+    """Return events about tasks of a batch of changes.
+
+    Each task gets one event with its current row, or without a row if it is
+    deleted or doesn't match the filter anymore. All events carry the id of
+    the last change, the batch is sent at once.
+
+    Args:
+        changes(list): Tuples of change id, task id and action.
+        tasks: Filtered queryset of tasks which the page shows.
+
+    Returns:
+        str.
+    """
+    last_id = changes[-1][0]
+    created_ids = {task_id for _, task_id, action in changes if action == Change.CREATE}
+    task_ids = list(dict.fromkeys(task_id for _, task_id, _ in changes))
+    found = TASK_LIST.apply(tasks.filter(pk__in=task_ids))
+    shown = {task.pk: task for task in found}
+    events = []
+    for task_id in task_ids:
+        task = shown.get(task_id)
+        row = None if task is None else render_to_string('tasks/row.html', {'task': task})
+        events.append(format_event(last_id, 'task', {
+            'id': task_id,
+            'created': task_id in created_ids,
+            'html': row and row.strip(),
+        }))
+    return ''.join(events)
+
+
+def iter_events(tasks, after_id, hold, language):
+    """Yield events of changes which follow the id.
+
+    Pending changes are sent at once. Then the log is polled until `hold`
+    seconds pass, comments keep the connection alive meanwhile. After that
+    the stream ends and the browser reconnects in RETRY_MS.
+
+    Args:
+        tasks: Filtered queryset of tasks which the page shows.
+        after_id(int): Id of the last change which the page shows.
+        hold(int): Seconds to wait for new changes.
+        language(str): Language of rendered rows.
+
+    Yields:
+        str.
+    """
+    yield 'retry: {0}\n\n'.format(RETRY_MS)
+    deadline = time.monotonic() + hold
+    while True:
+        changes = log.changes_after(Task, after_id, BATCH_SIZE)
+        if changes:
+            after_id = changes[-1][0]
+            with translation.override(language):
+                yield render_changes(changes, tasks)
+            continue
+        if time.monotonic() >= deadline:
+            return
+        yield ':\n\n'
+        time.sleep(POLL_INTERVAL)
@@ -0,0 +1,138 @@
+"""Streaming export of filtered tasks."""
+import csv
+import json
+import tempfile
+from itertools import islice
+
+from tasks.models import Task
+
+CHUNK_SIZE = 2000
+# Bytes of an export which are kept in memory before it is spooled to disk.
+SPOOL_SIZE = 1024 * 1024
+COLUMNS = ('id', 'name', 'description', 'status', 'author', 'executor', 'labels', 'created_at')
+# Columns which are read from the database in the order of COLUMNS without labels.
+TASK_VALUES = (
+    'id',
+    'name',
+    'description',
+    'status__name',
+    'author__first_name',
+    'author__last_name',
+    'executor__first_name',
+    'executor__last_name',
+    'created_at',
+)
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE):  # Noqa: WPS210
+    """Yield exported tasks as tuples in the order of COLUMNS.
+
+    Tasks are read through a server-side cursor where the database supports it.
+    Names of labels are loaded by one query per chunk of tasks.
+
+    Args:
+        queryset: Queryset of tasks.
+        chunk_size(int): Number of tasks which are fetched at once.
+
+    Yields:
+        tuple.
+    """
+    task_rows = queryset.values_list(*TASK_VALUES).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(task_rows, chunk_size))
+        if not chunk:
+            return
+        labels = _load_label_names([task_row[0] for task_row in chunk])
+        for task_row in chunk:
+            (  # Noqa: WPS236
+                task_id,
+                name,
+                description,
+                status,
+                author_first,
+                author_last,
+                executor_first,
+                executor_last,
+                created_at,
+            ) = task_row
+            yield (  # Noqa: WPS227
+                task_id,
+                name,
+                description,
+                status or '',
+                _full_name(author_first, author_last),
+                _full_name(executor_first, executor_last),
+                labels.get(task_id, []),
+                created_at.isoformat(),
+            )
+
+
+def _load_label_names(task_ids):
+    links = Task.labels.through.objects.filter(task_id__in=task_ids).order_by('label__name')
+    labels = {}
+    for task_id, label_name in links.values_list('task_id', 'label__name'):
+        labels.setdefault(task_id, []).append(label_name)
+    return labels
+
+
+def _full_name(first_name, last_name):
+    if first_name is None and last_name is None:
+        return ''
+    return '{0} {1}'.format(first_name, last_name)
+
+
+class _Echo(object):
+    """File-like object which returns written lines instead of storing them."""
+
+    def write(self, line):
+        return line
+
+
+def csv_lines(rows):
+    """Yield CSV lines with a header.
+
+    Args:
+        rows: Rows made by iter_rows.
+
+    Yields:
+        str.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        *task_values, labels, created_at = row
+        yield writer.writerow([*task_values, ', '.join(labels), created_at])
+
+
+def jsonl_lines(rows):
+    """Yield JSON Lines, one object per task.
+
+    Args:
+        rows: Rows made by iter_rows.
+
+    Yields:
+        str.
+    """
+    for row in rows:
+        line = json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False)
+        yield '{0}\n'.format(line)
+
+
+def spool_lines(lines):
+    """Write lines into a temporary file and rewind it.
+
+    Django 3.2 iterates streaming responses inside the event loop under ASGI,
+    where queries aren't allowed, so there the export is read in the view's
+    thread and the file is sent instead. Large exports are kept on disk.
+
+    Args:
+        lines: Lines made by csv_lines or jsonl_lines.
+
+    Returns:
+        SpooledTemporaryFile.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    for line in lines:
+        spool.write(line.encode())
+    spool.seek(0)
+    return spool
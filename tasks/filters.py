@@ -1,21 +1,71 @@
+from caching.forms import CachedModelChoiceField
 from django import forms
+from django.db.models import Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
-from django_filters import BooleanFilter, FilterSet, ModelChoiceFilter
+from django_filters import BooleanFilter, CharFilter, FilterSet, ModelChoiceFilter
 from labels.models import Label
+from statuses.models import Status
 from tasks.models import Task
+from tasks.search import search_tasks
+from users.models import User
+
+
+class CachedModelChoiceFilter(ModelChoiceFilter):
+    """ModelChoiceFilter which renders choices from the reference data cache."""
+
+    field_class = CachedModelChoiceField
 
 
 class TaskFilter(FilterSet):
     """FilterSet for tasks."""
 
-    labels = ModelChoiceFilter(label=_('Label'), queryset=Label.objects.all())
+    search = CharFilter(label=_('Search'), method='search_filter')
+    status = CachedModelChoiceFilter(label=_('Status'), queryset=Status.objects.all())
+    executor = CachedModelChoiceFilter(
+        label=_('Executor'), queryset=User.objects.only('first_name', 'last_name'),
+    )
+    labels = CachedModelChoiceFilter(
+        label=_('Label'), queryset=Label.objects.all(), method='labels_filter',
+    )
     self_tasks = BooleanFilter(
         label=_('Self tasks'), method='self_tasks_filter', widget=forms.CheckboxInput,
     )
 
     class Meta(object):  # Noqa: D106
         model = Task
-        fields = ['status', 'executor', 'labels', 'self_tasks']
+        fields = ['search', 'status', 'executor', 'labels', 'self_tasks']
+
+    def search_filter(self, queryset, name, value):  # Noqa: WPS110
+        """Return tasks whose name or description contains words of the value.
+
+        Args:
+            queryset: Queryset which was created by other filters before.
+            name(str): Filter's name.
+            value(str): Entered text.
+
+        Returns:
+            Queryset.
+        """
+        return search_tasks(queryset, value)
+
+    def labels_filter(self, queryset, name, value):  # Noqa: WPS110
+        """Return tasks which are marked by the label.
+
+        The label is checked by EXISTS instead of a join, so the database keeps
+        reading tasks in (created_at, id) order and doesn't sort them.
+
+        Args:
+            queryset: Queryset which was created by other filters before.
+            name(str): Filter's name.
+            value: Selected Label.
+
+        Returns:
+            Queryset.
+        """
+        if value is None:
+            return queryset
+        task_labels = Task.labels.through.objects.filter(task=OuterRef('pk'), label=value)
+        return queryset.filter(Exists(task_labels))
 
     def self_tasks_filter(self, queryset, name, value):  # Noqa: WPS110
         """If filter is selected return queryset of tasks which are created by user.
@@ -29,5 +79,5 @@ class TaskFilter(FilterSet):
             Queryset.
         """
         if value:
-            return queryset & self.request.user.created_tasks.all()
+            return queryset.filter(author=self.request.user)
         return queryset
@@ -0,0 +1,180 @@
+import datetime
+
+from autocomplete import AutocompleteSelect, AutocompleteSelectMultiple
+from caching.forms import CachedModelChoiceField
+from django import forms
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from labels.models import Label
+from statuses.models import Status
+from tasks import bulk, reports
+from tasks.models import Task
+from users.models import User
+
+
+class TaskForm(forms.ModelForm):
+    """Task form which renders only selected related objects.
+
+    Other statuses, executors and labels are loaded by autocomplete endpoints.
+    """
+
+    class Meta(object):  # Noqa: D106
+        model = Task
+        fields = ['name', 'description', 'status', 'executor', 'labels']
+        widgets = {
+            'status': AutocompleteSelect('statuses:autocomplete'),
+            'executor': AutocompleteSelect('users:autocomplete'),
+            'labels': AutocompleteSelectMultiple('labels:autocomplete'),
+        }
+
+    def __init__(self, *args, **kwargs):
+        """Load only names of executors.
+
+        Args:
+            *args: args.
+            **kwargs: kwargs.
+        """
+        super().__init__(*args, **kwargs)
+        self.fields['executor'].queryset = User.objects.only('first_name', 'last_name')
+
+
+class IdListField(forms.Field):
+    """List of object ids sent as repeated parameters."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'invalid': _('Enter a list of ids.'),
+    }
+
+    def to_python(self, value):  # Noqa: WPS110
+        """Convert values to a sorted list of unique ids.
+
+        Args:
+            value: List of strings.
+
+        Returns:
+            List of int.
+
+        Raises:
+            ValidationError: if a value isn't an integer.
+        """
+        if not value:
+            return []
+        try:
+            return sorted({int(object_id) for object_id in value})
+        except (TypeError, ValueError):
+            raise ValidationError(self.error_messages['invalid'], code='invalid')
+
+
+class BulkTaskActionForm(forms.Form):
+    """Action which is applied to many tasks at once.
+
+    Arguments are chosen by autocomplete, so the list page doesn't render
+    options of every status, user and label.
+    """
+
+    actions = (
+        (bulk.CHANGE_STATUS, _('Change status')),
+        (bulk.CHANGE_EXECUTOR, _('Change executor')),
+        (bulk.ADD_LABEL, _('Add label')),
+        (bulk.REMOVE_LABEL, _('Remove label')),
+        (bulk.DELETE, _('Delete')),
+    )
+    # Action -> field which holds its argument.
+    action_fields = {
+        bulk.CHANGE_STATUS: 'status',
+        bulk.CHANGE_EXECUTOR: 'executor',
+        bulk.ADD_LABEL: 'label',
+        bulk.REMOVE_LABEL: 'label',
+    }
+    # Empty executor means that tasks are unassigned.
+    optional_arguments = {'executor'}
+
+    task_ids = IdListField()
+    action = forms.ChoiceField(label=_('Action'), choices=actions)
+    status = forms.ModelChoiceField(
+        label=_('Status'),
+        queryset=Status.objects.all(),
+        required=False,
+        widget=AutocompleteSelect('statuses:autocomplete'),
+    )
+    executor = forms.ModelChoiceField(
+        label=_('Executor'),
+        queryset=User.objects.only('first_name', 'last_name'),
+        required=False,
+        widget=AutocompleteSelect('users:autocomplete'),
+    )
+    label = forms.ModelChoiceField(
+        label=_('Label'),
+        queryset=Label.objects.all(),
+        required=False,
+        widget=AutocompleteSelect('labels:autocomplete'),
+    )
+
+    def clean(self):
+        """Check that the action's argument is selected.
+
+        Returns:
+            Cleaned data.
+        """
+        cleaned_data = super().clean()
+        field = self.action_fields.get(cleaned_data.get('action'))
+        if field and field not in self.optional_arguments and not cleaned_data.get(field):
+            self.add_error(field, forms.Field.default_error_messages['required'])
+        return cleaned_data
+
+    def get_argument(self):
+        """Return the selected argument of the action.
+
+        Returns:
+            Model instance or None.
+        """
+        field = self.action_fields.get(self.cleaned_data['action'])
+        return self.cleaned_data.get(field) if field else None
+
+
+class ReportForm(forms.Form):
+    """Period and grouping of flow reports."""
+
+    weeks = 12
+    groupings = (
+        ('', _('Without grouping')),
+        (reports.EXECUTOR, _('By executor')),
+        (reports.LABEL, _('By label')),
+    )
+
+    done_status = CachedModelChoiceField(
+        label=_('Done status'), queryset=Status.objects.all(), required=False,
+    )
+    group_by = forms.ChoiceField(label=_('Grouping'), choices=groupings, required=False)
+    since = forms.DateField(label=_('Since'), required=False)
+    until = forms.DateField(label=_('Until'), required=False)
+
+    def clean(self):
+        """Fill the omitted period by the last weeks and check its order.
+
+        Returns:
+            Cleaned data.
+        """
+        cleaned_data = super().clean()
+        until = cleaned_data.get('until') or timezone.localdate()
+        default_since = until - datetime.timedelta(weeks=self.weeks)
+        since = cleaned_data.get('since') or default_since
+        if since > until:
+            self.add_error('since', _('The start of the period is after its end.'))
+        group_by = cleaned_data.get('group_by') or None
+        cleaned_data.update(since=since, until=until, group_by=group_by)
+        return cleaned_data
+
+    def get_period(self):
+        """Return the period as aware datetimes, the last day is included.
+
+        Returns:
+            Tuple of the start and the excluded end.
+        """
+        since = datetime.datetime.combine(self.cleaned_data['since'], datetime.time())
+        until = datetime.datetime.combine(
+            self.cleaned_data['until'] + datetime.timedelta(days=1), datetime.time(),
+        )
+        return timezone.make_aware(since), timezone.make_aware(until)
@@ -0,0 +1,197 @@
+"""Compact history of task changes.
+
+A change stores one TaskRevision with values of only the fields it replaced,
+as they were shown before it. The history of a task is restored newest first
+from its current values: each revision gives old values of its fields, and
+the state after it is the state before the newer one. So every change of
+tracked fields, including bulk actions, must store its revision.
+"""
+import itertools
+import operator
+
+from django.db import transaction
+from django.utils import timezone
+from tasks.loading import TASK_FORM
+from tasks.models import Task, TaskRevision
+
+TRACKED_FIELDS = ('name', 'status', 'executor', 'labels')
+PERIODS = {  # Noqa: WPS407
+    'day': lambda moment: moment.date(),
+    'week': lambda moment: moment.isocalendar()[:2],
+    'month': lambda moment: (moment.year, moment.month),
+}
+
+
+def task_values(task):
+    """Return values of tracked fields of the task as they are shown.
+
+    Args:
+        task: Task with loaded relations.
+
+    Returns:
+        dict.
+    """
+    return {
+        'name': task.name,
+        'status': '' if task.status is None else str(task.status),
+        'executor': '' if task.executor is None else str(task.executor),
+        'labels': sorted(str(label) for label in task.labels.all()),
+    }
+
+
+def record_changes(task, previous_values, author):
+    """Save values of fields which differ from the task's current ones.
+
+    Args:
+        task: Saved task.
+        previous_values(dict): Values made by task_values before the change.
+        author: User who has changed the task.
+
+    Returns:
+        TaskRevision or None if nothing is changed.
+    """
+    changed = _changed_values(task, previous_values)
+    if not changed:
+        return None
+    return TaskRevision.objects.create(task=task, author=author, previous=changed)
+
+
+def load_values(task_ids):
+    """Return values of tracked fields of tasks by two queries.
+
+    Args:
+        task_ids: Ids of tasks.
+
+    Returns:
+        Dict of task ids and values made by task_values.
+    """
+    tasks = TASK_FORM.apply(Task.objects.filter(pk__in=task_ids))
+    return {task.pk: task_values(task) for task in tasks}
+
+
+def record_bulk_changes(previous_values, author):
+    """Save revisions of tasks changed by a bulk action by a constant number of queries.
+
+    Args:
+        previous_values(dict): Values made by load_values before the change.
+        author: User who has changed the tasks.
+
+    Returns:
+        List of created TaskRevisions.
+    """
+    revisions = []
+    for task in TASK_FORM.apply(Task.objects.filter(pk__in=previous_values)):
+        changed = _changed_values(task, previous_values[task.pk])
+        if changed:
+            revisions.append(TaskRevision(task=task, author=author, previous=changed))
+    return TaskRevision.objects.bulk_create(revisions)
+
+
+def load_history(task, limit=50):  # Noqa: WPS210
+    """Return the latest changes of the task by one query.
+
+    Args:
+        task: Task with loaded relations.
+        limit(int): Maximal number of revisions.
+
+    Returns:
+        List of dicts with created_at, author, kind and changes, a list of
+        tuples of the field's name, the old value and the new value as text.
+    """
+    revisions = task.revisions.select_related('author').order_by('-created_at', '-id')[:limit]
+    state = task_values(task)
+    history = []
+    for revision in revisions:
+        changes = [
+            (_verbose_name(field), _text(old_value), _text(state[field]))
+            for field, old_value in sorted(revision.previous.items(), key=_field_order)
+            if old_value != state[field]
+        ]
+        state = dict(state, **revision.previous)
+        history.append({
+            'created_at': revision.created_at,
+            'author': revision.author,
+            'kind': revision.kind,
+            'changes': changes,
+        })
+    return history
+
+
+def compact(older_than, period='month'):  # Noqa: WPS210
+    """Fold old diffs of each task into one snapshot per period.
+
+    A snapshot keeps all tracked values as they were before the period, so
+    the history shows the sum of its changes. Periods with one diff are kept.
+
+    Args:
+        older_than: Diffs created before this moment are folded.
+        period(str): Key of PERIODS.
+
+    Returns:
+        Tuple of numbers of folded diffs and created snapshots.
+    """
+    period_key = PERIODS[period]
+    task_ids = TaskRevision.objects.filter(
+        kind=TaskRevision.DIFF, created_at__lt=older_than,
+    ).order_by('task_id').values_list('task_id', flat=True).distinct()
+    folded, snapshots = 0, 0
+    for task_id in task_ids.iterator():
+        with transaction.atomic():
+            task_folded, task_snapshots = _compact_task(task_id, older_than, period_key)
+        folded += task_folded
+        snapshots += task_snapshots
+    return folded, snapshots
+
+
+def _compact_task(task_id, older_than, period_key):  # Noqa: WPS210
+    task = TASK_FORM.apply(Task.objects.all()).get(pk=task_id)
+    state = task_values(task)
+    states_before = {}
+    old_diffs = []
+    for revision in task.revisions.order_by('-created_at', '-id'):
+        state = dict(state, **revision.previous)
+        states_before[revision.pk] = state
+        if revision.kind == TaskRevision.DIFF and revision.created_at < older_than:
+            old_diffs.append(revision)
+    periods = [
+        (period_key(timezone.localtime(old_diff.created_at)), old_diff)
+        for old_diff in reversed(old_diffs)
+    ]
+    folded, snapshots = 0, 0
+    for _, period_revisions in itertools.groupby(periods, key=operator.itemgetter(0)):
+        group = [period_revision for _, period_revision in period_revisions]
+        if len(group) < 2:
+            continue
+        TaskRevision.objects.filter(pk__in=[grouped.pk for grouped in group]).delete()
+        TaskRevision.objects.create(
+            task=task,
+            kind=TaskRevision.SNAPSHOT,
+            previous=states_before[group[0].pk],
+            created_at=group[-1].created_at,
+        )
+        folded += len(group)
+        snapshots += 1
+    return folded, snapshots
+
+
+def _changed_values(task, previous_values):
+    current_values = task_values(task)
+    return {
+        field: old_value
+        for field, old_value in previous_values.items()
+        if current_values[field] != old_value
+    }
+
+
+def _field_order(field_and_value):
+    return TRACKED_FIELDS.index(field_and_value[0])
+
+
+def _verbose_name(field):
+    return Task._meta.get_field(field).verbose_name  # Noqa: WPS437
+
+
+def _text(shown_value):
+    if isinstance(shown_value, list):
+        return ', '.join(shown_value)
+    return shown_value
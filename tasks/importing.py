@@ -0,0 +1,199 @@
+"""Bulk import of tasks from CSV or JSON Lines."""
+import csv
+import json
+from collections import Counter
+from itertools import islice
+
+from caching import versions
+from changes import log
+from changes.models import Change
+from django.db import connection, transaction
+from labels.models import Label
+from statuses.models import Status
+from tasks import counters, dashboard
+from tasks.models import StatusTransition, Task
+from users.models import User
+
+CSV = 'csv'
+JSONL = 'jsonl'
+BATCH_SIZE = 1000
+
+
+class InvalidRow(Exception):
+    """Row of the input can't be imported."""
+
+    def __init__(self, number, message):
+        """Save the row number.
+
+        Args:
+            number(int): Number of the row in the input, starting from 1.
+            message(str): Reason.
+        """
+        super().__init__('Row {0}: {1}'.format(number, message))
+        self.number = number
+
+
+def read_rows(stream, input_format):
+    """Yield rows of the input one by one as dicts.
+
+    CSV has columns name, description, status, author, executor and labels,
+    where labels are separated by commas. JSON Lines objects have the same keys,
+    labels are a list. A line which isn't JSON raises InvalidRow.
+
+    Args:
+        stream: Opened text file.
+        input_format(str): CSV or JSONL.
+
+    Yields:
+        dict.
+    """
+    if input_format == CSV:
+        yield from _read_csv(stream)
+    else:
+        yield from _read_jsonl(stream)
+
+
+def _read_csv(stream):
+    for csv_row in csv.DictReader(stream):
+        labels = (csv_row.get('labels') or '').split(',')
+        csv_row['labels'] = [label.strip() for label in labels if label.strip()]
+        yield csv_row
+
+
+def _read_jsonl(stream):
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise InvalidRow(number, str(error))
+
+
+class TaskImporter(object):
+    """Resolve names of rows to ids and save tasks with bulk_create in batches."""
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        """Load lookup maps of statuses, labels and users.
+
+        Args:
+            batch_size(int): Number of rows which are saved in one transaction.
+        """
+        self.batch_size = batch_size
+        self.statuses = dict(Status.objects.values_list('name', 'id'))
+        self.labels = dict(Label.objects.values_list('name', 'id'))
+        self.users = dict(User.objects.values_list('username', 'id'))
+
+    def import_rows(self, rows, skip=0):
+        """Save rows and yield the number of processed rows after every batch.
+
+        Each batch is committed separately, so an import which fails can be
+        continued by skipping the rows which were reported.
+
+        Args:
+            rows: Iterable of dicts made by read_rows.
+            skip(int): Number of first rows which were imported before.
+
+        Yields:
+            int.
+        """
+        numbered_rows = islice(enumerate(rows, start=1), skip, None)
+        while True:
+            batch = [
+                self.build_task(number, task_row)
+                for number, task_row in islice(numbered_rows, self.batch_size)
+            ]
+            if not batch:
+                return
+            self.save_batch(batch)
+            yield skip + len(batch)
+            skip += len(batch)
+
+    def build_task(self, number, task_row):
+        """Make an unsaved task and ids of its labels from the row.
+
+        Args:
+            number(int): Number of the row.
+            task_row(dict): Row of the input.
+
+        Returns:
+            Tuple of Task and list of label ids.
+
+        Raises:
+            InvalidRow: if the row is incomplete or refers to unknown names.
+        """
+        if not task_row.get('name'):
+            raise InvalidRow(number, 'name is empty')
+        task = Task(
+            name=task_row['name'],
+            description=task_row.get('description') or '',
+            status_id=self._resolve(self.statuses, task_row.get('status'), number, 'status'),
+            author_id=self._resolve(self.users, task_row.get('author'), number, 'author'),
+            executor_id=self._resolve(self.users, task_row.get('executor'), number, 'executor'),
+        )
+        if task.author_id is None:
+            raise InvalidRow(number, 'author is empty')
+        label_ids = [
+            self._resolve(self.labels, label_name, number, 'label')
+            for label_name in task_row.get('labels') or []
+        ]
+        return task, sorted(set(label_ids))
+
+    def save_batch(self, batch):
+        """Insert tasks, their labels and counter changes in one transaction.
+
+        Args:
+            batch(list): Pairs of Task and label ids made by build_task.
+        """
+        tasks = [task for task, _ in batch]
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            if not connection.features.can_return_rows_from_bulk_insert:
+                self._fetch_ids(tasks)
+            Task.labels.through.objects.bulk_create([
+                Task.labels.through(task_id=task.pk, label_id=label_id)
+                for task, label_ids in batch
+                for label_id in label_ids
+            ])
+            self._count(batch)
+            StatusTransition.objects.bulk_create([
+                StatusTransition(task_id=task.pk, to_status_id=task.status_id)
+                for task in tasks
+                if task.status_id is not None
+            ])
+            log.record(Task, [task.pk for task in tasks], Change.CREATE)
+            versions.bump(versions.table_name(Task))
+
+    def _resolve(self, lookup, name, number, column):
+        if not name:
+            return None
+        try:
+            return lookup[name]
+        except KeyError:
+            raise InvalidRow(number, 'unknown {0} "{1}"'.format(column, name))
+
+    def _fetch_ids(self, tasks):
+        """Set ids of inserted tasks where bulk_create doesn't return them.
+
+        The transaction which has inserted the tasks holds the write lock,
+        so the last ids of the table belong to them.
+
+        Args:
+            tasks(list): Inserted tasks in the order of insertion.
+        """
+        newest_ids = Task.objects.order_by('-pk').values_list('pk', flat=True)
+        last_ids = newest_ids[:len(tasks)]
+        for task, task_id in zip(tasks, reversed(list(last_ids))):
+            task.pk = task_id
+
+    def _count(self, batch):  # Noqa: WPS210
+        for attname, (model, counter) in counters.FOREIGN_KEY_COUNTERS.items():
+            groups = Counter(getattr(task, attname) for task, _ in batch)
+            counters.shift_groups(model, counter, groups.items(), 1)
+        label_groups = Counter(label_id for _, label_ids in batch for label_id in label_ids)
+        counters.shift_groups(Label, 'tasks_count', label_groups.items(), 1)
+        dashboard.apply_deltas(Counter(
+            key
+            for task, label_ids in batch
+            for key in dashboard.task_keys(task.status_id, task.executor_id, label_ids)
+        ))
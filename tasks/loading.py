@@ -0,0 +1,69 @@
+"""Declarations of the Task relations which views and templates need."""
+
+
+class Loading(object):
+    """Set of relations and columns which should be loaded with a Task queryset."""
+
+    def __init__(self, select_related=(), prefetch_related=(), only=(), defer=()):
+        """Save declared relations and columns.
+
+        Args:
+            select_related(tuple): Foreign keys which are joined in the same query.
+            prefetch_related(tuple): Many-to-many relations loaded by one extra query.
+            only(tuple): If set, the only columns which are loaded.
+            defer(tuple): Columns which aren't loaded.
+        """
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.only = tuple(only)
+        self.defer = tuple(defer)
+
+    def apply(self, queryset):
+        """Apply declared loading to the queryset.
+
+        Args:
+            queryset: Queryset of tasks.
+
+        Returns:
+            Queryset.
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        if self.defer:
+            queryset = queryset.defer(*self.defer)
+        return queryset
+
+
+# tasks/list.html shows only names of related objects.
+TASK_LIST = Loading(
+    select_related=('status', 'author', 'executor'),
+    only=(
+        'name',
+        'created_at',
+        'updated_at',
+        'status',
+        'author',
+        'executor',
+        'status__name',
+        'author__first_name',
+        'author__last_name',
+        'executor__first_name',
+        'executor__last_name',
+    ),
+)
+
+# tasks/history.py compares shown values of the form's fields before and after a change.
+TASK_FORM = Loading(
+    select_related=('status', 'executor'),
+    prefetch_related=('labels',),
+)
+
+# tasks/detail.html shows the task with all its relations.
+TASK_DETAIL = Loading(
+    select_related=('status', 'author', 'executor'),
+    prefetch_related=('labels',),
+)
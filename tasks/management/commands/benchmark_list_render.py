@@ -0,0 +1,76 @@
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from tasks.filters import TaskFilter
+from tasks.forms import BulkTaskActionForm
+from tasks.loading import TASK_LIST
+from tasks.models import Task
+from users.models import User
+
+
+class Command(BaseCommand):
+    """Measure rendering of the task list with cold and warm fragment caches.
+
+    Missing tasks are created in a transaction which is rolled back, so the
+    database is left as it was. The cold render follows clearing the cache of
+    template fragments, warm renders reuse its rows and filter form.
+    """
+
+    help = 'Measure rendering of the task list with cold and warm fragment caches'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument('--rows', type=int, default=1000, help='Number of rendered tasks')
+        parser.add_argument('--renders', type=int, default=10, help='Number of warm renders')
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Render the list with cold and warm caches and report render times.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if there are no users.
+        """
+        user = User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError('User not found')
+        with transaction.atomic():
+            missing = options['rows'] - Task.objects.count()
+            Task.objects.bulk_create(
+                Task(name='Benchmark task {0}'.format(number), author=user, executor=user)
+                for number in range(max(missing, 0))
+            )
+            ordered_tasks = TASK_LIST.apply(Task.objects.order_by('created_at', 'id'))
+            tasks = list(ordered_tasks[:options['rows']])
+            request = RequestFactory().get('/tasks/', HTTP_HOST='localhost')
+            request.user = user
+            self._render(request, tasks)
+            caches['template_fragments'].clear()
+            cold = self._render(request, tasks)
+            warm_renders = [self._render(request, tasks) for _ in range(options['renders'])]
+            warm = min(warm_renders)
+            transaction.set_rollback(True)
+        self.stdout.write('{0} rows: cold cache {1:.1f} ms, warm cache {2:.1f} ms'.format(
+            len(tasks), cold * 1000, warm * 1000,
+        ))
+
+    def _render(self, request, tasks):
+        context = {
+            'filter': TaskFilter(request.GET, queryset=Task.objects.all(), request=request),
+            'bulk_form': BulkTaskActionForm(),
+            'tasks': tasks,
+            'export_query': '',
+        }
+        started = time.monotonic()
+        render_to_string('tasks/list.html', context, request)
+        return time.monotonic() - started
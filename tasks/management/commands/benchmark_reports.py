@@ -0,0 +1,138 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from statuses.models import Status
+from tasks import reports
+from tasks.models import Task
+from users.models import User
+
+BATCH_SIZE = 10000
+TRANSITIONS = 10000000
+WEEKS = 52
+# Mean time which a task stays in a status.
+STAY_HOURS = 48
+TASKS_SQL = """
+    INSERT INTO tasks_task (id, name, description, author_id, executor_id, status_id,
+        created_at, updated_at)
+    VALUES (%s, %s, '', %s, %s, %s, %s, %s)
+"""  # Noqa: WPS323
+TRANSITIONS_SQL = """
+    INSERT INTO tasks_statustransition (task_id, from_status_id, to_status_id, created_at)
+    VALUES (%s, %s, %s, %s)
+"""  # Noqa: WPS323
+
+
+class Command(BaseCommand):
+    """Measure flow reports over synthetic status transitions.
+
+    Tasks walk through all statuses in order of their ids, the last status is
+    the done one. Rows are inserted in a transaction which is rolled back, so
+    the database is left as it was.
+    """
+
+    help = 'Measure flow reports over synthetic status transitions'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument(
+            '--transitions', type=int, default=TRANSITIONS, help='Number of transitions',
+        )
+        parser.add_argument('--weeks', type=int, default=WEEKS, help='Length of the history')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of random durations')
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Insert transitions, run every report and roll back.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if there are less than two statuses or no users.
+        """
+        status_ids = list(Status.objects.order_by('pk').values_list('pk', flat=True))
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        if len(status_ids) < 2 or not user_ids:
+            raise CommandError('Two statuses and a user are needed')
+        until = timezone.now()
+        since = until - datetime.timedelta(weeks=options['weeks'])
+        with transaction.atomic():
+            started = time.monotonic()
+            period = (since, until)
+            inserted = self._insert(
+                status_ids, user_ids, options['transitions'], period, options['seed'],
+            )
+            self.stdout.write('Inserted {0} transitions in {1:.1f} s'.format(
+                inserted, time.monotonic() - started,
+            ))
+            done_status_id = status_ids[-1]
+            self._measure('time_in_status', reports.time_in_status, since, until)
+            for group_by in (None, reports.EXECUTOR):
+                report_args = (done_status_id, since, until, group_by)
+                self._measure(
+                    'lead_and_cycle_times {0}'.format(group_by or ''),
+                    reports.lead_and_cycle_times,
+                    *report_args,
+                )
+                self._measure(
+                    'weekly_throughput {0}'.format(group_by or ''),
+                    reports.weekly_throughput,
+                    *report_args,
+                )
+            self._measure('work_in_progress', reports.work_in_progress, since, until)
+            transaction.set_rollback(True)
+
+    def _insert(self, status_ids, user_ids, transitions, period, seed):  # Noqa: WPS210, WPS211
+        since, until = period
+        generator = random.Random(seed)
+        span = (until - since).total_seconds()
+        last_id = Task.objects.aggregate(last_id=Max('pk'))['last_id']
+        adapt = connection.ops.adapt_datetimefield_value
+        tasks, rows = [], []
+        inserted = 0
+        task_id = (last_id or 0) + 1
+        with connection.cursor() as cursor:
+            while inserted < transitions:
+                moment = since + datetime.timedelta(seconds=generator.random() * span)
+                created_at = moment
+                walk = min(generator.randint(1, len(status_ids)), transitions - inserted)
+                from_status_id = None
+                for to_status_id in status_ids[:walk]:
+                    rows.append((task_id, from_status_id, to_status_id, adapt(moment)))
+                    from_status_id = to_status_id
+                    moment += datetime.timedelta(hours=generator.expovariate(1 / STAY_HOURS))
+                tasks.append((
+                    task_id,
+                    'Task {0}'.format(task_id),
+                    generator.choice(user_ids),
+                    generator.choice(user_ids),
+                    from_status_id,
+                    adapt(created_at),
+                    adapt(moment),
+                ))
+                inserted += walk
+                task_id += 1
+                if len(rows) >= BATCH_SIZE:
+                    self._flush(cursor, tasks, rows)
+            self._flush(cursor, tasks, rows)
+        return inserted
+
+    def _flush(self, cursor, tasks, rows):
+        cursor.executemany(TASKS_SQL, tasks)
+        cursor.executemany(TRANSITIONS_SQL, rows)
+        tasks.clear()
+        rows.clear()
+
+    def _measure(self, name, report, *args):
+        started = time.monotonic()
+        report(*args)
+        self.stdout.write('{0}: {1:.2f} s'.format(name, time.monotonic() - started))
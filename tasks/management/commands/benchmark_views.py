@@ -0,0 +1,214 @@
+import asyncio
+import io
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from users.models import User
+
+REQUESTS = 200
+
+
+class Command(BaseCommand):
+    """Compare throughput of a page under the WSGI and the ASGI applications.
+
+    Both applications are called in-process, so the numbers show the cost of
+    the handlers, middleware and views without a network server. Run it with
+    ASYNC_VIEWS=True to measure the async variants of read-only pages.
+    """
+
+    help = 'Compare requests per second of a page under WSGI and ASGI'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument('--path', default='/tasks/', help='Page with a query string')
+        parser.add_argument('--username', help='User who requests the page, the first if omitted')
+        parser.add_argument('--requests', type=int, default=REQUESTS, help='Number of requests')
+        parser.add_argument('--concurrency', type=int, default=10, help='Simultaneous requests')
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Request the page by both applications and report requests per second.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if the user doesn't exist.
+        """
+        users = User.objects.order_by('pk')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError('User not found')
+        client = Client()
+        client.force_login(user)
+        cookie = '{0}={1}'.format(
+            settings.SESSION_COOKIE_NAME, client.cookies[settings.SESSION_COOKIE_NAME].value,
+        )
+        path, _, query = options['path'].partition('?')
+        request = WsgiBenchmark(path, query, cookie)
+        self._report('WSGI', request.run(options['requests'], options['concurrency']))
+        request = AsgiBenchmark(path, query, cookie)
+        self._report('ASGI', request.run(options['requests'], options['concurrency']))
+
+    def _report(self, name, measurement):
+        elapsed, statuses = measurement
+        total = sum(statuses.values())
+        self.stdout.write('{0}: {1} requests in {2:.2f} s, {3:.0f} requests/s, statuses {4}'.format(
+            name, total, elapsed, total / elapsed if elapsed else total, dict(statuses),
+        ))
+
+
+class WsgiBenchmark(object):
+    """Requests to task_manager.wsgi from a pool of threads."""
+
+    def __init__(self, path, query, cookie):
+        """Save the request.
+
+        Args:
+            path(str): Path of the page.
+            query(str): Query string.
+            cookie(str): Cookie header with the session.
+        """
+        from task_manager.wsgi import application  # Noqa: WPS433
+        self.application = application
+        self.path = path
+        self.query = query
+        self.cookie = cookie
+
+    def run(self, requests, concurrency):
+        """Send requests and count statuses of responses.
+
+        Args:
+            requests(int): Number of requests.
+            concurrency(int): Number of threads.
+
+        Returns:
+            Tuple of elapsed seconds and Counter of statuses.
+        """
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            response_statuses = executor.map(lambda _: self.request(), range(requests))
+            statuses = Counter(response_statuses)
+        return time.monotonic() - started, statuses
+
+    def request(self):
+        """Send one request and read the whole response.
+
+        Returns:
+            int status.
+        """
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': self.path,
+            'QUERY_STRING': self.query,
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': self.cookie,
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            'wsgi.version': (1, 0),
+        }
+        statuses = []
+        response = self.application(environ, lambda status, headers: statuses.append(status))
+        # The WSGI server closes a response even if reading it fails.
+        try:  # Noqa: WPS501
+            for _ in response:  # Noqa: WPS328
+                pass  # Noqa: WPS420
+        finally:
+            response.close()
+        return int(statuses[0].split()[0])
+
+
+class AsgiBenchmark(object):
+    """Requests to task_manager.asgi from one event loop."""
+
+    def __init__(self, path, query, cookie):
+        """Save the request.
+
+        Args:
+            path(str): Path of the page.
+            query(str): Query string.
+            cookie(str): Cookie header with the session.
+        """
+        from task_manager.asgi import application  # Noqa: WPS433
+        self.application = application
+        self.scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+
+    def run(self, requests, concurrency):
+        """Send requests and count statuses of responses.
+
+        Args:
+            requests(int): Number of requests.
+            concurrency(int): Number of requests in progress at once.
+
+        Returns:
+            Tuple of elapsed seconds and Counter of statuses.
+        """
+        return asyncio.run(self._run(requests, concurrency))
+
+    async def request(self):
+        """Send one request and read the whole response.
+
+        Returns:
+            int status.
+        """
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        finished = asyncio.Event()
+        statuses = []
+
+        async def receive():  # Noqa: WPS430
+            if messages:
+                return messages.pop()
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):  # Noqa: WPS430
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+            elif not message.get('more_body'):
+                finished.set()
+
+        await self.application(dict(self.scope), receive, send)
+        return statuses[0]
+
+    async def _run(self, requests, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited_request():  # Noqa: WPS430
+            async with semaphore:
+                return await self.request()
+
+        started = time.monotonic()
+        statuses = await asyncio.gather(*(limited_request() for _ in range(requests)))
+        return time.monotonic() - started, Counter(statuses)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from tasks import dashboard
+
+
+class Command(BaseCommand):
+    """Compare the rollup of the dashboard with tasks grouped in the task table."""
+
+    help = 'Check that the rollup of the dashboard matches tasks'  # Noqa: A003
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Report rows which differ.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if any row differs.
+        """
+        mismatches = dashboard.find_mismatches()
+        for (dimension, object_id, status_id), stored, expected in mismatches:
+            self.stdout.write('{0} {1} in status {2}: stored {3}, expected {4}'.format(
+                dimension, object_id, status_id, stored, expected,
+            ))
+        if mismatches:
+            raise CommandError(
+                '{0} rows differ, run rebuild_dashboard'.format(len(mismatches)),
+            )
+        self.stdout.write(self.style.SUCCESS('Dashboard rollup matches tasks'))
@@ -0,0 +1,40 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tasks import history
+
+DAYS = 90
+
+
+class Command(BaseCommand):
+    """Fold old diffs of task history into periodic snapshots."""
+
+    help = 'Fold old diffs of task history into periodic snapshots'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument('--days', type=int, default=DAYS, help='Age of diffs which are folded')
+        parser.add_argument(
+            '--period',
+            choices=sorted(history.PERIODS),
+            default='month',
+            help='Period of a snapshot',
+        )
+
+    def handle(self, *args, **options):  # Noqa: WPS110
+        """Fold diffs task by task, each task in its own transaction.
+
+        Args:
+            *args: args.
+            **options: options.
+        """
+        older_than = timezone.now() - datetime.timedelta(days=options['days'])
+        folded, snapshots = history.compact(older_than, options['period'])
+        self.stdout.write(self.style.SUCCESS(
+            'Folded {0} diffs into {1} snapshots'.format(folded, snapshots),
+        ))
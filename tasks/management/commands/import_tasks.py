@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from tasks.importing import BATCH_SIZE, CSV, JSONL, InvalidRow, TaskImporter, read_rows
+
+
+class Command(BaseCommand):
+    """Import tasks from a CSV or JSON Lines file."""
+
+    help = 'Import tasks from a CSV or JSON Lines file'  # Noqa: A003
+
+    def add_arguments(self, parser):
+        """Add arguments of the command.
+
+        Args:
+            parser: ArgumentParser.
+        """
+        parser.add_argument('path', help='File to import')
+        parser.add_argument(
+            '--format', choices=[CSV, JSONL], help='Format, by file extension if omitted',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE, help='Rows per transaction',
+        )
+        parser.add_argument('--skip', type=int, default=0, help='Number of rows imported before')
+
+    def handle(self, *args, **options):  # Noqa: WPS110, WPS210
+        """Stream the file into the database and report progress by batches.
+
+        Args:
+            *args: args.
+            **options: options.
+
+        Raises:
+            CommandError: if a row can't be imported.
+        """
+        input_format = options['format'] or _format_of(options['path'])
+        importer = TaskImporter(batch_size=options['batch_size'])
+        imported = options['skip']
+        started = time.monotonic()
+        with open(options['path'], encoding='utf-8', newline='') as stream:
+            rows = read_rows(stream, input_format)
+            try:
+                for batch_end in importer.import_rows(rows, options['skip']):
+                    imported = batch_end
+                    self.stdout.write('Imported {0} rows'.format(imported))
+            except InvalidRow as error:
+                raise CommandError(
+                    '{0}. {1} rows are imported, continue with --skip {1}'.format(
+                        error, imported,
+                    ),
+                )
+        elapsed = time.monotonic() - started
+        new_rows = imported - options['skip']
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {0} rows in {1:.1f} s, {2:.0f} rows/s'.format(
+                new_rows, elapsed, new_rows / elapsed if elapsed else new_rows,
+            ),
+        ))
+
+
+def _format_of(path):
+    return JSONL if path.endswith('.jsonl') else CSV
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from tasks import dashboard
+
+
+class Command(BaseCommand):
+    """Recalculate the rollup of open tasks from the task table."""
+
+    help = 'Recalculate the rollup of the dashboard from tasks'  # Noqa: A003
+
+    def handle(self, *args, **options):  # Noqa: WPS110
+        """Replace rollup rows in one transaction.
+
+        Args:
+            *args: args.
+            **options: options.
+        """
+        rows = dashboard.rebuild()
+        self.stdout.write(self.style.SUCCESS('Dashboard rollup has {0} rows'.format(rows)))
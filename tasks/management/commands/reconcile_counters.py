@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tasks import counters
+
+
+class Command(BaseCommand):
+    """Recalculate usage counters of statuses, labels and users by tasks."""
+
+    help = 'Recalculate usage counters of statuses, labels and users by tasks'  # Noqa: A003
+
+    def handle(self, *args, **options):  # Noqa: WPS110
+        """Recalculate all counters in one transaction.
+
+        Args:
+            *args: args.
+            **options: options.
+        """
+        with transaction.atomic():
+            counters.recount_statuses()
+            counters.recount_labels()
+            counters.recount_users()
+        self.stdout.write(self.style.SUCCESS('Counters are reconciled'))
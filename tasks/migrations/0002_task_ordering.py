@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['created_at', 'id'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_tasks(Task, lookup):
+    tasks = Task.objects.filter(**{lookup: OuterRef('pk')}).order_by()
+    counted = tasks.values(lookup).annotate(tasks_count=Count('id')).values('tasks_count')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def fill_usage_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    apps.get_model('statuses', 'Status').objects.update(tasks_count=count_tasks(Task, 'status'))
+    apps.get_model('labels', 'Label').objects.update(tasks_count=count_tasks(Task, 'labels'))
+    apps.get_model('users', 'User').objects.update(
+        created_tasks_count=count_tasks(Task, 'author'),
+        assigned_tasks_count=count_tasks(Task, 'executor'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_tasks_count'),
+        ('statuses', '0002_status_tasks_count'),
+        ('users', '0002_user_tasks_counts'),
+        ('tasks', '0003_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_usage_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:41
+
+from django.db import migrations, models
+from django.db.models import F
+from tasks.search import restore_search_triggers
+
+
+def fill_updated_at(apps, schema_editor):
+    apps.get_model('tasks', 'Task').objects.update(updated_at=F('created_at'))
+
+
+def restore_triggers(apps, schema_editor):
+    restore_search_triggers(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_search'),
+    ]
+
+    # SQLite rebuilds tasks_task to add the column and drops its triggers.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0006_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('diff', 'diff'), ('snapshot', 'snapshot')], default='diff', max_length=8)),
+                ('previous', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='tasks.task')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='taskrevision',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='task_revision_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:58
+
+import itertools
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def add_initial_transitions(apps, schema_editor):
+    """Start the history of existing tasks by their current statuses."""
+    Task = apps.get_model('tasks', 'Task')
+    StatusTransition = apps.get_model('tasks', 'StatusTransition')
+    tasks = Task.objects.filter(status__isnull=False).values_list('id', 'status_id', 'created_at')
+    rows = tasks.iterator(chunk_size=BATCH_SIZE)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            return
+        StatusTransition.objects.bulk_create([
+            StatusTransition(task_id=task_id, to_status_id=status_id, created_at=created_at)
+            for task_id, status_id, created_at in batch
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0003_status_name_prefix_indexes'),
+        ('tasks', '0007_task_revisions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('from_status', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status')),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='tasks.task')),
+                ('to_status', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='statustransition',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='transition_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statustransition',
+            index=models.Index(fields=['to_status', 'created_at'], name='transition_status_idx'),
+        ),
+        migrations.RunPython(add_initial_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+NOT_SET = 0
+
+
+def fill_rollup(apps, schema_editor):
+    """Count existing tasks per status and executor or label."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskRollup = apps.get_model('tasks', 'TaskRollup')
+    executor_groups = Task.objects.order_by().values_list('status_id', 'executor_id').annotate(
+        Count('pk'),
+    )
+    label_groups = Task.labels.through.objects.order_by().values_list(
+        'task__status_id', 'label_id',
+    ).annotate(Count('pk'))
+    executor_rollups = [
+        TaskRollup(
+            dimension='executor',
+            object_id=executor_id or NOT_SET,
+            status_id=status_id or NOT_SET,
+            tasks_count=tasks_count,
+        )
+        for status_id, executor_id, tasks_count in executor_groups
+    ]
+    label_rollups = [
+        TaskRollup(
+            dimension='label',
+            object_id=label_id,
+            status_id=status_id or NOT_SET,
+            tasks_count=links_count,
+        )
+        for status_id, label_id, links_count in label_groups
+    ]
+    TaskRollup.objects.bulk_create(executor_rollups + label_rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0004_status_is_closed'),
+        ('tasks', '0008_status_transitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('executor', 'executor'), ('label', 'label')], max_length=8)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('status_id', models.PositiveBigIntegerField()),
+                ('tasks_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskrollup',
+            constraint=models.UniqueConstraint(fields=('dimension', 'object_id', 'status_id'), name='task_rollup_key'),
+        ),
+        migrations.RunPython(fill_rollup, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,5 @@
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.utils.translation import gettext_lazy as _
-from tasks.models import Task
 
 
 class AuthorIdentificationMixin(UserPassesTestMixin):
@@ -8,8 +7,7 @@ class AuthorIdentificationMixin(UserPassesTestMixin):
 
     def test_func(self):
         """Checking that the user is the author of Task."""
-        task_author = Task.objects.get(pk=self.kwargs['pk']).author.id
-        return self.request.user.id == task_author
+        return self.request.user.id == self.get_object().author_id
 
     def dispatch(self, request, *args, **kwargs):
         """Add message and redirect url while restricted."""
@@ -18,3 +16,20 @@ class AuthorIdentificationMixin(UserPassesTestMixin):
             self.redirect_url_while_restricted = 'tasks:list'
             self.restriction_message = _('Only author can delete a task')
         return super().dispatch(request, *args, **kwargs)
+
+
+class RelatedLoadingMixin(object):
+    """Load relations which are declared in the view's `loading` attribute."""
+
+    loading = None
+
+    def get_queryset(self):
+        """Apply declared loading to the view's queryset.
+
+        Returns:
+            Queryset.
+        """
+        queryset = super().get_queryset()
+        if self.loading is None:
+            return queryset
+        return self.loading.apply(queryset)
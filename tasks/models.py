@@ -1,4 +1,7 @@
+from changes import log
+from changes.models import Change
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from labels.models import Label
 from statuses.models import Status
@@ -6,11 +9,14 @@ from users.models import User
 
 
 class Task(models.Model):
+    tracked_foreign_keys = ('status_id', 'author_id', 'executor_id')
+
     name = models.CharField(max_length=150, blank=False, verbose_name=_('Name'))  # Noqa: WPS432
     description = models.TextField(blank=True, verbose_name=_('Description'))
     author = models.ForeignKey(
         User,
         related_name='created_tasks',
+        db_index=False,
         blank=False,
         null=False,
         on_delete=models.PROTECT,
@@ -19,6 +25,7 @@ class Task(models.Model):
     status = models.ForeignKey(
         Status,
         related_name='tasks',
+        db_index=False,
         blank=False,
         null=True,
         on_delete=models.PROTECT,
@@ -27,6 +34,7 @@ class Task(models.Model):
     executor = models.ForeignKey(
         User,
         related_name='assigned_tasks',
+        db_index=False,
         blank=True,
         null=True,
         on_delete=models.PROTECT,
@@ -36,10 +44,201 @@ class Task(models.Model):
         Label, related_name='tasks', blank=True, verbose_name=_('Labels'),
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta(object):
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
+        ordering = ['created_at', 'id']
+        # Every TaskFilter query is ordered by (created_at, id), so each filtered
+        # foreign key leads an index which continues with the ordering columns.
+        # These indexes replace the implicit single-column foreign key indexes.
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+            models.Index(
+                fields=['status', 'created_at', 'id'],
+                name='task_status_created_idx',
+                include=['executor', 'author'],
+            ),
+            models.Index(
+                fields=['executor', 'created_at', 'id'],
+                name='task_executor_created_idx',
+                include=['status', 'author'],
+            ),
+            models.Index(
+                fields=['author', 'created_at', 'id'],
+                name='task_author_created_idx',
+                include=['status', 'executor'],
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):  # Noqa: WPS110
+        """Remember foreign keys which the task is loaded with.
+
+        Args:
+            db: Database alias.
+            field_names: Loaded fields.
+            values: Loaded values.
+
+        Returns:
+            Task.
+        """
+        task = super().from_db(db, field_names, values)
+        task.remember_foreign_keys()
+        return task
+
+    @classmethod
+    def touch(cls, task_ids):
+        """Set updated_at of tasks which are changed without saving them.
+
+        The change is logged for live pages too.
+
+        Args:
+            task_ids: Ids of tasks.
+
+        Returns:
+            The new value of updated_at.
+        """
+        updated_at = timezone.now()
+        task_ids = [task_id for task_id in task_ids if task_id is not None]
+        if task_ids:
+            cls.objects.filter(pk__in=task_ids).update(updated_at=updated_at)
+            log.record(cls, task_ids, Change.UPDATE)
+        return updated_at
+
+    def remember_foreign_keys(self):
+        """Save current foreign keys to compare them with changed ones later."""
+        self._loaded_foreign_keys = {  # Noqa: WPS601
+            attname: self.__dict__[attname]
+            for attname in self.tracked_foreign_keys
+            if attname in self.__dict__
+        }
+
+    def get_loaded_foreign_keys(self):  # Noqa: WPS615
+        """Return foreign keys which the task had in the database before changes.
+
+        Keys which weren't loaded are read from the database.
+
+        Returns:
+            dict.
+        """
+        loaded = dict(getattr(self, '_loaded_foreign_keys', {}))
+        missing = [attname for attname in self.tracked_foreign_keys if attname not in loaded]
+        if missing:
+            stored = Task.objects.filter(pk=self.pk).values(*missing).first()  # Noqa: WPS221
+            loaded.update(stored or {})
+        return loaded
+
+
+class TaskRevision(models.Model):
+    """Values which fields of a task had before a change.
+
+    A diff keeps only the fields which the change replaced. A snapshot keeps
+    all tracked fields as they were before a period of folded diffs. Values
+    are stored as they were shown, so history doesn't depend on later renames.
+    """
+
+    DIFF = 'diff'
+    SNAPSHOT = 'snapshot'
+    KINDS = (
+        (DIFF, DIFF),
+        (SNAPSHOT, SNAPSHOT),
+    )
+
+    task = models.ForeignKey(
+        Task, related_name='revisions', db_index=False, on_delete=models.CASCADE,
+    )
+    author = models.ForeignKey(
+        User, related_name='+', null=True, on_delete=models.SET_NULL,
+    )
+    kind = models.CharField(max_length=8, choices=KINDS, default=DIFF)
+    previous = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta(object):
+        # The history of a task is read newest first by one range of this index.
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='task_revision_idx'),
+        ]
+
+    def __str__(self):
+        return '{0} {1}@{2}'.format(self.kind, self.task_id, self.created_at.isoformat())
+
+
+class StatusTransition(models.Model):
+    """Move of a task into a status, the source of flow reports.
+
+    The first transition of a task has no from_status. Statuses are kept as
+    plain ids, so deleting a status doesn't rewrite the history of moves.
+    """
+
+    task = models.ForeignKey(
+        Task, related_name='status_transitions', db_index=False, on_delete=models.CASCADE,
+    )
+    from_status = models.ForeignKey(
+        Status,
+        related_name='+',
+        db_index=False,
+        db_constraint=False,
+        null=True,
+        on_delete=models.DO_NOTHING,
+    )
+    to_status = models.ForeignKey(
+        Status,
+        related_name='+',
+        db_index=False,
+        db_constraint=False,
+        null=True,
+        on_delete=models.DO_NOTHING,
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta(object):
+        # Reports number moves of each task in time order and find arrivals
+        # into a status.
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='transition_task_idx'),
+            models.Index(fields=['to_status', 'created_at'], name='transition_status_idx'),
+        ]
+
+    def __str__(self):
+        return '{0}: {1} -> {2}'.format(self.task_id, self.from_status_id, self.to_status_id)
+
+
+class TaskRollup(models.Model):
+    """Number of tasks of a status per executor or label, kept by deltas.
+
+    Every task has one executor row and one row per label. Missing statuses
+    and executors are stored as NOT_SET, so each key is one unique row which
+    deltas can be added to by an upsert. Closed statuses are left out when the
+    dashboard is read, so closing a status doesn't rewrite the rollup.
+    """
+
+    EXECUTOR = 'executor'
+    LABEL = 'label'
+    DIMENSIONS = (
+        (EXECUTOR, EXECUTOR),
+        (LABEL, LABEL),
+    )
+    NOT_SET = 0
+
+    dimension = models.CharField(max_length=8, choices=DIMENSIONS)
+    object_id = models.PositiveBigIntegerField()
+    status_id = models.PositiveBigIntegerField()
+    tasks_count = models.IntegerField(default=0)
+
+    class Meta(object):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dimension', 'object_id', 'status_id'], name='task_rollup_key',
+            ),
+        ]
+
+    def __str__(self):
+        return '{0} {1} in {2}: {3}'.format(
+            self.dimension, self.object_id, self.status_id, self.tasks_count,
+        )
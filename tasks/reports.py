@@ -0,0 +1,289 @@
+"""Flow reports built from status transitions.
+
+Durations, nearest-rank percentiles, weekly buckets and running totals are
+computed by window functions inside the database, so only a few rows per
+group and week reach Python whatever the number of transitions is.
+"""
+import datetime
+
+from django.db import NotSupportedError, connection
+
+PERCENTILES = (50, 85, 95)
+EXECUTOR = 'executor'
+LABEL = 'label'
+
+# SQL fragments per database vendor, picked by _sql().
+DAYS_BETWEEN = {  # Noqa: WPS407
+    'sqlite': '(julianday({end}) - julianday({start}))',
+    'postgresql': '(EXTRACT(EPOCH FROM {end} - {start}) / 86400.0)',
+}
+# Weeks start on Monday of UTC, the time zone of stored datetimes.
+WEEK_START = {  # Noqa: WPS407
+    'sqlite': "date({moment}, 'weekday 0', '-6 days')",
+    'postgresql': "CAST(date_trunc('week', {moment}) AS date)",
+}
+GROUP_JOINS = {  # Noqa: WPS407
+    None: ('NULL', ''),
+    EXECUTOR: ('task.executor_id', ''),
+    LABEL: ('link.label_id', 'LEFT JOIN tasks_task_labels link ON link.task_id = task.id'),
+}
+# Every %s below is a DB-API placeholder, not string formatting.
+STAYS_SQL = """
+    SELECT
+        task_id,
+        to_status_id AS status_id,
+        created_at AS entered_at,
+        LEAD(created_at) OVER (PARTITION BY task_id ORDER BY created_at, id) AS left_at
+    FROM tasks_statustransition
+    WHERE created_at < %s
+"""  # Noqa: WPS323
+# Tasks which arrived into the done status for the first time in the period,
+# with the moment they left their first status.
+DONE_SQL = """
+    SELECT
+        done.task_id,
+        done.done_at,
+        (
+            SELECT MIN(started.created_at)
+            FROM tasks_statustransition started
+            WHERE started.task_id = done.task_id AND started.from_status_id IS NOT NULL
+        ) AS started_at
+    FROM (
+        SELECT task_id, MIN(created_at) AS done_at
+        FROM tasks_statustransition
+        WHERE to_status_id = %s
+        GROUP BY task_id
+    ) done
+    WHERE done.done_at >= %s AND done.done_at < %s
+"""  # Noqa: WPS323
+# Templates below are filled only by constants and fragments of this module,
+# values always go to the database as query parameters.
+TIME_IN_STATUS_SQL = """
+    SELECT status_id AS group_key, {days} AS days
+    FROM ({stays}) stays
+    WHERE left_at >= %s AND status_id IS NOT NULL
+"""  # Noqa: WPS323
+LEAD_AND_CYCLE_SQL = """
+    SELECT {group_key} AS group_key, {lead} AS lead_days, {cycle} AS cycle_days
+    FROM ({done}) done
+    JOIN tasks_task task ON task.id = done.task_id
+    {join}
+"""
+THROUGHPUT_SQL = """
+    SELECT {group_key} AS group_key, {week} AS week, COUNT(*)
+    FROM ({done}) done
+    JOIN tasks_task task ON task.id = done.task_id
+    {join}
+    GROUP BY 1, 2
+"""
+WORK_IN_PROGRESS_SQL = """
+    WITH stays AS ({stays}),
+    deltas AS (
+        SELECT status_id, {entered_week} AS week, 1 AS delta
+        FROM stays WHERE status_id IS NOT NULL
+        UNION ALL
+        SELECT status_id, {left_week} AS week, -1 AS delta
+        FROM stays WHERE status_id IS NOT NULL AND left_at IS NOT NULL
+    ),
+    weekly AS (
+        SELECT status_id, week, SUM(delta) AS delta FROM deltas GROUP BY status_id, week
+    )
+    SELECT status_id, week, SUM(delta) OVER (PARTITION BY status_id ORDER BY week)
+    FROM weekly
+    ORDER BY week
+"""
+PERCENTILES_SQL = """
+    WITH samples AS ({samples}),
+    ranked AS (
+        SELECT samples.*, {positions}, COUNT(*) OVER (PARTITION BY group_key) AS total
+        FROM samples
+    )
+    SELECT group_key, MAX(total), {columns}
+    FROM ranked
+    GROUP BY group_key
+    ORDER BY group_key
+"""
+POSITION_SQL = 'ROW_NUMBER() OVER (PARTITION BY group_key ORDER BY {0}) AS {0}_position'
+PERCENTILE_SQL = 'MIN(CASE WHEN {0}_position >= {1} * total THEN {0} END)'
+
+
+def time_in_status(since, until):
+    """Return percentiles of days which tasks stayed in each status.
+
+    Stays which ended in the period are counted.
+
+    Args:
+        since(datetime): Start of the period.
+        until(datetime): End of the period, excluded.
+
+    Returns:
+        List of tuples of status id, number of stays and percentiles.
+    """
+    samples = TIME_IN_STATUS_SQL.format(
+        days=_sql(DAYS_BETWEEN, start='entered_at', end='left_at'), stays=STAYS_SQL,
+    )
+    return _fetch(_percentiles_sql(samples, ('days',)), [until, since])
+
+
+def lead_and_cycle_times(done_status_id, since, until, group_by=None):
+    """Return percentiles of lead and cycle times of tasks done in the period.
+
+    Lead time runs from the creation of a task, cycle time from its first move
+    out of the first status, both until its first arrival into the done status.
+
+    Args:
+        done_status_id(int): Status which means that a task is done.
+        since(datetime): Start of the period.
+        until(datetime): End of the period, excluded.
+        group_by(str): None, EXECUTOR or LABEL.
+
+    Returns:
+        List of tuples of group id, number of tasks, percentiles of lead
+        time and percentiles of cycle time.
+    """
+    group_key, join = GROUP_JOINS[group_by]
+    samples = LEAD_AND_CYCLE_SQL.format(
+        group_key=group_key,
+        lead=_sql(DAYS_BETWEEN, start='task.created_at', end='done.done_at'),
+        cycle=_sql(
+            DAYS_BETWEEN, start='COALESCE(done.started_at, done.done_at)', end='done.done_at',
+        ),
+        done=DONE_SQL,
+        join=join,
+    )
+    query = _percentiles_sql(samples, ('lead_days', 'cycle_days'))
+    return _fetch(query, [done_status_id, since, until])
+
+
+def weekly_throughput(done_status_id, since, until, group_by=None):  # Noqa: WPS210
+    """Return numbers of tasks done per week.
+
+    Args:
+        done_status_id(int): Status which means that a task is done.
+        since(datetime): Start of the period.
+        until(datetime): End of the period, excluded.
+        group_by(str): None, EXECUTOR or LABEL.
+
+    Returns:
+        Dict which maps group ids to dicts of week starts and numbers of tasks.
+    """
+    group_key, join = GROUP_JOINS[group_by]
+    query = THROUGHPUT_SQL.format(
+        group_key=group_key, week=_sql(WEEK_START, moment='done.done_at'), done=DONE_SQL, join=join,
+    )
+    throughput = {}
+    for row_group, week, done_count in _fetch(query, [done_status_id, since, until]):
+        throughput.setdefault(row_group, {})[_as_date(week)] = done_count
+    return throughput
+
+
+def work_in_progress(since, until):  # Noqa: WPS210
+    """Return numbers of tasks in each status at the end of each week.
+
+    Arrivals and departures are summed per week and accumulated by a running
+    total, so the number of rows doesn't depend on the number of tasks.
+
+    Args:
+        since(datetime): Start of the period.
+        until(datetime): End of the period, excluded.
+
+    Returns:
+        Tuple of the list of week starts and a dict which maps status ids to
+        lists of numbers of tasks per week.
+    """
+    query = WORK_IN_PROGRESS_SQL.format(
+        stays=STAYS_SQL,
+        entered_week=_sql(WEEK_START, moment='entered_at'),
+        left_week=_sql(WEEK_START, moment='left_at'),
+    )
+    weeks = week_starts(since, until)
+    running_totals = {}
+    for status_id, week, total in _fetch(query, [until]):
+        running_totals.setdefault(status_id, []).append((_as_date(week), total))
+    curves = {
+        curve_status_id: _fill_weeks(weeks, totals)
+        for curve_status_id, totals in running_totals.items()
+    }
+    return weeks, curves
+
+
+def week_starts(since, until):
+    """Return Mondays of weeks which the period touches.
+
+    Args:
+        since(datetime): Start of the period.
+        until(datetime): End of the period, excluded.
+
+    Returns:
+        List of dates.
+    """
+    week = since.date() - datetime.timedelta(days=since.weekday())
+    last_day = (until - datetime.timedelta(microseconds=1)).date()
+    weeks = []
+    while week <= last_day:
+        weeks.append(week)
+        week += datetime.timedelta(weeks=1)
+    return weeks
+
+
+def _fill_weeks(weeks, totals):
+    """Return running totals at the end of every week.
+
+    Args:
+        weeks(list): Week starts.
+        totals(list): Pairs of a week start and the total, only weeks with changes.
+
+    Returns:
+        list.
+    """
+    curve = []
+    position, current = 0, 0
+    for week in weeks:
+        while position < len(totals) and totals[position][0] <= week:
+            current = totals[position][1]
+            position += 1
+        curve.append(current)
+    return curve
+
+
+def _percentiles_sql(samples, metrics):
+    """Return the query of nearest-rank percentiles of metrics per group.
+
+    Args:
+        samples(str): Query of group_key and metric columns.
+        metrics(tuple): Names of metric columns.
+
+    Returns:
+        str.
+    """
+    positions = ', '.join(POSITION_SQL.format(metric) for metric in metrics)
+    columns = ', '.join(
+        PERCENTILE_SQL.format(metric, percentile / 100)
+        for metric in metrics
+        for percentile in PERCENTILES
+    )
+    return PERCENTILES_SQL.format(samples=samples, positions=positions, columns=columns)
+
+
+def _sql(templates, **parts):
+    template = templates.get(connection.vendor)
+    if template is None:
+        raise NotSupportedError('Reports need SQLite or PostgreSQL')
+    return template.format(**parts)
+
+
+def _fetch(query, query_args):
+    query_args = [
+        connection.ops.adapt_datetimefield_value(query_arg)
+        if isinstance(query_arg, datetime.datetime) else query_arg
+        for query_arg in query_args
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(query, query_args)
+        return cursor.fetchall()
+
+
+def _as_date(week):
+    if isinstance(week, str):
+        return datetime.date.fromisoformat(week)
+    return week
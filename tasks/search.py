@@ -0,0 +1,181 @@
+"""Full-text search over names and descriptions of tasks.
+
+SQLite keeps an external content FTS5 table which triggers synchronize with
+tasks_task. PostgreSQL keeps a generated tsvector column with a GIN index.
+Other databases fall back to LIKE. Found tasks are ranked with names weighted
+above descriptions: by bm25() on SQLite and ts_rank() on PostgreSQL.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value  # Noqa: WPS347
+from django.db.models.expressions import RawSQL
+
+SQLITE = 'sqlite'
+POSTGRESQL = 'postgresql'
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE tasks_task_search USING fts5(
+        name, description, content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+SQLITE_INSERT_TRIGGER = """
+    CREATE TRIGGER tasks_task_search_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_search (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+"""
+SQLITE_DELETE_TRIGGER = """
+    CREATE TRIGGER tasks_task_search_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_search (tasks_task_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+"""
+SQLITE_UPDATE_TRIGGER = """
+    CREATE TRIGGER tasks_task_search_update AFTER UPDATE OF name, description ON tasks_task
+    BEGIN
+        INSERT INTO tasks_task_search (tasks_task_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_task_search (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+"""
+# SQLite rebuilds a table when a migration alters it and drops its triggers,
+# such migrations should call restore_search_triggers().
+SQLITE_TRIGGERS = (SQLITE_INSERT_TRIGGER, SQLITE_DELETE_TRIGGER, SQLITE_UPDATE_TRIGGER)
+SQLITE_DROP_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS tasks_task_search_insert',
+    'DROP TRIGGER IF EXISTS tasks_task_search_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_search_update',
+)
+SQLITE_SCHEMA = (SQLITE_TABLE,) + SQLITE_TRIGGERS + (
+    "INSERT INTO tasks_task_search (tasks_task_search) VALUES ('rebuild')",
+)
+SQLITE_DROP_SCHEMA = SQLITE_DROP_TRIGGERS + ('DROP TABLE IF EXISTS tasks_task_search',)
+POSTGRESQL_VECTOR = """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+"""
+POSTGRESQL_SCHEMA = (
+    POSTGRESQL_VECTOR,
+    'CREATE INDEX task_search_vector_idx ON tasks_task USING GIN (search_vector)',
+)
+# Weights of name and description columns of the FTS5 table, %s is a query parameter.
+SQLITE_RANK = """
+    (SELECT -bm25(tasks_task_search, 10.0, 1.0) FROM tasks_task_search
+    WHERE tasks_task_search MATCH %s AND rowid = "tasks_task"."id")
+"""  # Noqa: WPS323
+# ts_rank() returns real, it's cast so that cursors keep the exact value.
+POSTGRESQL_RANK = """
+    CAST(ts_rank("tasks_task"."search_vector", to_tsquery('simple', %s)) AS double precision)
+"""  # Noqa: WPS323
+RANK_FIELD = 'search_rank'
+# The best matches go first, the primary key keeps the ordering unique for keyset pages.
+RANK_ORDERING = ('-{0}'.format(RANK_FIELD), 'id')
+POSTGRESQL_DROP_SCHEMA = (
+    'DROP INDEX IF EXISTS task_search_vector_idx',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+)
+
+
+def create_search_index(schema_editor):
+    """Create the search index of the database and fill it.
+
+    Args:
+        schema_editor: Schema editor of a migration.
+    """
+    schema = {SQLITE: SQLITE_SCHEMA, POSTGRESQL: POSTGRESQL_SCHEMA}
+    for statement in schema.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(schema_editor):
+    """Drop the search index of the database.
+
+    Args:
+        schema_editor: Schema editor of a migration.
+    """
+    schema = {SQLITE: SQLITE_DROP_SCHEMA, POSTGRESQL: POSTGRESQL_DROP_SCHEMA}
+    for statement in schema.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def restore_search_triggers(schema_editor):
+    """Create triggers of the SQLite search table again after tasks_task is rebuilt.
+
+    Args:
+        schema_editor: Schema editor of a migration.
+    """
+    if schema_editor.connection.vendor == SQLITE:
+        for statement in SQLITE_DROP_TRIGGERS + SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def search_tasks(queryset, query):  # Noqa: WPS210
+    """Return tasks whose name or description contains all words of the query.
+
+    Every word matches as a prefix. The condition is added to the same query,
+    so it combines with other filters. Tasks get the search_rank annotation
+    which ranked_ordering() orders by.
+
+    Args:
+        queryset: Queryset of tasks.
+        query(str): Text entered by a user.
+
+    Returns:
+        Queryset.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    # SQL of RawSQL expressions is constant, words of the query are parameters.
+    if vendor == SQLITE:
+        match = ' '.join('"{0}"*'.format(word) for word in words)
+        matched_ids = RawSQL(
+            'SELECT rowid FROM tasks_task_search WHERE tasks_task_search MATCH %s',  # Noqa: WPS323
+            [match],
+        )
+        return queryset.filter(id__in=matched_ids).annotate(**{
+            RANK_FIELD: RawSQL(SQLITE_RANK, [match], output_field=FloatField()),  # Noqa: S611
+        })
+    if vendor == POSTGRESQL:
+        tsquery = ' & '.join('{0}:*'.format(word) for word in words)
+        return queryset.filter(RawSQL(
+            '"tasks_task"."search_vector" @@ to_tsquery(\'simple\', %s)',  # Noqa: WPS323
+            [tsquery],
+            output_field=BooleanField(),
+        )).annotate(**{
+            RANK_FIELD: RawSQL(POSTGRESQL_RANK, [tsquery], output_field=FloatField()),  # Noqa: S611
+        })
+    for word in words:
+        queryset = queryset.filter(Q(name__icontains=word) | Q(description__icontains=word))
+    # Cursors of pages decode the rank as a float, so it's a float here too.
+    return queryset.annotate(**{RANK_FIELD: Value(0.0, output_field=FloatField())})  # Noqa: WPS358
+
+
+def is_searched(queryset):
+    """Return True if tasks of the queryset are found by search_tasks().
+
+    Args:
+        queryset: Queryset of tasks.
+
+    Returns:
+        bool.
+    """
+    return RANK_FIELD in queryset.query.annotations
+
+
+def ranked_ordering(queryset, ordering):
+    """Return the keyset ordering of found tasks by rank or the given ordering.
+
+    Args:
+        queryset: Queryset of tasks.
+        ordering(tuple): Ordering of tasks which aren't searched.
+
+    Returns:
+        tuple.
+    """
+    return RANK_ORDERING if is_searched(queryset) else ordering
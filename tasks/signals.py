@@ -0,0 +1,172 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from labels.models import Label
+from tasks import counters, dashboard
+from tasks.models import StatusTransition, Task
+
+TaskLabels = Task.labels.through
+
+
+@receiver(pre_save, sender=Task, dispatch_uid='tasks.remember_previous_task')
+def remember_previous_task(sender, instance, raw, **kwargs):
+    """Save foreign keys which a changed task has in the database.
+
+    A task from a fixture may replace a stored one, so its keys are read too.
+
+    Args:
+        sender: Task.
+        instance: Task to save.
+        raw(bool): True if the task is loaded from a fixture.
+        **kwargs: Signal's kwargs.
+    """
+    if raw or not instance._state.adding:  # Noqa: WPS437
+        instance.previous_foreign_keys = instance.get_loaded_foreign_keys()
+
+
+@receiver(post_save, sender=Task, dispatch_uid='tasks.count_saved_task')
+def count_saved_task(sender, instance, created, raw, **kwargs):
+    """Keep usage counters and the dashboard rollup when a task is created or changed.
+
+    Fixtures carry their counters, but not rows of the rollup, so only the
+    rollup counts tasks loaded from them.
+
+    Args:
+        sender: Task.
+        instance: Saved task.
+        created(bool): True if the task was created.
+        raw(bool): True if the task is loaded from a fixture.
+        **kwargs: Signal's kwargs.
+    """
+    if counters.is_handled_in_bulk():
+        return
+    instance.is_loaded_raw = raw
+    previous_values = {} if created else instance.previous_foreign_keys
+    if not raw:
+        counters.count_saved_task(instance, previous_values)
+    dashboard.count_saved_task(instance, previous_values)
+    instance.remember_foreign_keys()
+
+
+@receiver(post_save, sender=Task, dispatch_uid='tasks.record_status_transition')
+def record_status_transition(sender, instance, created, raw, **kwargs):
+    """Record the move of a created or changed task into its status.
+
+    Args:
+        sender: Task.
+        instance: Saved task.
+        created(bool): True if the task was created.
+        raw(bool): True if the task is loaded from a fixture.
+        **kwargs: Signal's kwargs.
+    """
+    if raw or counters.is_handled_in_bulk():
+        return
+    from_status_id = None if created else instance.previous_foreign_keys.get('status_id')
+    if from_status_id == instance.status_id:
+        return
+    StatusTransition.objects.create(
+        task=instance, from_status_id=from_status_id, to_status_id=instance.status_id,
+    )
+
+
+@receiver(pre_delete, sender=Task, dispatch_uid='tasks.count_deleted_task')
+def count_deleted_task(sender, instance, **kwargs):
+    """Decrease usage counters before the task and its labels are deleted.
+
+    Args:
+        sender: Task.
+        instance: Task to delete.
+        **kwargs: Signal's kwargs.
+    """
+    if counters.is_handled_in_bulk():
+        return
+    label_ids = TaskLabels.objects.filter(task=instance).values_list('label_id', flat=True)
+    label_ids = list(label_ids)
+    counters.count_deleted_task(instance, label_ids)
+    dashboard.count_task(instance.status_id, instance.executor_id, label_ids, -1)
+
+
+@receiver(m2m_changed, sender=TaskLabels, dispatch_uid='tasks.count_task_labels')
+def count_task_labels(sender, instance, action, reverse, pk_set, **kwargs):  # Noqa: WPS211
+    """Keep counters of labels and the dashboard rollup when labels of tasks change.
+
+    Added ids are counted after the insert, because Django sends only new links.
+    Removed links are counted before the delete, when they still can be found.
+    Links of a task loaded from a fixture are counted by the rollup only, like
+    the task itself in count_saved_task.
+
+    Args:
+        sender: Through model of Task.labels.
+        instance: Task or Label whose links change.
+        action(str): Kind of change.
+        reverse(bool): True if links are changed from the Label side.
+        pk_set: Ids of the other side.
+        **kwargs: Signal's kwargs.
+    """
+    if counters.is_handled_in_bulk():
+        return
+    if action == 'post_add':
+        delta, linked_ids = 1, list(pk_set)
+    elif action in {'pre_remove', 'pre_clear'}:
+        delta, linked_ids = -1, _linked_ids(instance, reverse, pk_set)
+    else:
+        return
+    if reverse:
+        counters.shift(Label, 'tasks_count', [instance.pk], delta * len(linked_ids))
+    elif not getattr(instance, 'is_loaded_raw', False):
+        counters.shift(Label, 'tasks_count', linked_ids, delta)
+    dashboard.shift_links(_links(instance, reverse, pk_set), delta)
+
+
+@receiver(m2m_changed, sender=TaskLabels, dispatch_uid='tasks.touch_task_labels')
+def touch_task_labels(sender, instance, action, reverse, pk_set, **kwargs):  # Noqa: WPS211
+    """Update updated_at of tasks whose labels change.
+
+    Args:
+        sender: Through model of Task.labels.
+        instance: Task or Label whose links change.
+        action(str): Kind of change.
+        reverse(bool): True if links are changed from the Label side.
+        pk_set: Ids of the other side.
+        **kwargs: Signal's kwargs.
+    """
+    if action not in {'post_add', 'pre_remove', 'pre_clear'}:
+        return
+    if reverse and pk_set is None:
+        Task.touch(_linked_ids(instance, reverse, pk_set))
+    elif reverse:
+        Task.touch(pk_set)
+    else:
+        instance.updated_at = Task.touch([instance.pk])
+
+
+def _linked_ids(instance, reverse, pk_set):
+    """Return ids of the other side which are linked now and touched by the change.
+
+    Args:
+        instance: Task or Label whose links change.
+        reverse(bool): True if instance is a Label.
+        pk_set: Ids of the other side or None for all.
+
+    Returns:
+        list.
+    """
+    other = 'task_id' if reverse else 'label_id'
+    return list(_links(instance, reverse, pk_set).values_list(other, flat=True))
+
+
+def _links(instance, reverse, pk_set):
+    """Return links of the instance to the other side.
+
+    Args:
+        instance: Task or Label whose links change.
+        reverse(bool): True if instance is a Label.
+        pk_set: Ids of the other side or None for all.
+
+    Returns:
+        Queryset of TaskLabels.
+    """
+    own, other = ('label', 'task_id') if reverse else ('task', 'label_id')
+    links = TaskLabels.objects.filter(**{own: instance})
+    if pk_set is not None:
+        links = links.filter(**{'{0}__in'.format(other): pk_set})
+    return links
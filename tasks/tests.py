@@ -1,33 +1,126 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import re
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from changes import log
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import (
+    AsyncClient,
+    AsyncRequestFactory,
+    RequestFactory,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from labels.models import Label
+from pagination import FORWARD, KeysetPaginator, encode_cursor
 from statuses.models import Status
-from tasks.models import Task
+from tasks import board, counters, dashboard, history, reports
+from tasks.filters import TaskFilter
+from tasks.loading import TASK_LIST
+from tasks.models import StatusTransition, Task, TaskRevision, TaskRollup
+from tasks.views import AsyncDetailTaskView, AsyncTasksListView, TasksListView
 from users.models import User
 
+# Plan lines which mean that the whole table is read or rows are sorted.
+FORBIDDEN_PLAN_PATTERNS = {  # Noqa: WPS407
+    'sqlite': [re.compile(r'\bSCAN (TABLE )?\w+\s*$', re.M), re.compile('TEMP B-TREE')],
+    'postgresql': [re.compile('Seq Scan'), re.compile(r'\bSort\b')],
+}
+
+
+def select_queries(queries, table):
+    """Return SELECT queries which read rows of the table.
+
+    Args:
+        queries: Captured queries.
+        table(str): Table name.
+
+    Returns:
+        List of SQL.
+    """
+    from_table = 'FROM "{0}"'.format(table)
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT') and from_table in query['sql']
+    ]
 
-class TasksTests(TestCase):
-    """Test Tasks app."""
+
+class TaskTestCase(TestCase):
+    """Base of tests of the Tasks app with their fixtures and helpers."""
 
     fixtures = ['tasks.json', 'statuses.json', 'labels.json', 'users.json']
 
-    def setUp(self):
-        """Prepare data for tests."""
-        self.first_user = User.objects.get(pk=1)
-        self.second_user = User.objects.get(pk=2)
-        self.first_task = Task.objects.get(pk=1)
-        self.second_task = Task.objects.get(pk=2)
-        self.status_completed = Status.objects.get(pk=1)
-        self.status_in_progress = Status.objects.get(pk=2)
-        self.label_bug = Label.objects.get(pk=1)
-        self.new_task_data = {
+    @classmethod
+    def setUpTestData(cls):
+        """Load objects of fixtures which tests use."""
+        cls.first_user = User.objects.get(pk=1)
+        cls.second_user = User.objects.get(pk=2)
+        cls.first_task = Task.objects.get(pk=1)
+        cls.second_task = Task.objects.get(pk=2)
+        cls.status_completed = Status.objects.get(pk=1)
+        cls.status_in_progress = Status.objects.get(pk=2)
+        cls.label_bug = Label.objects.get(pk=1)
+        cls.new_task_data = {
             'name': 'Salam',
             'description': '228',
-            'status': self.status_in_progress.id,
-            'executor': self.first_user.id,
-            'labels': [self.label_bug.id],
+            'status': cls.status_in_progress.id,
+            'executor': cls.first_user.id,
+            'labels': [cls.label_bug.id],
         }
 
+    def create_tasks(self, count, **fields):
+        """Create many tasks by one query.
+
+        Args:
+            count(int): Number of tasks.
+            **fields: Fields of tasks.
+
+        Returns:
+            List of tasks.
+        """
+        fields.setdefault('author', self.second_user)
+        fields.setdefault('executor', self.first_user)
+        fields.setdefault('status', self.status_in_progress)
+        Task.objects.bulk_create([
+            Task(name='Task {0}'.format(number), **fields) for number in range(count)
+        ])
+        return list(Task.objects.order_by('-id')[:count])[::-1]
+
+    def assert_counters(self, statuses=(), labels=(), users=()):
+        """Check counters against values calculated from tasks.
+
+        Args:
+            statuses: Pairs of status and expected tasks_count.
+            labels: Pairs of label and expected tasks_count.
+            users: Triples of user, expected created and assigned counts.
+        """
+        for status, tasks_count in statuses:
+            status.refresh_from_db()
+            self.assertEqual(status.tasks_count, tasks_count)
+        for label, label_tasks_count in labels:
+            label.refresh_from_db()
+            self.assertEqual(label.tasks_count, label_tasks_count)
+        for user, created_count, assigned_count in users:
+            user.refresh_from_db()
+            self.assertEqual(user.created_tasks_count, created_count)
+            self.assertEqual(user.assigned_tasks_count, assigned_count)
+
+
+class TasksTests(TaskTestCase):
+    """Test Tasks app."""
+
     def test_list_of_tasks(self):
         """Checking list of tasks."""
         self.client.force_login(self.first_user)
@@ -220,3 +313,988 @@ class TasksTests(TestCase):
         response = self.client.get(filtered_list)
         self.assertEqual(response.status_code, 200)
         self.assertQuerysetEqual(list(response.context['tasks']), [created_task])
+
+    def test_list_query_count_does_not_depend_on_rows(self):
+        """Checking that the list is loaded by a fixed number of queries."""
+        self.client.force_login(self.first_user)
+        with CaptureQueriesContext(connection) as few_rows:
+            self.client.get(reverse('tasks:list'))
+        Task.objects.bulk_create([
+            Task(
+                name='Task {0}'.format(number),
+                author=self.second_user,
+                executor=self.first_user,
+                status=self.status_in_progress,
+            )
+            for number in range(30)
+        ])
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(reverse('tasks:list'))
+        self.assertEqual(len(response.context['tasks']), 32)
+        self.assertEqual(len(few_rows), len(many_rows))
+
+    def test_detail_query_count(self):
+        """Checking that the detail page doesn't query relations one by one."""
+        self.client.force_login(self.first_user)
+        self.first_task.labels.add(self.label_bug)
+        detail_task_url = reverse('tasks:detail', args=(self.first_task.id, ))
+        # The session is cached. The user is loaded because users aren't cached
+        # inside the test's transaction. Then two validator queries, the task
+        # with relations, labels and history.
+        with self.assertNumQueries(6):
+            response = self.client.get(detail_task_url)
+        self.assertContains(response, self.label_bug.name)
+
+    def test_keyset_pagination(self):
+        """Checking that pages cover all tasks in order without OFFSET and COUNT."""
+        self.client.force_login(self.first_user)
+        self.create_tasks(120)
+        expected_ids = list(Task.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        seen_ids = []
+        page_url = reverse('tasks:list')
+        while page_url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(page_url)
+            for query in queries:
+                self.assertNotIn('OFFSET', query['sql'].upper())
+                self.assertNotIn('COUNT(', query['sql'].upper())
+            seen_ids.extend(task.id for task in response.context['tasks'])
+            next_page_url = response.context['next_page_url']
+            page_url = next_page_url and '{0}{1}'.format(reverse('tasks:list'), next_page_url)
+        self.assertEqual(seen_ids, expected_ids)
+        previous_url = '{0}{1}'.format(reverse('tasks:list'), response.context['previous_page_url'])
+        response = self.client.get(previous_url)
+        self.assertEqual([task.id for task in response.context['tasks']], expected_ids[50:100])
+
+    def test_keyset_pagination_keeps_filters(self):
+        """Checking that cursor links keep filter parameters."""
+        self.client.force_login(self.first_user)
+        self.create_tasks(60, status=self.status_completed)
+        self.create_tasks(60)
+        filtered_list = '{0}?status=2'.format(reverse('tasks:list'))
+        response = self.client.get(filtered_list)
+        self.assertIn('status=2', response.context['next_page_url'])
+        response = self.client.get(
+            '{0}{1}'.format(reverse('tasks:list'), response.context['next_page_url']),
+        )
+        statuses = {task.status_id for task in response.context['tasks']}
+        self.assertEqual(statuses, {self.status_in_progress.id})
+        self.assertEqual(len(response.context['tasks']), 11)
+        self.assertIsNone(response.context['next_page_url'])
+
+    def test_invalid_cursor(self):
+        """Checking that a broken cursor returns 404."""
+        self.client.force_login(self.first_user)
+        response = self.client.get('{0}?cursor=broken'.format(reverse('tasks:list')))
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        """Checking that a cursor with values of wrong types returns 404."""
+        self.client.force_login(self.first_user)
+        tampered_values = (
+            ['abc', 1],
+            [None, None],
+            ['2021-10-01T00:00:00+00:00', 'abc'],
+            [{'id': 1}, 1],
+            [[1], 1],
+            ['2021-10-01T00:00:00+00:00', [1]],
+        )
+        for row_values in tampered_values:
+            with self.subTest(row_values=row_values):
+                response = self.client.get(reverse('tasks:list'), {
+                    'cursor': encode_cursor(row_values, FORWARD),
+                })
+                self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('tasks:list'), {
+            'cursor': encode_cursor(['2021-10-01T00:00:00+00:00', 1], FORWARD),
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_counters_follow_task_views(self):
+        """Checking of usage counters while tasks are created, changed and deleted."""
+        self.client.force_login(self.second_user)
+        self.client.post(reverse('tasks:create'), self.new_task_data)
+        created_task = Task.objects.get(name=self.new_task_data['name'])
+        self.assert_counters(
+            statuses=[(self.status_completed, 1), (self.status_in_progress, 2)],
+            labels=[(self.label_bug, 1)],
+            users=[(self.first_user, 1, 2), (self.second_user, 2, 1)],
+        )
+        update_url = reverse('tasks:update', args=(created_task.id, ))
+        self.client.post(update_url, {
+            'name': 'Salam',
+            'status': self.status_completed.id,
+            'executor': self.second_user.id,
+        })
+        self.assert_counters(
+            statuses=[(self.status_completed, 2), (self.status_in_progress, 1)],
+            labels=[(self.label_bug, 0)],
+            users=[(self.first_user, 1, 1), (self.second_user, 2, 2)],
+        )
+        created_task.labels.add(self.label_bug)
+        self.client.post(reverse('tasks:delete', args=(created_task.id, )))
+        self.assert_counters(
+            statuses=[(self.status_completed, 1), (self.status_in_progress, 1)],
+            labels=[(self.label_bug, 0)],
+            users=[(self.first_user, 1, 1), (self.second_user, 1, 1)],
+        )
+
+    def test_counters_follow_reverse_label_changes(self):
+        """Checking of label counters when tasks are linked from the label side."""
+        self.label_bug.tasks.add(self.first_task, self.second_task)
+        self.label_bug.tasks.add(self.first_task)
+        self.assert_counters(labels=[(self.label_bug, 2)])
+        self.label_bug.tasks.remove(self.first_task)
+        self.first_task.labels.remove(self.label_bug)
+        self.assert_counters(labels=[(self.label_bug, 1)])
+        self.label_bug.tasks.clear()
+        self.assert_counters(labels=[(self.label_bug, 0)])
+
+    def test_reconcile_counters_command(self):
+        """Checking that the command repairs broken counters."""
+        self.first_task.labels.add(self.label_bug)
+        Status.objects.update(tasks_count=10)
+        Label.objects.update(tasks_count=10)
+        User.objects.update(created_tasks_count=10, assigned_tasks_count=0)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assert_counters(
+            statuses=[(self.status_completed, 1), (self.status_in_progress, 1)],
+            labels=[(self.label_bug, 1)],
+            users=[(self.first_user, 1, 1), (self.second_user, 1, 1)],
+        )
+
+    def test_objects_are_loaded_once_per_request(self):
+        """Checking that permission checks and views share loaded objects."""
+        self.client.force_login(self.first_user)
+        delete_url = reverse('tasks:delete', args=(self.first_task.id, ))
+        with CaptureQueriesContext(connection) as delete_queries:
+            self.client.post(delete_url)
+        self.assertEqual(len(select_queries(delete_queries, 'tasks_task')), 1)
+        self.new_task_data['executor'] = self.second_user.id
+        with CaptureQueriesContext(connection) as create_queries:
+            self.client.post(reverse('tasks:create'), self.new_task_data)
+        author_queries = [
+            sql
+            for sql in select_queries(create_queries, 'users_user')
+            if sql.endswith('"users_user"."id" = {0} LIMIT 21'.format(self.first_user.id))
+        ]
+        self.assertEqual(len(author_queries), 1)
+        created_task = Task.objects.get(name=self.new_task_data['name'])
+        self.assertEqual(created_task.author, self.first_user)
+
+    def test_csv_export(self):
+        """Checking of streaming CSV export of filtered tasks."""
+        self.client.force_login(self.first_user)
+        self.second_task.labels.add(self.label_bug)
+        export_url = '{0}?format=csv&status=2'.format(reverse('tasks:export'))
+        response = self.client.get(export_url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines,
+            [
+                'id,name,description,status,author,executor,labels,created_at',
+                ','.join([
+                    '2',
+                    'Имя2',
+                    'Описание2',
+                    'в работе',
+                    'Михаил Светов',
+                    'Aleksey Navalniy',
+                    'Баг',
+                    self.second_task.created_at.isoformat(),
+                ]),
+            ],
+        )
+
+    def test_jsonl_export_query_count(self):
+        """Checking that JSON Lines export doesn't query relations row by row."""
+        self.client.force_login(self.first_user)
+        export_url = '{0}?format=jsonl'.format(reverse('tasks:export'))
+        with CaptureQueriesContext(connection) as few_rows:
+            b''.join(self.client.get(export_url).streaming_content)
+        for task in self.create_tasks(30):
+            task.labels.add(self.label_bug)
+        with CaptureQueriesContext(connection) as many_rows:
+            exported = b''.join(self.client.get(export_url).streaming_content)
+        self.assertEqual(len(few_rows), len(many_rows))
+        rows = [json.loads(line) for line in exported.decode().splitlines()]
+        self.assertEqual(len(rows), 32)
+        self.assertEqual(rows[-1]['labels'], ['Баг'])
+        self.assertEqual(rows[-1]['author'], 'Михаил Светов')
+
+    @override_settings(ASYNC_VIEWS=True)
+    def test_export_under_asgi(self):
+        """Checking that export is read inside the event loop without queries."""
+        client = AsyncClient()
+        client.force_login(self.first_user)
+        self.second_task.labels.add(self.label_bug)
+
+        async def export():  # Noqa: WPS430
+            response = await client.get('{0}?format=jsonl'.format(reverse('tasks:export')))
+            return b''.join(response.streaming_content)
+
+        rows = [json.loads(line) for line in async_to_sync(export)().decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [1, 2])
+        self.assertEqual(rows[1]['labels'], ['Баг'])
+
+    def write_import_file(self, text, suffix):
+        """Write a temporary file for import_tasks.
+
+        Args:
+            text(str): Content of the file.
+            suffix(str): Extension of the file.
+
+        Returns:
+            Path of the file.
+        """
+        import_file = tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, encoding='utf-8', delete=False,
+        )
+        with import_file:
+            import_file.write(text)
+        self.addCleanup(os.remove, import_file.name)
+        return import_file.name
+
+    def test_import_tasks_from_csv(self):
+        """Checking of CSV import with labels, batches and counters."""
+        csv_lines = (
+            'name,description,status,author,executor,labels',
+            'Импорт1,Описание,в работе,FBK,СВТВ,Баг',
+            'Импорт2,,завершён,СВТВ,,',
+            'Импорт3,,,FBK,FBK,"Баг, Баг"',
+        )
+        path = self.write_import_file('\n'.join(csv_lines), '.csv')
+        stdout = StringIO()
+        call_command('import_tasks', path, batch_size=2, stdout=stdout)
+        self.assertIn('Imported 2 rows', stdout.getvalue())
+        self.assertIn('Imported 3 rows in', stdout.getvalue())
+        imported = Task.objects.filter(name__startswith='Импорт').order_by('id')
+        self.assertEqual(
+            [(task.name, task.status_id, task.author_id, task.executor_id) for task in imported],
+            [
+                ('Импорт1', 2, 1, 2),
+                ('Импорт2', 1, 2, None),
+                ('Импорт3', None, 1, 1),
+            ],
+        )
+        self.assertEqual(
+            [list(task.labels.values_list('name', flat=True)) for task in imported],
+            [['Баг'], [], ['Баг']],
+        )
+        self.assert_counters(
+            statuses=[(self.status_completed, 2), (self.status_in_progress, 2)],
+            labels=[(self.label_bug, 2)],
+            users=[(self.first_user, 3, 2), (self.second_user, 2, 2)],
+        )
+
+    def test_import_tasks_resume(self):
+        """Checking that a failed JSON Lines import keeps batches and continues."""
+        rows = [
+            {'name': 'Импорт1', 'author': 'FBK', 'labels': ['Баг']},
+            {'name': 'Импорт2', 'author': 'FBK'},
+            {'name': 'Импорт3', 'author': 'Неизвестный'},
+        ]
+        path = self.write_import_file(
+            ''.join('{0}\n'.format(json.dumps(task_row)) for task_row in rows), '.jsonl',
+        )
+        with self.assertRaisesMessage(CommandError, 'Row 3: unknown author'):
+            call_command('import_tasks', path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Task.objects.filter(name__startswith='Импорт').count(), 2)
+        rows[2]['author'] = 'СВТВ'
+        path = self.write_import_file(
+            ''.join('{0}\n'.format(json.dumps(task_row)) for task_row in rows), '.jsonl',
+        )
+        call_command('import_tasks', path, skip=2, stdout=StringIO())
+        imported = Task.objects.filter(name__startswith='Импорт')
+        self.assertEqual(
+            list(imported.values_list('name', flat=True)), ['Импорт1', 'Импорт2', 'Импорт3'],
+        )
+        self.assert_counters(
+            labels=[(self.label_bug, 1)],
+            users=[(self.first_user, 3, 1), (self.second_user, 2, 1)],
+        )
+
+    def test_search_tasks(self):
+        """Checking of full-text search combined with other filters."""
+        self.client.force_login(self.first_user)
+
+        def found(**filter_data):  # Noqa: WPS430
+            response = self.client.get(reverse('tasks:list'), filter_data)
+            return [task.id for task in response.context['tasks']]
+
+        self.assertEqual(found(search='описа'), [1, 2])
+        self.assertEqual(found(search='Описание2'), [2])
+        self.assertEqual(found(search='описа', status=self.status_completed.id), [1])
+        self.assertEqual(found(search='"Описание2" *'), [2])
+        self.first_task.name = 'Переименована'
+        self.first_task.save()
+        self.assertEqual(found(search='переим'), [1])
+        self.first_task.delete()
+        self.assertEqual(found(search='переим'), [])
+
+    def test_search_orders_by_rank(self):
+        """Checking that matches in names go first and pages follow the rank."""
+        self.client.force_login(self.first_user)
+        self.first_task.description = 'Похожа на Имя2'
+        self.first_task.save()
+        with mock.patch.object(TasksListView, 'page_size', 1):
+            response = self.client.get(reverse('tasks:list'), {'search': 'имя2'})
+            first_page = [task.id for task in response.context['tasks']]
+            response = self.client.get(
+                '{0}{1}'.format(reverse('tasks:list'), response.context['next_page_url']),
+            )
+        self.assertEqual(first_page, [self.second_task.id])
+        self.assertEqual([task.id for task in response.context['tasks']], [self.first_task.id])
+        self.assertIsNone(response.context['next_page_url'])
+        response = self.client.get(reverse('api:tasks'), {'search': 'имя2'})
+        found_rows = response.json()['results']
+        self.assertEqual([row['id'] for row in found_rows], [2, 1])
+        self.assertGreater(found_rows[0]['search_rank'], found_rows[1]['search_rank'])
+
+    def test_task_form_renders_selected_choices(self):
+        """Checking that task forms render only selected related objects."""
+        self.client.force_login(self.first_user)
+        Label.objects.create(name='Срочно')
+        response = self.client.get(reverse('tasks:create'))
+        self.assertContains(response, reverse('users:autocomplete'))
+        self.assertNotContains(response, 'Срочно')
+        self.assertNotContains(response, 'Михаил Светов')
+        self.second_task.labels.add(self.label_bug)
+        response = self.client.get(reverse('tasks:update', args=(self.second_task.id,)))
+        self.assertContains(response, '<option value="1" selected>Aleksey Navalniy</option>')
+        self.assertContains(response, '<option value="1" selected>Баг</option>')
+        self.assertNotContains(response, 'Срочно')
+
+    def test_conditional_list(self):
+        """Checking that an unchanged list of tasks is answered by 304."""
+        self.client.force_login(self.first_user)
+        list_url = reverse('tasks:list')
+        # The first page sets the CSRF cookie which is a part of the ETag.
+        self.client.get(list_url)
+        response = self.client.get(list_url, {'status': 1})
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(list_url, {'status': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(select_queries(queries, 'tasks_task'), [])
+        response = self.client.get(list_url, {'status': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.client.force_login(self.second_user)
+        response = self.client.get(list_url, {'status': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.first_task.name = 'Новое имя'
+        self.first_task.save()
+        response = self.client.get(list_url, {'status': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Новое имя')
+
+    def test_conditional_detail(self):
+        """Checking that the detail page follows updated_at of the task."""
+        self.client.force_login(self.first_user)
+        detail_url = reverse('tasks:detail', args=(self.first_task.id,))
+        etag = self.client.get(detail_url)['ETag']
+        self.second_task.labels.add(self.label_bug)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.first_task.labels.add(self.label_bug)
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, self.label_bug.name)
+        etag = response['ETag']
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'remove_label', 'task_ids': [self.first_task.id], 'label': self.label_bug.id,
+        })
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, '<li>{0}</li>'.format(self.label_bug.name))
+
+    def test_conditional_list_shows_messages(self):
+        """Checking that a page with a pending message is rendered."""
+        self.client.force_login(self.first_user)
+        etag = self.client.get(reverse('tasks:list'))['ETag']
+        self.client.post(reverse('tasks:bulk'), {'action': 'status', 'task_ids': []})
+        response = self.client.get(reverse('tasks:list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_async_views(self):
+        """Checking that async variants of read-only views render the same pages."""
+        list_view = AsyncTasksListView.as_view()
+        self.assertTrue(asyncio.iscoroutinefunction(list_view))
+        request = AsyncRequestFactory().get('{0}?status=2'.format(reverse('tasks:list')))
+        request.user = self.first_user
+        response = async_to_sync(list_view)(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertQuerysetEqual(response.context_data['tasks'], [self.second_task])
+        self.assertContains(response, self.second_task.name)
+
+        request = AsyncRequestFactory().get(reverse('tasks:detail', args=(1,)))
+        request.user = self.first_user
+        response = async_to_sync(AsyncDetailTaskView.as_view())(request, pk=1)
+        self.assertContains(response, self.first_task.description)
+        request = AsyncRequestFactory().post(reverse('tasks:detail', args=(1,)))
+        request.user = self.first_user
+        response = async_to_sync(AsyncDetailTaskView.as_view())(request, pk=1)
+        self.assertEqual(response.status_code, 405)
+
+    def test_task_events(self):
+        """Checking events about changed tasks which match the filter."""
+        self.client.force_login(self.first_user)
+        events_url = self.client.get(reverse('tasks:list'), {'status': 2}).context['events_url']
+        self.client.post(reverse('tasks:create'), self.new_task_data)
+        created_task = Task.objects.get(name=self.new_task_data['name'])
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'status', 'task_ids': [self.second_task.id], 'status': 1,
+        })
+        response = self.client.get(events_url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertFalse(response.streaming)
+        payloads = [
+            json.loads(line[len('data: '):])
+            for line in response.content.decode().splitlines()
+            if line.startswith('data: ')
+        ]
+        self.assertEqual(
+            [payload['id'] for payload in payloads], [created_task.id, self.second_task.id],
+        )
+        self.assertTrue(payloads[0]['created'])
+        self.assertIn('data-task-id="{0}"'.format(created_task.id), payloads[0]['html'])
+        self.assertIsNone(payloads[1]['html'])
+
+        response = self.client.get(events_url, HTTP_LAST_EVENT_ID=str(log.last_id()))
+        self.assertNotIn('data: ', response.content.decode())
+        self.assertEqual(self.client.get(events_url, {'status': 100}).status_code, 400)
+
+    def test_counters_after_fixtures(self):
+        """Checking that labels of tasks from fixtures aren't counted twice."""
+        self.second_task.labels.add(self.label_bug)
+        with tempfile.NamedTemporaryFile(suffix='.json') as fixture:
+            call_command('dumpdata', 'labels', 'tasks.task', output=fixture.name)
+            Task.objects.all().delete()
+            call_command('loaddata', fixture.name, verbosity=0)
+        self.assertEqual(list(self.second_task.labels.all()), [self.label_bug])
+        self.assert_counters(labels=[(self.label_bug, 1)])
+        call_command('check_dashboard', stdout=StringIO())
+
+    def test_board(self):
+        """Checking columns of the board and loading of their next parts."""
+        Task.objects.bulk_create([
+            Task(
+                name='Task {0}'.format(number),
+                author=self.first_user,
+                executor=self.first_user if number % 2 else None,
+                status=self.status_in_progress,
+            )
+            for number in range(24)
+        ])
+        self.client.force_login(self.first_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tasks:board'))
+        self.assertEqual(len(select_queries(queries, 'tasks_task')), 2)
+        columns = {column['key']: column for column in response.context['columns']}
+        self.assertEqual(columns[1]['tasks_count'], 1)
+        self.assertIsNone(columns[1]['more_url'])
+        self.assertEqual(columns[2]['tasks_count'], 25)
+        self.assertEqual(len(columns[2]['tasks']), board.COLUMN_SIZE)
+        self.assertEqual(columns[2]['tasks'][0], self.second_task)
+
+        response = self.client.get(columns[2]['more_url'])
+        self.assertEqual(len(response.context['tasks']), 5)
+        self.assertIsNone(response.context['more_url'])
+        shown_ids = [task.id for task in columns[2]['tasks'] + response.context['tasks']]
+        self.assertEqual(
+            shown_ids, list(Task.objects.filter(status=2).order_by('created_at', 'id').values_list(
+                'id', flat=True,
+            )),
+        )
+
+        response = self.client.get(reverse('tasks:board'), {'executor': self.first_user.id})
+        counts = {column['key']: column['tasks_count'] for column in response.context['columns']}
+        self.assertEqual(counts, {1: 0, 2: 13})
+        board_column = reverse('tasks:board_column')
+        self.assertEqual(self.client.get(board_column, {'column': 'x'}).status_code, 400)
+        self.assertEqual(
+            self.client.get(board_column, {'column': 2, 'cursor': 'x'}).status_code, 404,
+        )
+
+    def test_fragment_cache(self):
+        """Checking that cached rows and filter form follow changes and languages."""
+        caches['template_fragments'].clear()
+        self.client.force_login(self.first_user)
+        self.client.get(reverse('tasks:list'), HTTP_ACCEPT_LANGUAGE='ru')
+        response = self.client.get(reverse('tasks:list'), HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertContains(response, 'Изменить')
+        response = self.client.get(reverse('tasks:list'), HTTP_ACCEPT_LANGUAGE='en')
+        self.assertContains(response, 'Edit')
+
+        self.status_in_progress.name = 'на проверке'
+        self.status_in_progress.save()
+        self.second_task.name = 'Renamed task'
+        self.second_task.save()
+        response = self.client.get(reverse('tasks:list'), HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertContains(response, '<td>на проверке</td>')
+        self.assertContains(response, 'Renamed task')
+
+        response = self.client.get(reverse('tasks:list'), {'status': self.status_in_progress.id})
+        self.assertContains(response, '<option value="2" selected>')
+        response = self.client.get(reverse('tasks:list'))
+        self.assertNotContains(response, '<option value="2" selected>')
+
+
+class TaskBulkActionTests(TaskTestCase):
+    """Test bulk actions on tasks."""
+
+    def post_bulk_action(self, task_ids, action, **arguments):
+        """Send a bulk action and count its queries.
+
+        Args:
+            task_ids: Ids of tasks.
+            action(str): Action.
+            **arguments: Arguments of the action.
+
+        Returns:
+            Tuple of response and number of queries.
+        """
+        bulk_data = {'task_ids': task_ids, 'action': action, **arguments}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('tasks:bulk'), bulk_data, follow=True)
+        return response, len(queries)
+
+    def test_bulk_status_change(self):
+        """Checking that many tasks change status by a fixed number of queries."""
+        self.client.force_login(self.first_user)
+        few_tasks = self.create_tasks(5)
+        many_tasks = self.create_tasks(40)
+        counters.recount_statuses()
+        _, few_queries = self.post_bulk_action(
+            [task.id for task in few_tasks], 'status', status=self.status_completed.id,
+        )
+        response, many_queries = self.post_bulk_action(
+            [task.id for task in many_tasks], 'status', status=self.status_completed.id,
+        )
+        self.assertEqual(few_queries, many_queries)
+        self.assertContains(response, 'Изменено задач: 40')
+        self.assertEqual(Task.objects.filter(status=self.status_completed).count(), 46)
+        self.assert_counters(statuses=[(self.status_completed, 46), (self.status_in_progress, 1)])
+
+    def test_bulk_labels_and_executor(self):
+        """Checking of bulk label assignment and reassignment."""
+        self.client.force_login(self.first_user)
+        task_ids = [self.first_task.id, self.second_task.id]
+        self.first_task.labels.add(self.label_bug)
+        self.post_bulk_action(task_ids, 'add_label', label=self.label_bug.id)
+        self.assertEqual(self.label_bug.tasks.count(), 2)
+        self.assert_counters(labels=[(self.label_bug, 2)])
+        self.post_bulk_action(task_ids, 'remove_label', label=self.label_bug.id)
+        self.assertEqual(self.label_bug.tasks.count(), 0)
+        self.assert_counters(labels=[(self.label_bug, 0)])
+        self.post_bulk_action(task_ids, 'executor', executor=self.second_user.id)
+        self.assertEqual(Task.objects.filter(executor=self.second_user).count(), 2)
+        self.assert_counters(users=[(self.first_user, 1, 0), (self.second_user, 1, 2)])
+        self.post_bulk_action(task_ids, 'executor', executor='')
+        self.assertEqual(Task.objects.filter(executor__isnull=True).count(), 2)
+        self.assert_counters(users=[(self.first_user, 1, 0), (self.second_user, 1, 0)])
+
+    def test_bulk_deletion_only_by_author(self):
+        """Checking that tasks are deleted only if the user is the author of all of them."""
+        self.client.force_login(self.second_user)
+        own_tasks = self.create_tasks(3)
+        own_tasks[0].labels.add(self.label_bug)
+        counters.recount_statuses()
+        counters.recount_users()
+        task_ids = [task.id for task in own_tasks]
+        response, _ = self.post_bulk_action(task_ids + [self.first_task.id], 'delete')
+        self.assertContains(
+            response, 'Задачу может удалить только её автор',
+        )
+        self.assertEqual(Task.objects.filter(pk__in=task_ids).count(), 3)
+        response, _ = self.post_bulk_action(task_ids, 'delete')
+        self.assertContains(response, 'Изменено задач: 3')
+        self.assertFalse(Task.objects.filter(pk__in=task_ids).exists())
+        self.assert_counters(
+            statuses=[(self.status_in_progress, 1)],
+            labels=[(self.label_bug, 0)],
+            users=[(self.first_user, 1, 1), (self.second_user, 1, 1)],
+        )
+
+    def test_bulk_form_renders_no_options(self):
+        """Checking that arguments of bulk actions are loaded by autocomplete."""
+        self.client.force_login(self.first_user)
+        response = self.client.get(reverse('tasks:list'))
+        bulk_form = response.context['bulk_form']
+        for field in ('status', 'executor', 'label'):
+            rendered = str(bulk_form[field])
+            self.assertIn('data-autocomplete-url', rendered)
+            self.assertEqual(rendered.count('<option'), 1)
+        self.assertContains(response, 'task_manager/autocomplete.js')
+
+    def test_bulk_action_without_argument(self):
+        """Checking that an action without its argument changes nothing."""
+        self.client.force_login(self.first_user)
+        response, _ = self.post_bulk_action([self.first_task.id], 'status')
+        self.assertContains(
+            response, 'Выберите задачи и параметр действия',
+        )
+        response, _ = self.post_bulk_action([], 'delete')
+        self.assertContains(
+            response, 'Выберите задачи и параметр действия',
+        )
+        self.assertTrue(Task.objects.filter(pk=self.first_task.id).exists())
+
+
+class TaskHistoryTests(TaskTestCase):
+    """Test the history of task changes."""
+
+    def test_history_of_changes(self):
+        """Checking that an update stores one diff of changed fields."""
+        self.client.force_login(self.second_user)
+        update_url = reverse('tasks:update', args=(self.second_task.id,))
+        changed_data = dict(self.new_task_data, name=self.second_task.name, executor='')
+        with CaptureQueriesContext(connection) as update_queries:
+            self.client.post(update_url, changed_data)
+        inserts = [
+            query['sql']
+            for query in update_queries
+            if query['sql'].startswith('INSERT INTO "tasks_taskrevision"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        revision = TaskRevision.objects.get(task=self.second_task)
+        self.assertEqual(revision.author, self.second_user)
+        self.assertEqual(revision.previous, {'executor': 'Aleksey Navalniy', 'labels': []})
+
+        self.client.post(update_url, dict(changed_data, status=self.status_completed.id))
+        self.client.post(update_url, dict(changed_data, status=self.status_completed.id))
+        self.assertEqual(TaskRevision.objects.filter(task=self.second_task).count(), 2)
+        with CaptureQueriesContext(connection) as detail_queries:
+            response = self.client.get(reverse('tasks:detail', args=(self.second_task.id,)))
+        history_queries = [
+            query for query in detail_queries if 'tasks_taskrevision' in query['sql']
+        ]
+        self.assertEqual(len(history_queries), 1)
+        self.assertEqual(
+            [revision['changes'] for revision in response.context['history']],
+            [
+                [('Статус', 'в работе', 'завершён')],
+                [('Исполнитель', 'Aleksey Navalniy', ''), ('Метки', '', 'Баг')],
+            ],
+        )
+
+    def test_history_of_bulk_changes(self):
+        """Checking that bulk actions store diffs of the tasks they change."""
+        self.client.force_login(self.second_user)
+        update_url = reverse('tasks:update', args=(self.second_task.id,))
+        task_data = dict(self.new_task_data, name=self.second_task.name, labels=[])
+        self.client.post(update_url, dict(task_data, status=self.status_completed.id))
+        self.client.force_login(self.first_user)
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'status',
+            'task_ids': [self.first_task.id, self.second_task.id],
+            'status': self.status_in_progress.id,
+        })
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'add_label', 'task_ids': [self.second_task.id], 'label': self.label_bug.id,
+        })
+        response = self.client.get(reverse('tasks:detail', args=(self.second_task.id,)))
+        self.assertEqual(
+            [
+                (revision['author'], revision['changes'])
+                for revision in response.context['history']
+            ],
+            [
+                (self.first_user, [('Метки', '', 'Баг')]),
+                (self.first_user, [('Статус', 'завершён', 'в работе')]),
+                (self.second_user, [('Статус', 'в работе', 'завершён')]),
+            ],
+        )
+        self.assertEqual(TaskRevision.objects.filter(task=self.first_task).count(), 1)
+
+    def test_compact_history(self):
+        """Checking that old diffs are folded into a snapshot of their period."""
+        self.client.force_login(self.second_user)
+        update_url = reverse('tasks:update', args=(self.second_task.id,))
+        task_data = dict(self.new_task_data, name=self.second_task.name, labels=[])
+        self.client.post(update_url, dict(task_data, status=self.status_completed.id))
+        task_data['executor'] = self.second_user.id
+        self.client.post(update_url, task_data)
+        self.client.post(update_url, dict(task_data, name='Новое имя'))
+        old_time = timezone.now() - datetime.timedelta(days=100)
+        old_revisions = TaskRevision.objects.order_by('id')[:2]
+        for revision in old_revisions:
+            TaskRevision.objects.filter(pk=revision.pk).update(created_at=old_time)
+        self.assertEqual(history.compact(timezone.now() - datetime.timedelta(days=30)), (2, 1))
+        self.assertEqual(
+            list(TaskRevision.objects.order_by('created_at').values_list('kind', flat=True)),
+            [TaskRevision.SNAPSHOT, TaskRevision.DIFF],
+        )
+        response = self.client.get(reverse('tasks:detail', args=(self.second_task.id,)))
+        self.assertEqual(
+            [revision['changes'] for revision in response.context['history']],
+            [
+                [('Имя', 'Имя2', 'Новое имя')],
+                [('Исполнитель', 'Aleksey Navalniy', 'Михаил Светов')],
+            ],
+        )
+        self.assertContains(response, 'изменения за период')
+
+
+class TaskReportTests(TaskTestCase):
+    """Test status transitions and flow reports."""
+
+    def test_status_transitions(self):
+        """Checking that changes of status are recorded by forms and bulk actions."""
+        self.client.force_login(self.first_user)
+        self.client.post(reverse('tasks:create'), self.new_task_data)
+        task = Task.objects.get(name=self.new_task_data['name'])
+        update_url = reverse('tasks:update', args=(task.id,))
+        task_data = dict(self.new_task_data, status=self.status_completed.id)
+        self.client.post(update_url, task_data)
+        self.client.post(update_url, dict(task_data, name='Новое имя'))
+        self.client.post(reverse('tasks:bulk'), {
+            'action': 'status', 'task_ids': [task.id, self.second_task.id], 'status': 2,
+        })
+        self.assertEqual(
+            list(StatusTransition.objects.order_by('id').values_list(
+                'task_id', 'from_status_id', 'to_status_id',
+            )),
+            [(task.id, None, 2), (task.id, 2, 1), (task.id, 1, 2)],
+        )
+
+    def test_flow_reports(self):
+        """Checking percentiles, throughput and work in progress on crafted transitions."""
+        review_id = Status.objects.create(name='на проверке').id
+        start = timezone.make_aware(datetime.datetime(2024, 1, 1))
+        days = [start + datetime.timedelta(days=number) for number in range(5)]
+        Task.objects.filter(pk__in=[1, 2]).update(created_at=start)
+        self.second_task.labels.add(self.label_bug)
+        moves = [
+            (1, None, 2, days[0]),
+            (1, 2, 1, days[2]),
+            (2, None, 2, days[0]),
+            (2, 2, review_id, days[1]),
+            (2, review_id, 1, days[4]),
+        ]
+        StatusTransition.objects.bulk_create([
+            StatusTransition(
+                task_id=task_id, from_status_id=from_id, to_status_id=to_id, created_at=moment,
+            )
+            for task_id, from_id, to_id, moment in moves
+        ])
+        until = start + datetime.timedelta(weeks=1)
+        rounded = [
+            tuple(round(number, 3) if number else number for number in row)
+            for row in reports.lead_and_cycle_times(1, start, until, reports.EXECUTOR)
+        ]
+        self.assertEqual(rounded, [(1, 1, 4, 4, 4, 3, 3, 3), (2, 1, 2, 2, 2, 0, 0, 0)])
+        rounded = [
+            tuple(round(number, 3) for number in row[1:])
+            for row in reports.lead_and_cycle_times(1, start, until)
+        ]
+        self.assertEqual(rounded, [(2, 2, 4, 4, 0, 3, 3)])
+        rounded = [
+            tuple(round(number, 3) for number in row)
+            for row in reports.time_in_status(start, until)
+        ]
+        self.assertEqual(rounded, [(2, 2, 1, 2, 2), (review_id, 1, 3, 3, 3)])
+        self.assertEqual(
+            reports.weekly_throughput(1, start, until), {None: {start.date(): 2}},
+        )
+        weeks, curves = reports.work_in_progress(start, until + datetime.timedelta(weeks=1))
+        self.assertEqual(weeks, [start.date(), start.date() + datetime.timedelta(weeks=1)])
+        self.assertEqual(curves, {1: [2, 2], 2: [0, 0], review_id: [0, 0]})
+
+        self.client.force_login(self.first_user)
+        response = self.client.get(reverse('tasks:reports'), {
+            'done_status': 1, 'group_by': 'label', 'since': '2024-01-01', 'until': '2024-01-07',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {str(row['name']): row['count'] for row in response.context['flow']},
+            {'Баг': 1, 'Не задано': 1},
+        )
+        self.assertContains(
+            response, 'Пропускная способность по неделям',
+        )
+
+
+class TaskDashboardTests(TaskTestCase):
+    """Test the rollup of open tasks and the dashboard of the home page."""
+
+    def test_dashboard_rollup(self):
+        """Checking that deltas keep the rollup equal to grouped tasks."""
+        self.client.force_login(self.first_user)
+        self.client.post(reverse('tasks:create'), self.new_task_data)
+        task = Task.objects.get(name=self.new_task_data['name'])
+        self.assertEqual(dashboard.find_mismatches(), [])
+        update_url = reverse('tasks:update', args=(task.id,))
+        self.client.post(update_url, dict(
+            self.new_task_data, status=self.status_completed.id, executor=self.second_user.id,
+        ))
+        self.second_task.labels.add(self.label_bug)
+        self.label_bug.tasks.remove(task)
+        self.assertEqual(dashboard.find_mismatches(), [])
+        task_ids = [task.id, self.first_task.id, self.second_task.id]
+        bulk_actions = (
+            {'action': 'status', 'status': self.status_in_progress.id},
+            {'action': 'executor', 'executor': ''},
+            {'action': 'add_label', 'label': self.label_bug.id},
+            {'action': 'remove_label', 'label': self.label_bug.id},
+        )
+        for bulk_data in bulk_actions:
+            self.client.post(reverse('tasks:bulk'), dict(bulk_data, task_ids=task_ids))
+            self.assertEqual(dashboard.find_mismatches(), [])
+        self.second_task.labels.add(self.label_bug)
+        self.client.post(reverse('tasks:delete', args=(task.id,)))
+        self.client.post(reverse('tasks:bulk'), {'action': 'delete', 'task_ids': [1]})
+        self.assertEqual(dashboard.find_mismatches(), [])
+        out = StringIO()
+        call_command('check_dashboard', stdout=out)
+        self.assertIn('matches', out.getvalue())
+
+        TaskRollup.objects.update(tasks_count=5)
+        with self.assertRaises(CommandError):
+            call_command('check_dashboard', stdout=StringIO())
+        call_command('rebuild_dashboard', stdout=StringIO())
+        self.assertEqual(dashboard.find_mismatches(), [])
+
+    def test_dashboard_after_fixtures(self):
+        """Checking that tasks loaded from fixtures are counted in the rollup."""
+        call_command('check_dashboard', stdout=StringIO())
+        Task.objects.filter(pk=self.first_task.id).update(executor=self.first_user)
+        dashboard.rebuild()
+        call_command('loaddata', 'tasks.json', verbosity=0)
+        call_command('check_dashboard', stdout=StringIO())
+
+    def test_dashboard_page(self):
+        """Checking that the home page reads open tasks only from the rollup."""
+        self.second_task.labels.add(self.label_bug)
+        Status.objects.filter(pk=self.status_completed.id).update(is_closed=True)
+        self.client.force_login(self.first_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(select_queries(queries, 'tasks_task'), [])
+        self.assertEqual(response.context['dashboard'], {
+            'statuses': [(self.status_in_progress, 1)],
+            'executors': [(self.first_user, 1)],
+            'labels': [(self.label_bug, 1)],
+        })
+        self.assertContains(response, 'Открытые задачи')
+        self.client.logout()
+        self.assertNotIn('dashboard', self.client.get(reverse('home')).context)
+
+
+class TaskQueryPlanTests(TestCase):
+    """Check query plans of TaskFilter queries on a large table."""
+
+    tasks_count = 3000
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed many tasks and refresh planner statistics."""
+        cls.users = User.objects.bulk_create([
+            User(username='user{0}'.format(number)) for number in range(20)
+        ])
+        cls.users = list(User.objects.order_by('id'))
+        cls.statuses = [
+            Status.objects.create(name='status{0}'.format(number)) for number in range(5)
+        ]
+        cls.labels = [Label.objects.create(name='label{0}'.format(number)) for number in range(10)]
+        Task.objects.bulk_create([
+            Task(
+                name='Task {0}'.format(number),
+                author=cls.users[number % 20],
+                executor=cls.users[number * 7 % 20],
+                status=cls.statuses[number % 5],
+            )
+            for number in range(cls.tasks_count)
+        ])
+        task_ids = Task.objects.values_list('id', flat=True)
+        Task.labels.through.objects.bulk_create([
+            Task.labels.through(task_id=task_id, label=cls.labels[(task_id + shift) % 10])
+            for task_id in task_ids
+            for shift in (0, 3)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def get_page_queryset(self, filter_data, cursor=None):
+        """Build the query which TasksListView runs for the filter.
+
+        Args:
+            filter_data(dict): GET parameters of TaskFilter.
+            cursor(str): Page cursor.
+
+        Returns:
+            Queryset.
+        """
+        request = RequestFactory().get(reverse('tasks:list'), filter_data)
+        request.user = self.users[0]
+        filterset = TaskFilter(
+            filter_data, queryset=TASK_LIST.apply(Task.objects.all()), request=request,
+        )
+        paginator = KeysetPaginator(filterset.qs, ('created_at', 'id'), 50)
+        return paginator.get_page_queryset(cursor)
+
+    def filter_combinations(self):
+        """Yield GET parameters for every combination of TaskFilter fields.
+
+        Yields:
+            dict.
+        """
+        all_filters = {
+            'status': self.statuses[1].id,
+            'executor': self.users[3].id,
+            'labels': self.labels[2].id,
+            'self_tasks': 'on',
+        }
+        for size in range(len(all_filters) + 1):
+            yield from (
+                {name: all_filters[name] for name in names}
+                for names in itertools.combinations(all_filters, size)
+            )
+
+    def assert_plan_is_indexed(self, queryset, filter_data):
+        """Fail if the query plan contains a full table scan or a sort.
+
+        Args:
+            queryset: Queryset to explain.
+            filter_data(dict): GET parameters, used in the failure message.
+        """
+        plan = queryset.explain()
+        for pattern in FORBIDDEN_PLAN_PATTERNS.get(connection.vendor, []):
+            self.assertIsNone(
+                pattern.search(plan),
+                'Filter {0} is not served by an index:\n{1}'.format(filter_data, plan),
+            )
+
+    def test_first_page_plans(self):
+        """Checking plans of first pages of all filter combinations."""
+        for filter_data in self.filter_combinations():
+            with self.subTest(filter_data=filter_data):
+                self.assert_plan_is_indexed(self.get_page_queryset(filter_data), filter_data)
+
+    def test_next_page_plans(self):
+        """Checking plans of pages which are selected by a cursor."""
+        middle_task = Task.objects.order_by('created_at', 'id')[self.tasks_count // 2]
+        cursor = encode_cursor([middle_task.created_at, middle_task.id], 'n')
+        for filter_data in self.filter_combinations():
+            with self.subTest(filter_data=filter_data):
+                queryset = self.get_page_queryset(filter_data, cursor)
+                self.assert_plan_is_indexed(queryset, filter_data)
+
+    def test_search_plan(self):
+        """Checking that search reads the full-text index and not every task."""
+        filter_data = {'search': 'task 15', 'status': self.statuses[0].id}
+        queryset = self.get_page_queryset(filter_data)
+        if connection.vendor == 'sqlite':
+            self.assertIn('VIRTUAL TABLE INDEX', queryset.explain())
+        self.assertNotRegex(queryset.explain(), FORBIDDEN_PLAN_PATTERNS['sqlite'][0])
+        self.assertEqual(
+            [task.name for task in queryset],
+            [
+                'Task {0}'.format(number)
+                for number in range(self.tasks_count)
+                if str(number).startswith('15') and number % 5 == 0
+            ],
+        )
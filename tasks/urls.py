@@ -1,11 +1,18 @@
 from django.urls import path
+from mixins import as_read_view
 from tasks import views
 
 app_name = 'tasks'
 urlpatterns = [
-    path('', views.TasksListView.as_view(), name='list'),
+    path('', as_read_view(views.TasksListView, views.AsyncTasksListView), name='list'),
     path('create/', views.CreateTaskView.as_view(), name='create'),
-    path('<int:pk>/', views.DetailTaskView.as_view(), name='detail'),
+    path('bulk/', views.BulkTaskActionView.as_view(), name='bulk'),
+    path('export/', views.ExportTasksView.as_view(), name='export'),
+    path('board/', views.TaskBoardView.as_view(), name='board'),
+    path('board/column/', views.TaskBoardColumnView.as_view(), name='board_column'),
+    path('reports/', views.TaskReportsView.as_view(), name='reports'),
+    path('events/', views.TaskEventsView.as_view(), name='events'),
+    path('<int:pk>/', as_read_view(views.DetailTaskView, views.AsyncDetailTaskView), name='detail'),
     path('<int:pk>/update/', views.UpdateTaskView.as_view(), name='update'),
     path('<int:pk>/delete/', views.DeleteTaskView.as_view(), name='delete'),
 ]
@@ -1,32 +1,341 @@
+from caching.mixins import ConditionalPageMixin
+from changes import log
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.urls import reverse_lazy
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.shortcuts import redirect, render
+from django.urls import reverse, reverse_lazy
+from django.utils import translation
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import DetailView
-from django.views.generic.edit import CreateView, UpdateView
+from django.views.generic import DetailView, TemplateView, View
+from django.views.generic.edit import CreateView, FormView, UpdateView
 from django_filters.views import FilterView
-from mixins import CustomLoginRequiredMixin, DeleteViewWithRestrictions
+from labels.models import Label
+from mixins import (
+    AsyncViewMixin,
+    CustomLoginRequiredMixin,
+    DeleteViewWithRestrictions,
+    RequestObjectCacheMixin,
+)
+from pagination import InvalidCursor, KeysetPaginationMixin
+from statuses.models import Status
+from tasks import board, bulk, events, export, history, reports, search
 from tasks.filters import TaskFilter
-from tasks.mixins import AuthorIdentificationMixin
+from tasks.forms import BulkTaskActionForm, ReportForm, TaskForm
+from tasks.loading import TASK_DETAIL, TASK_FORM, TASK_LIST
+from tasks.mixins import AuthorIdentificationMixin, RelatedLoadingMixin
 from tasks.models import Task
 from users.models import User
 
 
-class TasksListView(CustomLoginRequiredMixin, FilterView):
+class TasksListView(  # Noqa: WPS215
+    CustomLoginRequiredMixin,
+    ConditionalPageMixin,
+    RelatedLoadingMixin,
+    KeysetPaginationMixin,
+    FilterView,
+):
     """List view of Tasks."""
 
     model = Task
+    loading = TASK_LIST
+    versioned_models = (Task, Status, Label, User)
     template_name = 'tasks/list.html'
     context_object_name = 'tasks'
     filterset_class = TaskFilter
 
+    def get_keyset_ordering(self):
+        """Return ordering of pages, found tasks are ordered by rank.
+
+        Returns:
+            tuple.
+        """
+        return search.ranked_ordering(self.object_list, super().get_keyset_ordering())
+
+    def get_context_data(self, **kwargs):
+        """Add the form of bulk actions.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        context['bulk_form'] = BulkTaskActionForm()
+        export_query = self.request.GET.copy()
+        export_query.pop(self.cursor_kwarg, None)
+        context['export_query'] = export_query.urlencode()
+        events_query = export_query.copy()
+        events_query['after'] = log.last_id()
+        context['events_url'] = '{0}?{1}'.format(reverse('tasks:events'), events_query.urlencode())
+        return context
+
+
+class AsyncTasksListView(AsyncViewMixin, TasksListView):
+    """List view of Tasks served by a coroutine."""
+
+
+class TaskBoardView(CustomLoginRequiredMixin, FilterView):
+    """Board of tasks which match TaskFilter in columns by status."""
+
+    model = Task
+    template_name = 'tasks/board.html'
+    filterset_class = TaskFilter
+
+    def get_context_data(self, **kwargs):
+        """Add columns with their first tasks and numbers of tasks.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        columns = board.build_columns(self.object_list)
+        column_url = reverse('tasks:board_column')
+        for column in columns:
+            column['more_url'] = board.column_url(
+                self.request, column_url, column['key'], column['cursor'],
+            )
+        context['columns'] = columns
+        return context
+
+
+class TaskBoardColumnView(CustomLoginRequiredMixin, View):
+    """Next part of one column of the board, loaded by its keyset cursor."""
+
+    def get(self, request, *args, **kwargs):
+        """Return cards of the column's tasks after the cursor.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            HttpResponse with cards and the link of the next part.
+
+        Raises:
+            Http404: if the cursor is invalid.
+        """
+        filterset = TaskFilter(request.GET, queryset=Task.objects.all(), request=request)
+        column = request.GET.get('column', '')
+        if not filterset.is_valid():
+            return HttpResponseBadRequest()
+        try:
+            tasks = board.column_tasks(filterset.qs, column)
+        except ValueError:
+            return HttpResponseBadRequest()
+        try:
+            page = board.column_paginator(tasks).page(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404(_('Invalid page'))
+        return render(request, 'tasks/board_cards.html', {
+            'tasks': page.object_list,
+            'more_url': board.column_url(request, request.path, column, page.next_cursor),
+        })
+
+
+class ExportTasksView(CustomLoginRequiredMixin, View):
+    """Stream tasks which match TaskFilter as CSV or JSON Lines."""
+
+    formats = {
+        'csv': (export.csv_lines, 'text/csv', 'tasks.csv'),
+        'jsonl': (export.jsonl_lines, 'application/x-ndjson', 'tasks.jsonl'),
+    }
+
+    def get(self, request, *args, **kwargs):  # Noqa: WPS210
+        """Return a streaming response which reads tasks while it is sent.
+
+        Under ASGI tasks are read before the response is sent.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            StreamingHttpResponse.
+
+        Raises:
+            Http404: if the format is unknown.
+        """
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in self.formats:
+            raise Http404
+        lines, content_type, filename = self.formats[export_format]
+        filterset = TaskFilter(request.GET, queryset=Task.objects.all(), request=request)
+        tasks = filterset.qs if filterset.is_valid() else Task.objects.none()
+        stream = lines(export.iter_rows(tasks))
+        if settings.ASYNC_VIEWS:
+            response = FileResponse(export.spool_lines(stream), content_type=content_type)
+        else:
+            response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = 'attachment; filename="{0}"'.format(filename)
+        return response
+
+
+class TaskEventsView(CustomLoginRequiredMixin, View):
+    """Feed of Server-Sent Events about tasks which match TaskFilter."""
+
+    def get(self, request, *args, **kwargs):
+        """Return events of changes after Last-Event-ID or the `after` parameter.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            Response with the text/event-stream content.
+        """
+        filterset = TaskFilter(request.GET, queryset=Task.objects.all(), request=request)
+        after_id = request.META.get('HTTP_LAST_EVENT_ID') or request.GET.get('after')
+        if not filterset.is_valid() or not (after_id is None or after_id.isdigit()):
+            return HttpResponseBadRequest()
+        after_id = log.last_id() if after_id is None else int(after_id)
+        stream = events.iter_events(
+            filterset.qs, after_id, settings.TASK_EVENTS_HOLD, translation.get_language(),
+        )
+        if settings.TASK_EVENTS_HOLD:
+            response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        else:
+            response = HttpResponse(''.join(stream), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
 
-class DetailTaskView(CustomLoginRequiredMixin, DetailView):
+class TaskReportsView(CustomLoginRequiredMixin, TemplateView):
+    """Flow reports of tasks built from their status transitions."""
+
+    template_name = 'tasks/reports.html'
+    group_models = {reports.EXECUTOR: User, reports.LABEL: Label}
+
+    def get_context_data(self, **kwargs):  # Noqa: WPS210
+        """Add tables of the reports for the period of the form.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        form = ReportForm(self.request.GET)
+        context['form'] = form
+        context['percentiles'] = reports.PERCENTILES
+        if not form.is_valid():
+            return context
+        since, until = form.get_period()
+        statuses = Status.objects.in_bulk()
+        context['time_in_status'] = [
+            {'name': statuses.get(status_id), 'count': count, 'days': days}
+            for status_id, count, *days in reports.time_in_status(since, until)
+        ]
+        weeks, curves = reports.work_in_progress(since, until)
+        context['weeks'] = weeks
+        context['work_in_progress'] = [
+            {'name': status, 'counts': curves[status_id]}
+            for status_id, status in statuses.items()
+            if status_id in curves
+        ]
+        done_status = form.cleaned_data['done_status']
+        if done_status is not None:
+            group_by = form.cleaned_data['group_by']
+            context.update(self._get_done_reports(done_status, group_by, (since, until), weeks))
+        return context
+
+    def _get_done_reports(self, done_status, group_by, period, weeks):  # Noqa: WPS210
+        since, until = period
+        flow = reports.lead_and_cycle_times(done_status.pk, since, until, group_by)
+        throughput = reports.weekly_throughput(done_status.pk, since, until, group_by)
+        names = self._get_group_names(group_by, {row[0] for row in flow})
+        split = len(reports.PERCENTILES)
+        return {
+            'flow': [
+                {
+                    'name': names[group_key],
+                    'count': count,
+                    'lead_days': days[:split],
+                    'cycle_days': days[split:],
+                }
+                for group_key, count, *days in flow
+            ],
+            'throughput': [
+                {
+                    'name': names[group_key],
+                    'counts': [throughput[group_key].get(week, 0) for week in weeks],
+                }
+                for group_key, *_ in flow
+            ],
+        }
+
+    def _get_group_names(self, group_by, group_keys):
+        if group_by is None:
+            return {None: _('All tasks')}
+        group_model = self.group_models[group_by]
+        names = dict(group_model.objects.in_bulk(group_keys - {None}))
+        names[None] = _('Not set')
+        return names
+
+
+class DetailTaskView(  # Noqa: WPS215
+    CustomLoginRequiredMixin,
+    ConditionalPageMixin,
+    RequestObjectCacheMixin,
+    RelatedLoadingMixin,
+    DetailView,
+):
     """Detail task view."""
 
     model = Task
+    loading = TASK_DETAIL
+    versioned_models = (Status, Label, User)
     template_name = 'tasks/detail.html'
     context_object_name = 'task'
 
+    def get_version_stamps(self):
+        """Add updated_at of the task to versions of related tables.
+
+        Returns:
+            List of pairs of version and datetime, None if there is no task.
+        """
+        found = Task.objects.filter(pk=self.kwargs['pk']).order_by()
+        task_stamps = found.values_list('updated_at', flat=True)
+        if not task_stamps:
+            return None
+        updated_at = task_stamps[0]
+        return super().get_version_stamps() + [(updated_at.isoformat(), updated_at)]
+
+    def get_context_data(self, **kwargs):
+        """Add the history of changes.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        context['history'] = history.load_history(self.object)
+        return context
+
+
+class AsyncDetailTaskView(AsyncViewMixin, DetailTaskView):
+    """Detail task view served by a coroutine."""
+
 
 class CreateTaskView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     """Create task view."""
@@ -35,7 +344,7 @@ class CreateTaskView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     template_name = 'tasks/create.html'
     success_url = reverse_lazy('tasks:list')
     success_message = _('Task created successfully')
-    fields = ['name', 'description', 'status', 'executor', 'labels']
+    form_class = TaskForm
 
     def form_valid(self, form):
         """Task's author is filled by User from request.
@@ -47,18 +356,53 @@ class CreateTaskView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
             Inherited method.
 
         """
-        form.instance.author = User.objects.get(pk=self.request.user.pk)
+        form.instance.author = self.request.user
         return super().form_valid(form)
 
 
-class UpdateTaskView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
-    """Update task view."""
+class UpdateTaskView(  # Noqa: WPS215
+    CustomLoginRequiredMixin,
+    RequestObjectCacheMixin,
+    RelatedLoadingMixin,
+    SuccessMessageMixin,
+    UpdateView,
+):
+    """Update task view which records changed fields in the task's history."""
 
     model = Task
+    loading = TASK_FORM
     template_name = 'tasks/update.html'
     success_url = reverse_lazy('tasks:list')
     success_message = _('Task changed successfully')
-    fields = ['name', 'description', 'status', 'executor', 'labels']
+    form_class = TaskForm
+
+    def post(self, request, *args, **kwargs):
+        """Remember values of the task before the form changes it.
+
+        Args:
+            request: HTTP request.
+            *args: args.
+            **kwargs: kwargs.
+
+        Returns:
+            HttpResponse.
+        """
+        self.previous_values = history.task_values(self.get_object())  # Noqa: WPS601
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        """Save the task and one revision of its changed fields.
+
+        Args:
+            form: Valid TaskForm.
+
+        Returns:
+            HttpResponseRedirect.
+        """
+        with transaction.atomic():
+            response = super().form_valid(form)
+            history.record_changes(self.object, self.previous_values, self.request.user)
+        return response
 
 
 class DeleteTaskView(
@@ -82,3 +426,47 @@ class DeleteTaskView(
             False.
         """
         return False
+
+
+class BulkTaskActionView(CustomLoginRequiredMixin, FormView):
+    """Apply an action to tasks which are selected in the list."""
+
+    form_class = BulkTaskActionForm
+    http_method_names = ['post']
+    success_url = reverse_lazy('tasks:list')
+
+    def form_valid(self, form):
+        """Apply the action in one transaction.
+
+        Args:
+            form: Bulk action form.
+
+        Returns:
+            Redirect to the list.
+        """
+        try:
+            changed = bulk.apply_action(
+                form.cleaned_data['action'],
+                form.cleaned_data['task_ids'],
+                self.request.user,
+                form.get_argument(),
+            )
+        except PermissionDenied:
+            messages.error(self.request, _('Only author can delete a task'))
+            return redirect(self.success_url)
+        # Named placeholders let translations reorder words.
+        changed_message = _('Tasks changed: %(count)s')  # Noqa: WPS323
+        messages.success(self.request, changed_message % {'count': changed})
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        """Return to the list with an error message.
+
+        Args:
+            form: Bulk action form.
+
+        Returns:
+            Redirect to the list.
+        """
+        messages.error(self.request, _('Select tasks and an argument of the action'))
+        return redirect(self.success_url)
@@ -0,0 +1,23 @@
+from autocomplete import create_prefix_indexes, drop_prefix_indexes
+from django.db import migrations
+
+COLUMNS = ['first_name', 'last_name', 'username']
+
+
+def create_indexes(apps, schema_editor):
+    create_prefix_indexes(schema_editor, 'users_user', COLUMNS)
+
+
+def drop_indexes(apps, schema_editor):
+    drop_prefix_indexes(schema_editor, 'users_user', COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_tasks_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,7 +1,19 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
+    created_tasks_count = models.PositiveIntegerField(default=0, editable=False)
+    assigned_tasks_count = models.PositiveIntegerField(default=0, editable=False)
+
+    @property
+    def is_in_use(self):
+        """Return True if the user is an author or an executor of any task.
+
+        Returns:
+            bool.
+        """
+        return bool(self.created_tasks_count or self.assigned_tasks_count)
 
     def full_name(self):
         """Return user's full name.
@@ -1,8 +1,13 @@
+from autocomplete import prefix_search
 from django.contrib import auth
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tasks.models import Task
 from users.models import User
+from users.views import UserAutocompleteView
 
 
 class UsersTests(TestCase):
@@ -261,3 +266,76 @@ class UsersTests(TestCase):
             fetch_redirect_response=True,
         )
         self.assertContains(response, 'Невозможно удалить пользователя, потому что он используется')
+
+    def test_update_reuses_authenticated_user(self):
+        """Checking that the edited user is the one loaded by authentication."""
+        self.client.force_login(self.first_user)
+        update_url = reverse('users:update', args=(self.first_user.id, ))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(update_url)
+        self.assertEqual(response.status_code, 200)
+        user_queries = [
+            query for query in queries
+            if query['sql'].startswith('SELECT') and 'FROM "users_user"' in query['sql']
+        ]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_autocomplete(self):
+        """Checking of search of users by prefixes of their names."""
+        self.client.force_login(self.first_user)
+
+        def found(query):  # Noqa: WPS430
+            response = self.client.get(reverse('users:autocomplete'), {'q': query})
+            return [found_user['text'] for found_user in response.json()['results']]
+
+        self.assertEqual(found('ale'), ['Aleksey Navalniy'])
+        self.assertEqual(found('fb'), ['Aleksey Navalniy'])
+        self.assertEqual(found('Мих Св'), ['Михаил Светов'])
+        self.assertEqual(found('Мих Нав'), [])
+        self.assertEqual(found(''), ['Aleksey Navalniy', 'Михаил Светов'])
+
+    def test_autocomplete_uses_indexes(self):
+        """Checking that prefix search doesn't read the whole table."""
+        User.objects.bulk_create([
+            User(username='user{0}'.format(number), first_name='Name{0}'.format(number))
+            for number in range(500)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        users = prefix_search(User.objects.all(), UserAutocompleteView.search_fields, 'al na')
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('SCAN', users.explain())
+
+    def test_list_pages_and_workload(self):
+        """Checking that the list loads shown columns only by pages."""
+        cache.clear()
+        User.objects.bulk_create([
+            User(username='user{0}'.format(number), first_name='Name{0}'.format(number))
+            for number in range(60)
+        ])
+        with CaptureQueriesContext(connection) as page_queries:
+            response = self.client.get(reverse('users:list'))
+        user_queries = [
+            query['sql'] for query in page_queries if 'FROM "users_user"' in query['sql']
+        ]
+        self.assertEqual(len(user_queries), 1)
+        self.assertNotIn('password', user_queries[0])
+        self.assertNotIn('tasks_count', user_queries[0])
+        self.assertEqual(list(response.context['users'])[:2], [self.first_user, self.second_user])
+        self.assertNotContains(response, 'created_tasks_count')
+
+        response = self.client.get(reverse('users:list') + response.context['next_page_url'])
+        self.assertEqual(len(response.context['users']), 12)
+        self.assertIsNone(response.context['next_page_url'])
+
+        with CaptureQueriesContext(connection) as workload_queries:
+            response = self.client.get(reverse('users:list'), {'workload': 1})
+        user_queries = [
+            query['sql'] for query in workload_queries if 'FROM "users_user"' in query['sql']
+        ]
+        self.assertEqual(len(user_queries), 1)
+        self.assertNotIn('password', user_queries[0])
+        first_user = response.context['users'][0]
+        self.assertEqual(first_user.created_tasks_count, self.first_user.created_tasks_count)
+        self.assertEqual(first_user.assigned_tasks_count, self.first_user.assigned_tasks_count)
+        self.assertEqual(response.context['workload_query'], '')
@@ -1,10 +1,12 @@
 from django.urls import path
+from mixins import as_read_view
 from users import views
 
 app_name = 'users'
 urlpatterns = [
-    path('', views.ListUserView.as_view(), name='list'),
+    path('', as_read_view(views.ListUserView, views.AsyncListUserView), name='list'),
     path('create/', views.RegisterUserView.as_view(), name='register'),
     path('<int:pk>/update/', views.UpdateUserView.as_view(), name='update'),
     path('<int:pk>/delete/', views.DeleteUserView.as_view(), name='delete'),
+    path('autocomplete/', views.UserAutocompleteView.as_view(), name='autocomplete'),
 ]
@@ -1,3 +1,6 @@
+from autocomplete import AutocompleteView
+from caching.mixins import ConditionalPageMixin
+from caching.pages import AnonymousPageCacheMixin
 from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
@@ -5,21 +8,107 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView
 from django.views.generic.edit import CreateView, UpdateView
-from mixins import CustomLoginRequiredMixin, DeleteViewWithRestrictions
+from mixins import (
+    AsyncViewMixin,
+    CustomLoginRequiredMixin,
+    DeleteViewWithRestrictions,
+    RequestObjectCacheMixin,
+)
+from pagination import KeysetPaginationMixin
+from tasks.models import Task
 from users.forms import UserRegistrationForm
 from users.mixins import UserIdentificationMixin
 from users.models import User
 
 
-class ListUserView(ListView):
-    """List View of Users."""
+class ListUserView(  # Noqa: WPS215
+    ConditionalPageMixin,
+    AnonymousPageCacheMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
+    """List View of Users.
+
+    Only shown columns are loaded, pages follow the primary key index. The
+    optional workload column shows counters of tasks which are kept in the
+    user's row, so it costs no extra query.
+    """
 
     template_name = 'users/list.html'
     context_object_name = 'users'
     model = User
+    keyset_ordering = ('id',)
+    fields = ('username', 'first_name', 'last_name', 'date_joined')
+    workload_fields = ('created_tasks_count', 'assigned_tasks_count')
+    workload_kwarg = 'workload'
+
+    @property
+    def versioned_models(self):
+        """Return models which the page is built from.
+
+        Counters of tasks are changed by tasks without saving users.
+
+        Returns:
+            tuple.
+        """
+        if self.shows_workload():
+            return (User, Task)
+        return (User,)
+
+    @property
+    def page_versioned_models(self):
+        """Return models which the cached page is built from.
 
+        Returns:
+            tuple.
+        """
+        return self.versioned_models
+
+    def shows_workload(self):
+        """Return True if the workload column is requested.
+
+        Returns:
+            bool.
+        """
+        return bool(self.request.GET.get(self.workload_kwarg))
 
-class LoginUserView(SuccessMessageMixin, LoginView):
+    def get_queryset(self):
+        """Return users with shown columns only.
+
+        Returns:
+            Queryset.
+        """
+        fields = self.fields
+        if self.shows_workload():
+            fields += self.workload_fields
+        return User.objects.only(*fields)
+
+    def get_context_data(self, **kwargs):
+        """Add the link which shows or hides the workload column.
+
+        Args:
+            **kwargs: kwargs.
+
+        Returns:
+            Context.
+        """
+        context = super().get_context_data(**kwargs)
+        context['shows_workload'] = self.shows_workload()
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        if context['shows_workload']:
+            query.pop(self.workload_kwarg)
+        else:
+            query[self.workload_kwarg] = 1
+        context['workload_query'] = query.urlencode()
+        return context
+
+
+class AsyncListUserView(AsyncViewMixin, ListUserView):
+    """List View of Users served by a coroutine."""
+
+
+class LoginUserView(AnonymousPageCacheMixin, SuccessMessageMixin, LoginView):
     """Login View."""
 
     success_message = _('You are logged in')
@@ -54,7 +143,11 @@ class RegisterUserView(SuccessMessageMixin, CreateView):
 
 
 class UpdateUserView(  # Noqa: WPS215
-    CustomLoginRequiredMixin, UserIdentificationMixin, SuccessMessageMixin, UpdateView,
+    CustomLoginRequiredMixin,
+    UserIdentificationMixin,
+    RequestObjectCacheMixin,
+    SuccessMessageMixin,
+    UpdateView,
 ):
     """Update User View."""
 
@@ -85,4 +178,12 @@ class DeleteUserView(CustomLoginRequiredMixin, UserIdentificationMixin, DeleteVi
         """
         self.restriction_message = _('Impossible to delete an user because it is in use')
         self.redirect_url_while_restricted = self.success_url
-        return bool(request.user.created_tasks.all() or request.user.assigned_tasks.all())
+        return request.user.is_in_use
+
+
+class UserAutocompleteView(AutocompleteView):
+    """Find users by prefixes of their names for task forms."""
+
+    queryset = User.objects.only('first_name', 'last_name')
+    search_fields = ('first_name', 'last_name', 'username')
+    ordering = ('first_name', 'last_name', 'id')